@@ -32,6 +32,8 @@ class PortClient(
         integration_identifier: str,
         integration_type: str,
         integration_version: str,
+        blueprint_cache_ttl: int = 0,
+        bulk_upsert_entities: bool = False,
     ):
         self.api_url = f"{base_url}/v1"
         self.client = get_internal_http_client(self)
@@ -44,11 +46,11 @@ class PortClient(
             integration_type,
             integration_version,
         )
-        EntityClientMixin.__init__(self, self.auth, self.client)
+        EntityClientMixin.__init__(self, self.auth, self.client, bulk_upsert_entities)
         IntegrationClientMixin.__init__(
             self, integration_identifier, integration_version, self.auth, self.client
         )
-        BlueprintClientMixin.__init__(self, self.auth, self.client)
+        BlueprintClientMixin.__init__(self, self.auth, self.client, blueprint_cache_ttl)
         MigrationClientMixin.__init__(self, self.auth, self.client)
         OrganizationClientMixin.__init__(self, self.auth, self.client)
 
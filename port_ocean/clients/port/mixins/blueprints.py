@@ -7,23 +7,50 @@ from port_ocean.clients.port.authentication import PortAuthentication
 from port_ocean.clients.port.types import UserAgentType
 from port_ocean.clients.port.utils import handle_status_code
 from port_ocean.core.models import Blueprint
+from port_ocean.utils.misc import get_time
 
 
 class BlueprintClientMixin:
-    def __init__(self, auth: PortAuthentication, client: httpx.AsyncClient):
+    def __init__(
+        self,
+        auth: PortAuthentication,
+        client: httpx.AsyncClient,
+        blueprint_cache_ttl: int = 0,
+    ):
         self.auth = auth
         self.client = client
+        # Blueprints fetched within the last `blueprint_cache_ttl` seconds are served from the cache
+        self._blueprint_cache_ttl = blueprint_cache_ttl
+        self._blueprint_cache: dict[str, tuple[float, Blueprint]] = {}
 
     async def get_blueprint(
-        self, identifier: str, should_log: bool = True
+        self, identifier: str, should_log: bool = True, use_cache: bool = True
     ) -> Blueprint:
+        cached_blueprint = self._blueprint_cache.get(identifier)
+        if (
+            use_cache
+            and cached_blueprint is not None
+            and cached_blueprint[0] + self._blueprint_cache_ttl >= get_time()
+        ):
+            return cached_blueprint[1]
+
         logger.info(f"Fetching blueprint with id: {identifier}")
         response = await self.client.get(
             f"{self.auth.api_url}/blueprints/{identifier}",
             headers=await self.auth.headers(),
         )
         handle_status_code(response, should_log=should_log)
-        return Blueprint.parse_obj(response.json()["blueprint"])
+        blueprint = Blueprint.parse_obj(response.json()["blueprint"])
+        if self._blueprint_cache_ttl > 0:
+            self._blueprint_cache[identifier] = (get_time(), blueprint)
+        return blueprint
+
+    def invalidate_blueprint_cache(self, identifier: str | None = None) -> None:
+        """Removes the given blueprint from the cache, or every blueprint when no identifier is given"""
+        if identifier is None:
+            self._blueprint_cache.clear()
+        else:
+            self._blueprint_cache.pop(identifier, None)
 
     async def create_blueprint(
         self,
@@ -31,6 +58,7 @@ class BlueprintClientMixin:
         user_agent_type: UserAgentType | None = None,
     ) -> dict[str, Any]:
         logger.info(f"Creating blueprint with id: {raw_blueprint.get('identifier')}")
+        self.invalidate_blueprint_cache(raw_blueprint.get("identifier"))
         headers = await self.auth.headers(user_agent_type)
         response = await self.client.post(
             f"{self.auth.api_url}/blueprints", headers=headers, json=raw_blueprint
@@ -45,6 +73,7 @@ class BlueprintClientMixin:
         user_agent_type: UserAgentType | None = None,
     ) -> None:
         logger.info(f"Patching blueprint with id: {identifier}")
+        self.invalidate_blueprint_cache(identifier)
         headers = await self.auth.headers(user_agent_type)
         response = await self.client.patch(
             f"{self.auth.api_url}/blueprints/{identifier}",
@@ -63,6 +92,7 @@ class BlueprintClientMixin:
         logger.info(
             f"Deleting blueprint with id: {identifier} with all entities: {delete_entities}"
         )
+        self.invalidate_blueprint_cache(identifier)
         headers = await self.auth.headers(user_agent_type)
 
         if not delete_entities:
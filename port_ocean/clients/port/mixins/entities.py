@@ -1,5 +1,6 @@
 import asyncio
-from typing import Any, Literal
+from copy import deepcopy
+from typing import Any, AsyncIterator, Literal
 from urllib.parse import quote_plus
 
 import httpx
@@ -12,13 +13,28 @@ from port_ocean.clients.port.utils import (
     PORT_HTTP_MAX_CONNECTIONS_LIMIT,
 )
 from port_ocean.core.models import Entity, PortAPIErrorMessage
+from port_ocean.exceptions.clients import PortClientException
 from starlette import status
 
+# Largest page of entities Port returns from a paginated search
+SEARCH_ENTITIES_PAGE_SIZE = 1000
+# Largest number of entities Port upserts in a single bulk request
+BULK_UPSERT_ENTITIES_MAX_SIZE = 20
+
+UpsertEntityResult = Entity | None | Literal[False]
+
 
 class EntityClientMixin:
-    def __init__(self, auth: PortAuthentication, client: httpx.AsyncClient):
+    def __init__(
+        self,
+        auth: PortAuthentication,
+        client: httpx.AsyncClient,
+        bulk_upsert_entities: bool = False,
+    ):
         self.auth = auth
         self.client = client
+        # Whether to upsert batches of entities with bulk requests of every blueprint, instead of a request per entity
+        self.bulk_upsert_entities = bulk_upsert_entities
         # Semaphore is used to limit the number of concurrent requests to port, to avoid overloading it.
         # The number of concurrent requests is set to 90% of the max connections limit, to leave some room for other
         # requests that are not related to entities.
@@ -32,7 +48,7 @@ class EntityClientMixin:
         request_options: RequestOptions,
         user_agent_type: UserAgentType | None = None,
         should_raise: bool = True,
-    ) -> Entity | None | Literal[False]:
+    ) -> UpsertEntityResult:
         """
         This function upserts an entity into Port.
 
@@ -128,14 +144,20 @@ class EntityClientMixin:
 
         return reduced_entity
 
-    async def batch_upsert_entities(
+    def _get_failed_upsert_result(self, entity: Entity) -> UpsertEntityResult:
+        # The same result a single upsert returns for an entity that failed without raising
+        if entity.is_using_search_identifier:
+            return None
+        return self._reduce_entity(entity)
+
+    async def _upsert_entities_one_by_one(
         self,
         entities: list[Entity],
         request_options: RequestOptions,
         user_agent_type: UserAgentType | None = None,
         should_raise: bool = True,
-    ) -> list[Entity]:
-        modified_entities_results = await asyncio.gather(
+    ) -> list[UpsertEntityResult]:
+        return await asyncio.gather(
             *(
                 self.upsert_entity(
                     entity,
@@ -144,9 +166,236 @@ class EntityClientMixin:
                     should_raise=should_raise,
                 )
                 for entity in entities
-            ),
-            return_exceptions=True,
+            )
         )
+
+    async def _upsert_entities_in_bulk(
+        self,
+        blueprint: str,
+        entities: list[Entity],
+        request_options: RequestOptions,
+        user_agent_type: UserAgentType | None = None,
+        should_raise: bool = True,
+    ) -> list[UpsertEntityResult]:
+        """
+        Upserts entities of a single blueprint with a single bulk request, returning the result of every entity in
+        the order given as `upsert_entity` would. When the bulk request fails as a whole the entities of the chunk are
+        upserted one by one instead, and once the bulk endpoint itself turns out to be unavailable it isn't requested
+        again.
+        """
+        validation_only = request_options["validation_only"]
+        response: httpx.Response | None = None
+        async with self.semaphore:
+            # Chunks waiting for the semaphore skip the bulk endpoint once a previous chunk found it unavailable
+            if self.bulk_upsert_entities:
+                logger.debug(
+                    f"{'Validating' if validation_only else 'Upserting'} {len(entities)} entities of blueprint: {blueprint}"
+                )
+                headers = await self.auth.headers(user_agent_type)
+                response = await self.client.post(
+                    f"{self.auth.api_url}/blueprints/{blueprint}/entities/bulk",
+                    json={
+                        "entities": [
+                            entity.dict(exclude_unset=True, by_alias=True)
+                            for entity in entities
+                        ]
+                    },
+                    headers=headers,
+                    params={
+                        "upsert": "true",
+                        "merge": str(request_options["merge"]).lower(),
+                        "create_missing_related_entities": str(
+                            request_options["create_missing_related_entities"]
+                        ).lower(),
+                        "validation_only": str(validation_only).lower(),
+                    },
+                    extensions={"retryable": True},
+                )
+        if response is None:
+            return await self._upsert_entities_one_by_one(
+                entities, request_options, user_agent_type, should_raise
+            )
+
+        try:
+            result = response.json()
+        except ValueError:
+            result = {}
+        if response.is_error and "errors" not in result:
+            # Port answers a missing blueprint with a not found error, which leaves the bulk endpoint available
+            if response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED or (
+                response.status_code == status.HTTP_404_NOT_FOUND
+                and result.get("error") != PortAPIErrorMessage.NOT_FOUND.value
+            ):
+                logger.warning(
+                    "Bulk upserts of entities are unavailable, upserting entities one by one from now on"
+                )
+                self.bulk_upsert_entities = False
+            else:
+                logger.warning(
+                    f"Failed to upsert {len(entities)} entities of blueprint: {blueprint} in bulk, "
+                    f"upserting them one by one. Status code: {response.status_code}"
+                )
+            return await self._upsert_entities_one_by_one(
+                entities, request_options, user_agent_type, should_raise
+            )
+
+        results: dict[int, UpsertEntityResult] = {}
+        for entity_result in result.get("entities", []):
+            entity = entities[entity_result["index"]]
+            # The entity Port returns holds the identifiers that search identifiers and relations resolved to
+            result_entity = (
+                Entity.parse_obj(entity_result["entity"])
+                if entity_result.get("entity")
+                else entity.copy(
+                    update={
+                        "identifier": entity_result.get("identifier", entity.identifier)
+                    }
+                )
+            )
+            results[entity_result["index"]] = (
+                None
+                if result_entity.is_using_search_identifier
+                else self._reduce_entity(result_entity)
+            )
+
+        for entity_error in result.get("errors", []):
+            entity = entities[entity_error["index"]]
+            message = entity_error.get("message", entity_error.get("error"))
+            logger.error(
+                f"Error {'Validating' if validation_only else 'Upserting'} "
+                f"entity: {entity.identifier} of "
+                f"blueprint: {entity.blueprint}, "
+                f"Error: {message}"
+            )
+            if (
+                entity_error.get("statusCode") == status.HTTP_404_NOT_FOUND
+                and entity_error.get("error") == PortAPIErrorMessage.NOT_FOUND.value
+            ):
+                # Return false to differentiate from `result_entity.is_using_search_identifier`
+                results[entity_error["index"]] = False
+                continue
+
+            if should_raise:
+                raise PortClientException(
+                    f"Failed to upsert entity: {entity.identifier} of blueprint: {entity.blueprint}, "
+                    f"Error: {message}"
+                )
+            results[entity_error["index"]] = self._get_failed_upsert_result(entity)
+
+        missing_indexes = [
+            index for index in range(len(entities)) if index not in results
+        ]
+        if missing_indexes:
+            logger.warning(
+                f"The bulk upsert of blueprint: {blueprint} returned no result for {len(missing_indexes)} entities, "
+                "upserting them one by one"
+            )
+            missing_results = await self._upsert_entities_one_by_one(
+                [entities[index] for index in missing_indexes],
+                request_options,
+                user_agent_type,
+                should_raise,
+            )
+            results.update(zip(missing_indexes, missing_results))
+
+        return [results[index] for index in range(len(entities))]
+
+    @staticmethod
+    def _chunk_entities_by_blueprint(
+        entities: list[Entity],
+    ) -> list[tuple[str, list[int]]]:
+        """Returns the indexes of the entities grouped by blueprint, in chunks that fit a single bulk request"""
+        indexes_by_blueprint: dict[str, list[int]] = {}
+        for index, entity in enumerate(entities):
+            indexes_by_blueprint.setdefault(entity.blueprint, []).append(index)
+
+        return [
+            (blueprint, indexes[start : start + BULK_UPSERT_ENTITIES_MAX_SIZE])
+            for blueprint, indexes in indexes_by_blueprint.items()
+            for start in range(0, len(indexes), BULK_UPSERT_ENTITIES_MAX_SIZE)
+        ]
+
+    async def upsert_entities(
+        self,
+        entities: list[Entity],
+        request_options: RequestOptions,
+        user_agent_type: UserAgentType | None = None,
+        should_raise: bool = True,
+    ) -> list[UpsertEntityResult]:
+        """
+        Upserts the entities concurrently, returning the result of every entity in the order given as
+        `upsert_entity` would. When bulk upserts are enabled, the entities are upserted with bulk requests.
+        """
+        if not self.bulk_upsert_entities:
+            return await self._upsert_entities_one_by_one(
+                entities, request_options, user_agent_type, should_raise
+            )
+
+        chunks = self._chunk_entities_by_blueprint(entities)
+        chunks_results = await asyncio.gather(
+            *(
+                self._upsert_entities_in_bulk(
+                    blueprint,
+                    [entities[index] for index in indexes],
+                    request_options,
+                    user_agent_type,
+                    should_raise=should_raise,
+                )
+                for blueprint, indexes in chunks
+            )
+        )
+        results: list[UpsertEntityResult] = [None] * len(entities)
+        for (_, indexes), chunk_results in zip(chunks, chunks_results):
+            for index, entity_result in zip(indexes, chunk_results):
+                results[index] = entity_result
+        return results
+
+    async def batch_upsert_entities(
+        self,
+        entities: list[Entity],
+        request_options: RequestOptions,
+        user_agent_type: UserAgentType | None = None,
+        should_raise: bool = True,
+    ) -> list[Entity]:
+        modified_entities_results: list[UpsertEntityResult | BaseException]
+        if self.bulk_upsert_entities:
+            chunks_results = await asyncio.gather(
+                *(
+                    self._upsert_entities_in_bulk(
+                        blueprint,
+                        [entities[index] for index in indexes],
+                        request_options,
+                        user_agent_type,
+                        should_raise=should_raise,
+                    )
+                    for blueprint, indexes in self._chunk_entities_by_blueprint(
+                        entities
+                    )
+                ),
+                return_exceptions=True,
+            )
+            modified_entities_results = [
+                entity_result
+                for chunk_results in chunks_results
+                for entity_result in (
+                    [chunk_results]
+                    if isinstance(chunk_results, BaseException)
+                    else chunk_results
+                )
+            ]
+        else:
+            modified_entities_results = await asyncio.gather(
+                *(
+                    self.upsert_entity(
+                        entity,
+                        request_options,
+                        user_agent_type,
+                        should_raise=should_raise,
+                    )
+                    for entity in entities
+                ),
+                return_exceptions=True,
+            )
         entity_results = [
             entity for entity in modified_entities_results if isinstance(entity, Entity)
         ]
@@ -215,12 +464,9 @@ class EntityClientMixin:
             return_exceptions=True,
         )
 
-    async def search_entities(
-        self,
-        user_agent_type: UserAgentType,
-        query: dict[Any, Any] | None = None,
-        parameters_to_include: list[str] | None = None,
-    ) -> list[Entity]:
+    def _build_integration_query(
+        self, user_agent_type: UserAgentType, query: dict[Any, Any] | None = None
+    ) -> dict[Any, Any]:
         default_query = {
             "combinator": "and",
             "rules": [
@@ -241,6 +487,15 @@ class EntityClientMixin:
             query = default_query
         elif query.get("rules"):
             query["rules"].append(default_query)
+        return query
+
+    async def search_entities(
+        self,
+        user_agent_type: UserAgentType,
+        query: dict[Any, Any] | None = None,
+        parameters_to_include: list[str] | None = None,
+    ) -> list[Entity]:
+        query = self._build_integration_query(user_agent_type, query)
 
         logger.info(f"Searching entities with query {query}")
         response = await self.client.post(
@@ -256,6 +511,82 @@ class EntityClientMixin:
         handle_status_code(response)
         return [Entity.parse_obj(result) for result in response.json()["entities"]]
 
+    async def search_blueprint_entities_in_pages(
+        self,
+        blueprint: str,
+        user_agent_type: UserAgentType,
+        query: dict[Any, Any] | None = None,
+        parameters_to_include: list[str] | None = None,
+        page_size: int = SEARCH_ENTITIES_PAGE_SIZE,
+    ) -> AsyncIterator[list[Entity]]:
+        """
+        This function searches the entities of a blueprint page by page, following the cursor Port returns with
+        every page, so only a single page of entities is held at a time.
+        """
+        query = self._build_integration_query(user_agent_type, query)
+        cursor: str | None = None
+
+        logger.info(
+            f"Searching entities of blueprint {blueprint} in pages of {page_size} with query {query}"
+        )
+        while True:
+            body: dict[str, Any] = {
+                "query": query,
+                "include": parameters_to_include or ["blueprint", "identifier"],
+                "limit": page_size,
+            }
+            if cursor:
+                body["from"] = cursor
+
+            response = await self.client.post(
+                f"{self.auth.api_url}/blueprints/{quote_plus(blueprint)}/entities/search",
+                json=body,
+                headers=await self.auth.headers(user_agent_type),
+                params={"exclude_calculated_properties": "true"},
+                extensions={"retryable": True},
+            )
+            handle_status_code(response)
+            result = response.json()
+            yield [Entity.parse_obj(entity) for entity in result["entities"]]
+
+            cursor = result.get("next")
+            if not cursor:
+                return
+
+    async def search_entities_in_pages(
+        self,
+        user_agent_type: UserAgentType,
+        query: dict[Any, Any] | None = None,
+        parameters_to_include: list[str] | None = None,
+        page_size: int = SEARCH_ENTITIES_PAGE_SIZE,
+        blueprints: list[str] | None = None,
+    ) -> AsyncIterator[list[Entity]]:
+        """
+        This function searches the entities of the given blueprints page by page, or of every blueprint of the
+        organization when none are given, as the paginated search of Port is scoped to a single blueprint.
+        """
+        if blueprints is None:
+            response = await self.client.get(
+                f"{self.auth.api_url}/blueprints",
+                headers=await self.auth.headers(user_agent_type),
+                extensions={"retryable": True},
+            )
+            handle_status_code(response)
+            blueprints = [
+                blueprint["identifier"] for blueprint in response.json()["blueprints"]
+            ]
+
+        for blueprint in blueprints:
+            async for entities in self.search_blueprint_entities_in_pages(
+                blueprint,
+                user_agent_type,
+                # Every blueprint gets its own copy, as the integration rules are added to the given query
+                deepcopy(query),
+                parameters_to_include,
+                page_size,
+            ):
+                yield entities
+
     async def search_batch_entities(
         self, user_agent_type: UserAgentType, entities_to_search: list[Entity]
     ) -> list[Entity]:
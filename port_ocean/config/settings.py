@@ -40,6 +40,11 @@ class PortSettings(BaseOceanModel, extra=Extra.allow):
     client_secret: str = Field(..., sensitive=True)
     base_url: AnyHttpUrl = parse_obj_as(AnyHttpUrl, "https://api.getport.io")
     port_app_config_cache_ttl: int = 60
+    # Seconds a fetched blueprint is served from the cache, shared by the resyncs and the realtime events. 0 disables it
+    blueprint_cache_ttl: int = Field(default=60, ge=0)
+    # Upsert batches of entities with a bulk request per blueprint, falling back to a request per entity when the
+    # bulk request fails as a whole
+    bulk_upsert_entities: bool = False
 
 
 class IntegrationSettings(BaseOceanModel, extra=Extra.allow):
@@ -71,6 +76,61 @@ class IntegrationConfiguration(BaseOceanSettings, extra=Extra.allow):
     # Determines if Port should generate resources such as blueprints and pages instead of ocean
     create_port_resources_origin: CreatePortResourcesOrigin | None = None
     send_raw_data_examples: bool = True
+    # Number of worker processes used to map raw data into entities, when unset the mapping runs on the thread pool
+    entity_processing_process_pool_size: int | None = Field(default=None, ge=1)
+    # Number of raw items whose mapped entities are reused while the raw item and its mapping are unchanged,
+    # when unset every raw item is mapped on every resync
+    entity_processing_fingerprint_cache_size: int | None = Field(default=None, ge=1)
+    # File the fingerprint cache is persisted to, so it survives restarts of the integration
+    entity_processing_fingerprint_cache_path: str | None = None
+    # Number of kinds resynced concurrently, when above 1 kinds are synced after the kinds their relations target
+    resync_kinds_concurrency: int = Field(default=1, ge=1)
+    # Number of batches of a kind each resync stage (fetch, map, compare with Port) can run ahead of the next one,
+    # when 0 every batch is upserted before the next one is fetched
+    resync_pipeline_prefetch: int = Field(default=0, ge=0)
+    # Number of resync generators of a kind consumed concurrently, when 1 they are consumed one after the other
+    resync_generators_concurrency: int = Field(default=1, ge=1)
+    # Number of raw items per batch mapped and upserted during a resync, smaller batches of the generators are
+    # coalesced and bigger ones are split, when unset the batches are processed as the generators yield them
+    resync_batch_size: int | None = Field(default=None, ge=1)
+    # Approximate size in bytes of the raw items per batch mapped and upserted during a resync
+    resync_batch_max_bytes: int | None = Field(default=None, ge=1)
+    # Number of seconds a partial batch waits for more raw items before it is processed
+    resync_batch_flush_timeout: float | None = Field(default=None, gt=0)
+    # Number of entity identities a resync keeps in memory for its delete phase before spilling them to temporary
+    # files, when unset they are all kept in memory
+    resync_identity_store_spill_threshold: int | None = Field(default=None, ge=1)
+    # Number of entities per page when reading the entities at Port for a resync, when unset the delete phase reads
+    # them in a single request
+    resync_port_state_page_size: int | None = Field(default=None, ge=1, le=1000)
+    # Whether the entities at Port are prefetched per blueprint when a resync starts, so every batch is compared with
+    # them locally instead of searching Port
+    resync_port_state_prefetch: bool = False
+    # Directory of the temporary database holding the prefetched entities, when unset they are kept in memory
+    resync_port_state_snapshot_directory: str | None = None
+    # File the state of the entities synced by resyncs is persisted to, such as on a volume mounted to integrations
+    # running as jobs. When set, entities that didn't change since they were synced are skipped without querying
+    # Port, and the delete phase lists the synced entities from it instead of searching Port
+    resync_synced_state_path: str | None = None
+    # Minutes between scheduled delta resyncs, in which resync functions fetch only the items updated since the
+    # watermark of their kind and the delete phase is skipped. Requires scheduled_resync_interval, as a full resync is
+    # still scheduled once scheduled_resync_interval minutes passed since the last one, in place of a delta resync
+    scheduled_delta_resync_interval: int | None = Field(default=None, ge=1)
+    # File the resync watermarks are persisted to, so delta resyncs continue from them after a restart
+    resync_watermark_path: str | None = None
+    # File the progress of resyncs is checkpointed to, so a resync that was aborted or crashed resumes on the next
+    # resync of the same config, skipping the kinds it completed and continuing the others from their page tokens
+    resync_checkpoint_path: str | None = None
+    # Seconds realtime register_raw and unregister_raw calls of a kind are buffered for, to process them as a single
+    # batch mapped and upserted at once. When unset every call is processed on its own
+    realtime_batch_window: float | None = Field(default=None, gt=0)
+    # Number of buffered raw items of a kind that processes its batch before the window passes
+    realtime_batch_max_items: int = Field(default=100, ge=1)
+    # Fetch the items of a kind once for all the resources of the kind whose configs differ only in their port
+    # mappings, mapping every fetched batch with each of them. Resync functions must not depend on the port mappings
+    # of the resource. Only resources with identical selectors mapped to distinct constant blueprints share a fetch,
+    # and fetches aren't shared by checkpointed resyncs
+    resync_share_kind_fetches: bool = False
     port: PortSettings
     event_listener: EventListenerSettingsType = Field(
         default=cast(EventListenerSettingsType, {"type": "POLLING"})
@@ -103,6 +163,21 @@ class IntegrationConfiguration(BaseOceanSettings, extra=Extra.allow):
 
         return values
 
+    @root_validator()
+    def validate_scheduled_delta_resync_interval(
+        cls, values: dict[str, Any]
+    ) -> dict[str, Any]:
+        # Only full resyncs delete the entities that no longer exist, so delta resyncs can't be scheduled without them
+        if (
+            values.get("scheduled_delta_resync_interval") is not None
+            and values.get("scheduled_resync_interval") is None
+        ):
+            raise ValueError(
+                "scheduled_resync_interval must be set along with scheduled_delta_resync_interval, "
+                "otherwise no full resync runs to delete the entities that no longer exist"
+            )
+        return values
+
     @validator("create_port_resources_origin")
     def validate_create_port_resources_origin(
         cls, create_port_resources_origin: CreatePortResourcesOrigin | None
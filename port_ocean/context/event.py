@@ -15,6 +15,9 @@ from uuid import uuid4
 
 from loguru import logger
 from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
+from port_ocean.core.utils.port_state_snapshot import PortStateSnapshot
+from port_ocean.core.utils.resync_checkpoint import ResyncCheckpointStore
+from port_ocean.core.utils.synced_state_store import SyncedStateStore
 from pydispatch import dispatcher  # type: ignore
 from werkzeug.local import LocalStack, LocalProxy
 
@@ -34,6 +37,7 @@ if TYPE_CHECKING:
     )
 
 TriggerType = Literal["manual", "machine", "request"]
+ResyncType = Literal["full", "delta"]
 AbortCallbackFunction = Callable[[], Union[Any, Awaitable[Any]]]
 
 
@@ -56,6 +60,12 @@ class EventContext:
     entity_topological_sorter: EntityTopologicalSorter = field(
         default_factory=EntityTopologicalSorter
     )
+    port_state_snapshot: PortStateSnapshot | None = None
+    synced_state: SyncedStateStore | None = None
+    resync_type: ResyncType = "full"
+    # The watermarks resync functions staged, committed once their kind was resynced successfully
+    resync_watermarks: dict[str, Any] = field(default_factory=dict)
+    resync_checkpoint: ResyncCheckpointStore | None = None
 
     def on_abort(self, func: AbortCallbackFunction) -> None:
         self._on_abort_callbacks.append(func)
@@ -150,6 +160,12 @@ async def event_context(
         # inherit port app config from parent event, so it can be used in nested events
         _port_app_config=parent.port_app_config if parent else None,
         entity_topological_sorter=entity_topological_sorter,
+        # inherit the snapshot of Port's state, so nested events compare entities with it as well
+        port_state_snapshot=parent.port_state_snapshot if parent else None,
+        synced_state=parent.synced_state if parent else None,
+        resync_type=parent.resync_type if parent else "full",
+        resync_watermarks=parent.resync_watermarks if parent else {},
+        resync_checkpoint=parent.resync_checkpoint if parent else None,
     )
     _event_context_stack.push(new_event)
 
@@ -146,6 +146,31 @@ class PortOceanContext:
     async def sync_raw_all(self) -> None:
         await self.integration.sync_raw_all(trigger_type="manual")
 
+    def get_resync_watermark(self, kind: str) -> Any:
+        """
+        Returns the watermark the last successful resync of the kind stored, to fetch only the items updated since.
+        Returns None in a full resync, in which every item should be fetched.
+        """
+        return self.integration.get_resync_watermark(kind)
+
+    def set_resync_watermark(self, kind: str, watermark: Any) -> None:
+        """Stores the watermark the next delta resync of the kind continues from, once this resync succeeded"""
+        self.integration.set_resync_watermark(kind, watermark)
+
+    def get_resync_page_token(self) -> Any:
+        """
+        Returns the page token the current resource continues from when the resync resumes from a checkpoint, or None
+        when it should be fetched from the start.
+        """
+        return self.integration.get_resync_page_token()
+
+    def set_resync_page_token(self, page_token: Any) -> None:
+        """
+        Stages the page token to continue from after the batch the resync function is about to yield, which is
+        checkpointed once that batch is upserted.
+        """
+        self.integration.set_resync_page_token(page_token)
+
     def add_webhook_processor(
         self,
         path: str,
@@ -1,9 +1,11 @@
 from abc import abstractmethod
+from typing import AsyncIterable
 
 from port_ocean.clients.port.types import UserAgentType
 from port_ocean.core.handlers.base import BaseHandler
 from port_ocean.core.models import Entity
 from port_ocean.core.ocean_types import EntityDiff
+from port_ocean.core.utils.entity_identity_store import EntityIdentityStore
 
 
 class BaseEntitiesStateApplier(BaseHandler):
@@ -44,6 +46,27 @@ class BaseEntitiesStateApplier(BaseHandler):
         """
         pass
 
+    @abstractmethod
+    async def delete_unregistered_entities(
+        self,
+        entities_at_port: list[Entity] | AsyncIterable[list[Entity]],
+        registered_entities: EntityIdentityStore,
+        user_agent_type: UserAgentType,
+        entity_deletion_threshold: float | None = None,
+    ) -> list[Entity]:
+        """Delete the entities at Port that weren't registered.
+
+        Args:
+            entities_at_port (list[Entity] | AsyncIterable[list[Entity]]): The entities currently at Port, or their pages.
+            registered_entities (EntityIdentityStore): The identities of the registered entities.
+            user_agent_type (UserAgentType): The user agent responsible for the deletion.
+            entity_deletion_threshold (float | None): The maximal rate of entities at Port allowed to be deleted.
+
+        Returns:
+            list[Entity]: The deleted entities.
+        """
+        pass
+
     @abstractmethod
     async def upsert(
         self, entities: list[Entity], user_agent_type: UserAgentType
@@ -1,3 +1,6 @@
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator
+
 from loguru import logger
 
 from port_ocean.clients.port.types import UserAgentType
@@ -6,13 +9,29 @@ from port_ocean.core.handlers.entities_state_applier.base import (
     BaseEntitiesStateApplier,
 )
 from port_ocean.core.handlers.entities_state_applier.port.get_related_entities import (
-    get_related_entities,
+    get_relations_targets,
 )
 
 from port_ocean.core.models import Entity
 from port_ocean.core.ocean_types import EntityDiff
-from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
-from port_ocean.core.utils.utils import is_same_entity, get_port_diff
+from port_ocean.core.utils.entity_identity_store import EntityIdentityStore
+from port_ocean.core.utils.entity_topological_sorter import (
+    EntityTopologicalSorter,
+    Node,
+)
+from port_ocean.core.utils.utils import get_port_diff
+from port_ocean.exceptions.core import OceanAbortException
+
+
+async def _iterate_entities_pages(
+    entities: list[Entity] | AsyncIterable[list[Entity]],
+) -> AsyncIterator[list[Entity]]:
+    if isinstance(entities, list):
+        yield entities
+        return
+
+    async for page in entities:
+        yield page
 
 
 class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
@@ -26,26 +45,23 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
     async def _safe_delete(
         self,
         entities_to_delete: list[Entity],
-        entities_to_protect: list[Entity],
+        entities_to_protect: EntityIdentityStore,
         user_agent_type: UserAgentType,
-    ) -> None:
+    ) -> list[Entity]:
         if not entities_to_delete:
-            return
+            return []
 
-        related_entities = await get_related_entities(
-            entities_to_protect, self.context.port_client
+        relations_targets = await get_relations_targets(
+            entities_to_protect.get_related_blueprints(), self.context.port_client
         )
 
         allowed_entities_to_delete = []
 
         for entity_to_delete in entities_to_delete:
-            is_part_of_related = any(
-                is_same_entity(entity, entity_to_delete) for entity in related_entities
-            )
-            is_part_of_created = any(
-                is_same_entity(entity, entity_to_delete)
-                for entity in entities_to_protect
+            is_part_of_related = entities_to_protect.is_related(
+                entity_to_delete, relations_targets
             )
+            is_part_of_created = entity_to_delete in entities_to_protect
             if is_part_of_related:
                 if event.port_app_config.create_missing_related_entities:
                     logger.info(
@@ -58,6 +74,7 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
                 allowed_entities_to_delete.append(entity_to_delete)
 
         await self.delete(allowed_entities_to_delete, user_agent_type)
+        return allowed_entities_to_delete
 
     async def apply_diff(
         self,
@@ -72,7 +89,11 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
         )
         modified_entities = await self.upsert(kept_entities, user_agent_type)
 
-        await self._safe_delete(diff.deleted, modified_entities, user_agent_type)
+        await self._safe_delete(
+            diff.deleted,
+            EntityIdentityStore.from_entities(modified_entities),
+            user_agent_type,
+        )
 
     async def delete_diff(
         self,
@@ -80,33 +101,55 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
         user_agent_type: UserAgentType,
         entity_deletion_threshold: float | None = None,
     ) -> None:
-        diff = get_port_diff(entities["before"], entities["after"])
+        await self.delete_unregistered_entities(
+            entities["before"],
+            EntityIdentityStore.from_entities(entities["after"]),
+            user_agent_type,
+            entity_deletion_threshold,
+        )
 
-        if not diff.deleted:
-            return
+    async def delete_unregistered_entities(
+        self,
+        entities_at_port: list[Entity] | AsyncIterable[list[Entity]],
+        registered_entities: EntityIdentityStore,
+        user_agent_type: UserAgentType,
+        entity_deletion_threshold: float | None = None,
+    ) -> list[Entity]:
+        entities_at_port_count = 0
+        entities_to_delete: dict[tuple[Any, str], Entity] = {}
+        # The entities at Port are compared page by page, so only the ones to delete are kept
+        async for entities in _iterate_entities_pages(entities_at_port):
+            entities_at_port_count += len(entities)
+            for entity in entities:
+                if entity not in registered_entities:
+                    entities_to_delete[(entity.identifier, entity.blueprint)] = entity
 
-        kept_entities = diff.created + diff.modified
+        if not entities_to_delete:
+            return []
 
         logger.info(
-            f"Determining entities to delete ({len(diff.deleted)}/{len(kept_entities)})",
-            deleting_entities=len(diff.deleted),
-            keeping_entities=len(kept_entities),
+            f"Determining entities to delete ({len(entities_to_delete)}/{len(registered_entities)})",
+            deleting_entities=len(entities_to_delete),
+            keeping_entities=len(registered_entities),
             entity_deletion_threshold=entity_deletion_threshold,
         )
 
-        deletion_rate = len(diff.deleted) / len(entities["before"])
+        deletion_rate = len(entities_to_delete) / entities_at_port_count
         if (
             entity_deletion_threshold is not None
             and deletion_rate <= entity_deletion_threshold
         ):
-            await self._safe_delete(diff.deleted, kept_entities, user_agent_type)
+            return await self._safe_delete(
+                list(entities_to_delete.values()), registered_entities, user_agent_type
+            )
         else:
             logger.info(
                 f"Skipping deletion of entities with delition rate {deletion_rate}",
                 deletion_rate=deletion_rate,
-                deleting_entities=len(diff.deleted),
-                total_entities=len(entities),
+                deleting_entities=len(entities_to_delete),
+                total_entities=entities_at_port_count,
             )
+            return []
 
     async def upsert(
         self, entities: list[Entity], user_agent_type: UserAgentType
@@ -121,18 +164,55 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
                 should_raise=False,
             )
         else:
-            for entity in entities:
-                upsertedEntity = await self.context.port_client.upsert_entity(
-                    entity,
-                    event.port_app_config.get_port_request_options(),
-                    user_agent_type,
-                    should_raise=False,
-                )
-                if upsertedEntity:
-                    modified_entities.append(upsertedEntity)
+            modified_entities = await self._upsert_by_dependencies(
+                entities, user_agent_type
+            )
+        return modified_entities
+
+    async def _upsert_by_dependencies(
+        self, entities: list[Entity], user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        """
+        Upserts the entities level by level of their dependencies within the batch, each level concurrently.
+        Entities that fail due to related entities missing from Port, or that depend on such entities in the batch,
+        are left to the retry at the end of the resync.
+        """
+        dependencies, entities_map = EntityTopologicalSorter.build_dependencies_graph(
+            entities
+        )
+        try:
+            entities_levels = EntityTopologicalSorter.group_by_dependencies_graph(
+                dependencies
+            )
+        except OceanAbortException:
+            # Entities with cyclic dependencies are upserted at once, as their failures are retried anyway
+            entities_levels = [list(dependencies)]
+
+        modified_entities: list[Entity] = []
+        failed_nodes: set[Node] = set()
+        for level in entities_levels:
+            nodes_to_upsert = []
+            for node in level:
+                # Upserting an entity whose related entity in the batch failed would fail as well
+                if dependencies[node] & failed_nodes:
+                    failed_nodes.add(node)
+                    event.entity_topological_sorter.register_entity(entities_map[node])
+                else:
+                    nodes_to_upsert.append(node)
+
+            upserted_entities = await self.context.port_client.upsert_entities(
+                [entities_map[node] for node in nodes_to_upsert],
+                event.port_app_config.get_port_request_options(),
+                user_agent_type,
+                should_raise=False,
+            )
+            for node, upserted_entity in zip(nodes_to_upsert, upserted_entities):
+                if upserted_entity:
+                    modified_entities.append(upserted_entity)
                 # condition to false to differentiate from `result_entity.is_using_search_identifier`
-                if upsertedEntity is False:
-                    event.entity_topological_sorter.register_entity(entity)
+                if upserted_entity is False:
+                    failed_nodes.add(node)
+                    event.entity_topological_sorter.register_entity(entities_map[node])
         return modified_entities
 
     async def delete(
@@ -147,14 +227,21 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
                 should_raise=False,
             )
         else:
-            ordered_deleted_entities = (
-                EntityTopologicalSorter.order_by_entities_dependencies(entities)
+            entities_levels = EntityTopologicalSorter.group_by_entities_dependencies(
+                entities
             )
 
-            for entity in ordered_deleted_entities:
-                await self.context.port_client.delete_entity(
-                    entity,
-                    event.port_app_config.get_port_request_options(),
-                    user_agent_type,
-                    should_raise=False,
+            # Entities are deleted before the entities they depend on, so the levels are deleted in reverse, each
+            # one concurrently as the port client limits the number of concurrent requests
+            for level in reversed(entities_levels):
+                await asyncio.gather(
+                    *(
+                        self.context.port_client.delete_entity(
+                            entity,
+                            event.port_app_config.get_port_request_options(),
+                            user_agent_type,
+                            should_raise=False,
+                        )
+                        for entity in level
+                    )
                 )
@@ -1,6 +1,6 @@
 import asyncio
 from collections import defaultdict
-from itertools import groupby
+from typing import Iterable
 
 from port_ocean.clients.port.client import PortClient
 from port_ocean.core.models import Entity
@@ -10,42 +10,45 @@ async def get_related_entities(
     entities: list[Entity], port_client: PortClient
 ) -> list[Entity]:
     entities_with_relations = [entity for entity in entities if entity.relations]
-    blueprint_identifier_to_entity = dict(
-        groupby(
-            entities_with_relations,
-            key=lambda x: x.blueprint,
-        )
+    relations_targets = await get_relations_targets(
+        (entity.blueprint for entity in entities_with_relations), port_client
     )
-    blueprints = await asyncio.gather(
-        *(
-            port_client.get_blueprint(blueprint_identifier)
-            for blueprint_identifier in blueprint_identifier_to_entity.keys()
-        )
-    )
-    entity_to_blueprint = [
-        (
-            entity,
-            next(
-                blueprint
-                for blueprint in blueprints
-                if blueprint.identifier == entity.blueprint
-            ),
-        )
-        for entity in entities_with_relations
-    ]
 
-    blueprints_to_relations = defaultdict(list)
-    for entity, blueprint in entity_to_blueprint:
+    blueprints_to_relations: dict[str, set[str]] = defaultdict(set)
+    for entity in entities_with_relations:
         for relation_name, relation in entity.relations.items():
-            relation_blueprint = blueprint.relations[relation_name].target
-            blueprints_to_relations[relation_blueprint].extend(
-                relation if isinstance(relation, list) else [relation]
+            relation_blueprint = relations_targets.get(
+                (entity.blueprint, relation_name)
+            )
+            if relation_blueprint is None or relation is None:
+                continue
+            # multiple entities can point to the same relation in the same blueprint, for performance reasons
+            # we want to avoid fetching the same relation multiple times
+            blueprints_to_relations[relation_blueprint].update(
+                identifier
+                for identifier in (
+                    relation if isinstance(relation, list) else [relation]
+                )
+                # Relations to a search query don't point to a specific entity
+                if isinstance(identifier, str)
             )
 
     return [
         Entity(identifier=relation, blueprint=blueprint)
         for blueprint, relations in blueprints_to_relations.items()
-        # multiple entities can point to the same relation in the same blueprint, for performance reasons
-        # we want to avoid fetching the same relation multiple times
-        for relation in set(relations)
+        for relation in relations
     ]
+
+
+async def get_relations_targets(
+    blueprints: Iterable[str], port_client: PortClient
+) -> dict[tuple[str, str], str]:
+    """Returns the blueprint targeted by every relation of the given blueprints, keyed by blueprint and relation"""
+    fetched_blueprints = await asyncio.gather(
+        *(port_client.get_blueprint(blueprint) for blueprint in set(blueprints))
+    )
+    return {
+        (blueprint.identifier, relation_name): relation.target
+        for blueprint in fetched_blueprints
+        for relation_name, relation in blueprint.relations.items()
+    }
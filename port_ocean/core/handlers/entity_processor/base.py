@@ -3,7 +3,10 @@ from abc import abstractmethod
 from loguru import logger
 
 from port_ocean.core.handlers.base import BaseHandler
-from port_ocean.core.handlers.port_app_config.models import ResourceConfig
+from port_ocean.core.handlers.port_app_config.models import (
+    PortAppConfig,
+    ResourceConfig,
+)
 from port_ocean.core.ocean_types import (
     RAW_ITEM,
     CalculationResult,
@@ -30,6 +33,18 @@ class BaseEntityProcessor(BaseHandler):
     ) -> CalculationResult:
         pass
 
+    def precompile(self, port_app_config: PortAppConfig) -> None:
+        """Prepare the mappings of a newly loaded port app config ahead of the first resync.
+
+        Args:
+            port_app_config (PortAppConfig): The loaded port app configuration.
+        """
+        pass
+
+    def persist_state(self) -> None:
+        """Persist the state kept by the processor between resyncs, called once a resync is over."""
+        pass
+
     async def parse_items(
         self,
         mapping: ResourceConfig,
@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+# Number of port app configs whose compiled mappings are kept, older configs are evicted when a new one is registered
+MAX_REGISTERED_CONFIGS = 3
+
+
+@dataclass
+class CompiledMappingRegistryStats:
+    hits: int = 0
+    misses: int = 0
+    compilations: int = 0
+    compile_time: float = 0.0
+    evictions: int = 0
+
+
+class CompiledMappingRegistry:
+    """A process-wide registry of compiled entity mappings, grouped by the port app config they were compiled for
+
+    Every compiled value is stored under the most recently registered config, so once a config is replaced and
+    evicted, the programs that only it used are released. Lookups are thread safe, as mappings are compiled
+    from the thread pool as well.
+    """
+
+    def __init__(self, max_configs: int = MAX_REGISTERED_CONFIGS):
+        self._max_configs = max_configs
+        self._configs: OrderedDict[str, dict[Hashable, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CompiledMappingRegistryStats()
+
+    def _current_config(self) -> dict[Hashable, Any]:
+        if not self._configs:
+            # Values compiled before any config was registered are kept until the first config evicts them
+            self._configs[""] = {}
+        return next(reversed(self._configs.values()))
+
+    def register_config(self, config_hash: str) -> bool:
+        """
+        Make the given config the current one, evicting the oldest configs when there are too many.
+        Returns whether the config wasn't registered already.
+        """
+        with self._lock:
+            if config_hash in self._configs:
+                self._configs.move_to_end(config_hash)
+                return False
+
+            self._configs[config_hash] = {}
+            while len(self._configs) > self._max_configs:
+                self._configs.popitem(last=False)
+                self.stats.evictions += 1
+            return True
+
+    def get_or_compile(self, key: Hashable, compile_value: Callable[[], Any]) -> Any:
+        with self._lock:
+            current_config = self._current_config()
+            for compiled_values in reversed(self._configs.values()):
+                if key in compiled_values:
+                    self.stats.hits += 1
+                    # Values used by the current config must survive the eviction of the config they were compiled for
+                    current_config[key] = compiled_values[key]
+                    return compiled_values[key]
+            self.stats.misses += 1
+
+        start = time.perf_counter()
+        value = compile_value()
+        compile_time = time.perf_counter() - start
+
+        with self._lock:
+            self.stats.compilations += 1
+            self.stats.compile_time += compile_time
+            self._current_config()[key] = value
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._configs.clear()
+            self.stats = CompiledMappingRegistryStats()
+
+
+compiled_mapping_registry = CompiledMappingRegistry()
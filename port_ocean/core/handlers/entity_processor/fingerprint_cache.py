@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from loguru import logger
+
+
+class FingerprintCache:
+    """A bounded cache of mapping results keyed by the fingerprint of the raw item they were mapped from
+
+    A fingerprint hashes the raw item together with the version of the mapping applied to it, so a cached result is
+    reused only when neither changed. Results are kept serialized, which keeps them compact and ensures reusing a
+    result never shares objects with a previous resync. The least recently used results are evicted once the cache
+    is full, and when a path is given the cache is persisted to it, so it survives restarts of the integration.
+
+    The cache may be saved from another thread while realtime events use it, so the entries are accessed under a
+    lock and saved from a copy of them.
+    """
+
+    def __init__(self, max_size: int, path: str | None = None):
+        self._max_size = max_size
+        self._path = path
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        # Incremented on every change, so a save doesn't mark the changes made while it was writing as saved
+        self._version = 0
+        self._saved_version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def fingerprint(mapping_version: str, raw_item: Any) -> str | None:
+        """Returns the fingerprint of the raw item, or None when the raw item can't be serialized"""
+        try:
+            serialized_item = json.dumps(raw_item, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(
+            f"{mapping_version}:{serialized_item}".encode(), digest_size=16
+        ).hexdigest()
+
+    def fingerprint_batch(
+        self, mapping_version: str, raw_items: list[Any]
+    ) -> list[str | None]:
+        return [self.fingerprint(mapping_version, raw_item) for raw_item in raw_items]
+
+    def get(self, fingerprint: str) -> str | None:
+        with self._lock:
+            value = self._entries.get(fingerprint)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(fingerprint)
+            return value
+
+    def set(self, fingerprint: str, value: str) -> None:
+        with self._lock:
+            self._entries[fingerprint] = value
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+            self._version += 1
+
+    def load(self) -> None:
+        if not self._path or not os.path.exists(self._path):
+            return
+
+        try:
+            with open(self._path) as file:
+                entries = json.load(file)["entries"]
+        except Exception as exc:
+            logger.warning(
+                f"Failed to load the fingerprint cache from {self._path}, starting with an empty cache. Error: {exc}"
+            )
+            return
+
+        # Entries are persisted from the least to the most recently used, so the newest are kept when truncating
+        with self._lock:
+            self._entries = OrderedDict(entries[-self._max_size :])
+        logger.info(
+            f"Loaded {len(self._entries)} fingerprints from the fingerprint cache at {self._path}"
+        )
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._path or self._version == self._saved_version:
+                return
+            entries = list(self._entries.items())
+            version = self._version
+
+        temporary_path = f"{self._path}.tmp"
+        try:
+            with open(temporary_path, "w") as file:
+                json.dump({"entries": entries}, file)
+            # Replacing the file at once, so a crash while saving won't leave a corrupted cache behind
+            os.replace(temporary_path, self._path)
+        except Exception as exc:
+            logger.warning(
+                f"Failed to save the fingerprint cache to {self._path}. Error: {exc}"
+            )
+            return
+        self._saved_version = version
+        logger.info(
+            f"Saved {len(entries)} fingerprints to the fingerprint cache at {self._path}"
+        )
@@ -1,14 +1,35 @@
 import asyncio
+import hashlib
+import json
+import multiprocessing
+import re
+import time
 from asyncio import Task
-from dataclasses import dataclass, field
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
 from functools import lru_cache
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 import jq  # type: ignore
 from loguru import logger
 
-from port_ocean.context.ocean import ocean
+from port_ocean.context.ocean import PortOceanContext, ocean
 from port_ocean.core.handlers.entity_processor.base import BaseEntityProcessor
-from port_ocean.core.handlers.port_app_config.models import ResourceConfig
+from port_ocean.core.handlers.entity_processor.compiled_mapping_registry import (
+    compiled_mapping_registry,
+)
+from port_ocean.core.handlers.entity_processor.fingerprint_cache import (
+    FingerprintCache,
+)
+from port_ocean.core.handlers.entity_processor.simple_jq_expression import (
+    RequiresJQ,
+    SimpleJQExpression,
+    parse_simple_expression,
+)
+from port_ocean.core.handlers.port_app_config.models import (
+    PortAppConfig,
+    ResourceConfig,
+)
 from port_ocean.core.models import Entity
 from port_ocean.core.ocean_types import (
     RAW_ITEM,
@@ -20,7 +41,27 @@ from port_ocean.core.utils.utils import (
     zip_and_sum,
 )
 from port_ocean.exceptions.core import EntityProcessorException
+from port_ocean.exceptions.utils import SignalHandlerNotInitialized
 from port_ocean.utils.queue_utils import process_in_queue
+from port_ocean.utils.signal import signal_handler
+
+# A batch is only split between the worker processes when each of them gets at least this many items,
+# smaller chunks cost more in serialization than they save in mapping time
+MIN_PROCESS_POOL_CHUNK_SIZE = 50
+
+# Number of compiled JQ patterns kept by each processor, whole mappings are kept by the compiled mapping registry
+COMPILED_PATTERNS_CACHE_SIZE = 4096
+
+# JQ builtins whose results depend on the time or on the environment rather than only on the raw item, mappings
+# using them aren't cached. A name preceded by a dot, such as `.env`, is a field of the item and is allowed
+NON_DETERMINISTIC_JQ_PATTERN = re.compile(
+    r"(?<![\w.$])(now|input|inputs|input_filename|\$__loc__)(?!\w)"
+)
+ENVIRONMENT_JQ_PATTERN = re.compile(r"(?<![\w.])(env|\$ENV)(?!\w)")
+
+# The result of evaluating a compiled mapping on a single item: the index of the raw item in the batch,
+# the child item it was expanded to by `itemsToParse` (None otherwise), and the mapped values or the error
+EvaluatedItem = tuple[int, Any, list[Any] | Exception]
 
 
 @dataclass
@@ -36,17 +77,52 @@ class MappedEntity:
     misconfigurations: dict[str, str] = field(default_factory=dict)
 
 
+@dataclass
+class CompiledEntityMapping:
+    """Represents a whole entity mapping compiled into a single JQ program
+
+    Simple expressions (literals and plain paths) are evaluated in Python and left out of the program.
+    The program emits a flat list holding the selector result, unless the selector is simple, followed by the
+    value of every other mapped field, so an item is mapped with a single evaluation, and `batch_program` does
+    the same for a whole list of items. `program` is None when every expression is simple.
+    `shape` mirrors the raw mapping, with every JQ expression replaced by its position in `patterns`.
+    `item_program_source` is the source of the program including the selector, used to map the items
+    expanded by `itemsToParse`, or None when every expression, selector included, is simple.
+    """
+
+    program: Any
+    batch_program: Any
+    selector_query: str
+    shape: dict[str, Any]
+    patterns: list[str | None] = field(default_factory=list)
+    simple_expressions: list[SimpleJQExpression | None] = field(default_factory=list)
+    simple_selector: SimpleJQExpression | None = None
+    item_program_source: str | None = None
+
+
 class JQEntityProcessor(BaseEntityProcessor):
     """Processes and parses entities using JQ expressions.
 
     This class extends the BaseEntityProcessor and provides methods for processing and
     parsing entities based on PyJQ queries. It supports compiling and executing PyJQ patterns,
     searching for data in dictionaries, and transforming data based on object mappings.
+
+    When `entity_processing_process_pool_size` is configured, batches are mapped by a pool of worker processes
+    holding their own compiled mapping programs, instead of the default thread pool.
     """
 
-    @lru_cache
+    def __init__(self, context: PortOceanContext):
+        super().__init__(context)
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._fingerprint_cache: FingerprintCache | None = None
+
+    @property
+    def allow_environment_variables_jq_access(self) -> bool:
+        return ocean.config.allow_environment_variables_jq_access
+
+    @lru_cache(maxsize=COMPILED_PATTERNS_CACHE_SIZE)
     def _compile(self, pattern: str) -> Any:
-        if not ocean.config.allow_environment_variables_jq_access:
+        if not self.allow_environment_variables_jq_access:
             pattern = "def env: {}; {} as $ENV | " + pattern
         return jq.compile(pattern)
 
@@ -81,21 +157,47 @@ class JQEntityProcessor(BaseEntityProcessor):
                 f"{entity_mapping_fault_counter} transformations of batch failed due to empty, null or missing values"
             )
 
-    async def _search(self, data: dict[str, Any], pattern: str) -> Any:
+    @staticmethod
+    def _validate_selector_result(value: Any) -> bool:
+        if isinstance(value, bool):
+            return value
+        raise EntityProcessorException(
+            f"Expected boolean value, got value:{value} of type: {type(value)} instead"
+        )
+
+    def _first_result(self, data: dict[str, Any], pattern: str | None) -> Any:
+        """Return the first result of the pattern, raising if the pattern fails"""
+        if simple_expression := parse_simple_expression(pattern):
+            try:
+                return simple_expression.evaluate(data)
+            except RequiresJQ:
+                pass
+
+        compiled_pattern = self._compile(pattern)
+        func = compiled_pattern.input_value(data)
+        return self._stop_iterator_handler(func.first)()
+
+    def _search_sync(self, data: dict[str, Any], pattern: str | None) -> Any:
         try:
-            loop = asyncio.get_event_loop()
-            compiled_pattern = self._compile(pattern)
-            func = compiled_pattern.input_value(data)
-            return await loop.run_in_executor(
-                None, self._stop_iterator_handler(func.first)
-            )
+            return self._first_result(data, pattern)
         except Exception as exc:
             logger.debug(
                 f"Search failed for pattern '{pattern}' in data: {data}, Error: {exc}"
             )
             return None
 
+    async def _search(self, data: dict[str, Any], pattern: str) -> Any:
+        # Simple expressions are plain lookups, so they aren't worth a round-trip to the thread pool
+        if parse_simple_expression(pattern):
+            return self._search_sync(data, pattern)
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._search_sync, data, pattern)
+
     async def _search_as_bool(self, data: dict[str, Any], pattern: str) -> bool:
+        if parse_simple_expression(pattern):
+            return self._validate_selector_result(self._first_result(data, pattern))
+
         loop = asyncio.get_event_loop()
 
         compiled_pattern = self._compile(pattern)
@@ -104,11 +206,432 @@ class JQEntityProcessor(BaseEntityProcessor):
         value = await loop.run_in_executor(
             None, self._stop_iterator_handler(func.first)
         )
-        if isinstance(value, bool):
-            return value
-        raise EntityProcessorException(
-            f"Expected boolean value, got value:{value} of type: {type(value)} instead"
+        return self._validate_selector_result(value)
+
+    @staticmethod
+    def _first_value_expression(pattern: str) -> str:
+        # Collecting the first output into an array keeps the semantics of `.first()`: the first value of the
+        # expression, or null when it has no output. The newline ends any trailing comment in the pattern.
+        return f"([first({pattern}\n)] | .[0])"
+
+    def _build_mapping_shape(
+        self, obj: dict[str, Any], patterns: list[str | None]
+    ) -> dict[str, Any] | None:
+        shape: dict[str, Any] = {}
+        for key, value in obj.items():
+            if isinstance(value, list):
+                items_shape = []
+                for item in value:
+                    if not isinstance(item, dict):
+                        return None
+                    item_shape = self._build_mapping_shape(item, patterns)
+                    if item_shape is None:
+                        return None
+                    items_shape.append(item_shape)
+                shape[key] = items_shape
+            elif isinstance(value, dict):
+                value_shape = self._build_mapping_shape(value, patterns)
+                if value_shape is None:
+                    return None
+                shape[key] = value_shape
+            elif value is None or isinstance(value, str):
+                shape[key] = len(patterns)
+                patterns.append(value)
+            else:
+                return None
+        return shape
+
+    def _compile_entity_mapping(
+        self, selector_query: str, raw_entity_mappings_json: str, parse_all: bool
+    ) -> CompiledEntityMapping | None:
+        return compiled_mapping_registry.get_or_compile(
+            (
+                "entity_mapping",
+                selector_query,
+                raw_entity_mappings_json,
+                parse_all,
+                self.allow_environment_variables_jq_access,
+            ),
+            lambda: self._build_compiled_entity_mapping(
+                selector_query, raw_entity_mappings_json, parse_all
+            ),
+        )
+
+    def _build_compiled_entity_mapping(
+        self, selector_query: str, raw_entity_mappings_json: str, parse_all: bool
+    ) -> CompiledEntityMapping | None:
+        """
+        Compile the selector and every field of an entity mapping into a single JQ program.
+        Returns None when the mapping can't be combined, in which case every expression is evaluated on its own.
+        """
+        try:
+            self._compile(selector_query)
+        except Exception:
+            return None
+
+        patterns: list[str | None] = []
+        shape = self._build_mapping_shape(
+            json.loads(raw_entity_mappings_json), patterns
+        )
+        if shape is None:
+            return None
+
+        simple_expressions: list[SimpleJQExpression | None] = []
+        fields = []
+        for pattern in patterns:
+            simple_expression = parse_simple_expression(pattern)
+            if simple_expression is None:
+                try:
+                    self._compile(pattern)
+                    fields.append(self._first_value_expression(pattern))  # type: ignore[arg-type]
+                except Exception as exc:
+                    # Invalid expressions are mapped to null, same as when they are evaluated on their own
+                    logger.warning(
+                        f"Invalid JQ expression '{pattern}' in entity mapping, it will be mapped to null. Error: {exc}"
+                    )
+                    simple_expression = SimpleJQExpression(literal=None)
+            simple_expressions.append(simple_expression)
+
+        simple_selector = parse_simple_expression(selector_query)
+        values = ", ".join(["$__selector", *fields])
+        if parse_all:
+            body = f"[{values}]"
+        else:
+            body = f"if $__selector == true then [{values}] else [$__selector] end"
+        item_program_source: str | None = (
+            f"{self._first_value_expression(selector_query)} as $__selector | {body}"
+        )
+        program: str | None = None
+        if simple_selector is None:
+            program = item_program_source
+        elif fields:
+            program = f"[{', '.join(fields)}]"
+        else:
+            item_program_source = None
+
+        compiled_program = compiled_batch_program = None
+        if program is not None:
+            try:
+                compiled_program = self._compile(program)
+                compiled_batch_program = self._compile(f"map({program})")
+            except Exception as exc:
+                logger.debug(
+                    f"Failed to compile the combined mapping program, falling back to evaluating each expression. Error: {exc}"
+                )
+                return None
+
+        return CompiledEntityMapping(
+            compiled_program,
+            compiled_batch_program,
+            selector_query,
+            shape,
+            patterns,
+            simple_expressions,
+            simple_selector,
+            item_program_source,
+        )
+
+    def _compile_items_to_parse_program(
+        self, item_program_source: str, items_to_parse: str
+    ) -> Any:
+        return compiled_mapping_registry.get_or_compile(
+            (
+                "items_to_parse",
+                item_program_source,
+                items_to_parse,
+                self.allow_environment_variables_jq_access,
+            ),
+            lambda: self._build_items_to_parse_program(
+                item_program_source, items_to_parse
+            ),
+        )
+
+    def _build_items_to_parse_program(
+        self, item_program_source: str, items_to_parse: str
+    ) -> Any:
+        """
+        Compile a program mapping every item expanded by `itemsToParse` out of a single raw item.
+        The raw item is passed to JQ once and bound to a variable, and each item is merged into it inside JQ,
+        instead of serializing a merged copy of the raw item for every one of its items.
+        The program streams one output per item, in the format of the combined mapping program.
+        """
+        try:
+            return self._compile(
+                f". as $__parent | {self._first_value_expression(items_to_parse)} | .[] "
+                f"| ({{item: .}} + $__parent) | {item_program_source}"
+            )
+        except Exception as exc:
+            logger.debug(
+                f"Failed to compile the items to parse program, evaluating each item on its own. Error: {exc}"
+            )
+            return None
+
+    def _evaluate_fields(
+        self,
+        compiled_mapping: CompiledEntityMapping,
+        data: dict[str, Any],
+        program_values: list[Any],
+    ) -> list[Any]:
+        """Merge the values computed by the program with the values of the simple expressions"""
+        program_values_iterator = iter(program_values)
+        values = []
+        for pattern, simple_expression in zip(
+            compiled_mapping.patterns, compiled_mapping.simple_expressions
+        ):
+            if simple_expression is None:
+                values.append(next(program_values_iterator))
+                continue
+            try:
+                values.append(simple_expression.evaluate(data))
+            except RequiresJQ:
+                values.append(self._search_sync(data, pattern))
+        return values
+
+    def _evaluate_each_expression(
+        self,
+        compiled_mapping: CompiledEntityMapping,
+        data: dict[str, Any],
+        parse_all: bool,
+    ) -> list[Any]:
+        should_run = self._first_result(data, compiled_mapping.selector_query)
+        if not (parse_all or should_run is True):
+            return [should_run]
+        return [
+            should_run,
+            *(
+                self._search_sync(data, pattern)
+                for pattern in compiled_mapping.patterns
+            ),
+        ]
+
+    def _evaluate_compiled_mapping(
+        self,
+        compiled_mapping: CompiledEntityMapping,
+        data: dict[str, Any],
+        parse_all: bool,
+    ) -> list[Any]:
+        program_values: list[Any] = []
+        try:
+            if compiled_mapping.simple_selector is None:
+                should_run, *program_values = compiled_mapping.program.input_value(
+                    data
+                ).first()
+            else:
+                should_run = self._first_result(data, compiled_mapping.selector_query)
+                if (parse_all or should_run is True) and compiled_mapping.program:
+                    program_values = compiled_mapping.program.input_value(data).first()
+        except Exception as exc:
+            logger.debug(
+                f"Combined mapping program failed, evaluating each expression on its own. Error: {exc}"
+            )
+            return self._evaluate_each_expression(compiled_mapping, data, parse_all)
+
+        if not (parse_all or should_run is True):
+            return [should_run]
+        return [
+            should_run,
+            *self._evaluate_fields(compiled_mapping, data, program_values),
+        ]
+
+    def _evaluate_item(
+        self,
+        compiled_mapping: CompiledEntityMapping,
+        index: int,
+        item: Any,
+        data: dict[str, Any],
+        parse_all: bool,
+    ) -> EvaluatedItem:
+        try:
+            return (
+                index,
+                item,
+                self._evaluate_compiled_mapping(compiled_mapping, data, parse_all),
+            )
+        except Exception as exc:
+            return index, item, exc
+
+    def _evaluate_parsed_items(
+        self,
+        compiled_mapping: CompiledEntityMapping,
+        index: int,
+        data: dict[str, Any],
+        items_to_parse: str,
+        parse_all: bool,
+    ) -> Iterator[EvaluatedItem]:
+        """
+        Map the items expanded by `itemsToParse` out of a single raw item, one item at a time.
+        The JQ program streams its outputs, so the mapped values of an item are produced only when it is reached.
+        When the program fails, the rest of the items are evaluated on their own.
+        """
+        items = self._search_sync(data, items_to_parse)
+        if not isinstance(items, list):
+            logger.warning(
+                f"Failed to parse items for JQ expression {items_to_parse}, Expected list but got {type(items)}."
+                f" Skipping..."
+            )
+            return
+
+        items_program = None
+        if compiled_mapping.item_program_source is not None and items:
+            items_program = self._compile_items_to_parse_program(
+                compiled_mapping.item_program_source, items_to_parse
+            )
+        program_outputs = (
+            iter(items_program.input_value(data)) if items_program else None
+        )
+
+        for item in items:
+            # A shallow merge, the item and the values of the raw item are shared rather than copied
+            item_data = {"item": item, **data}
+            if program_outputs is not None:
+                try:
+                    should_run, *program_values = next(program_outputs)
+                except Exception as exc:
+                    logger.debug(
+                        f"Items to parse program failed, evaluating each item on its own. Error: {exc}"
+                    )
+                    program_outputs = None
+                else:
+                    if not (parse_all or should_run is True):
+                        yield index, item, [should_run]
+                        continue
+                    try:
+                        values = self._evaluate_fields(
+                            compiled_mapping, item_data, program_values
+                        )
+                    except Exception as exc:
+                        yield index, item, exc
+                        continue
+                    yield index, item, [should_run, *values]
+                    continue
+            yield self._evaluate_item(
+                compiled_mapping, index, item, item_data, parse_all
+            )
+
+    def _evaluate_compiled_mapping_batch(
+        self,
+        compiled_mapping: CompiledEntityMapping,
+        raw_results: list[RAW_ITEM],
+        items_to_parse: str | None,
+        parse_all: bool,
+    ) -> list[EvaluatedItem]:
+        """
+        Map a whole batch of raw items with a single evaluation of the batch program.
+        When the batch program fails, every item is evaluated on its own so a single bad item won't fail the batch.
+        """
+        if items_to_parse:
+            return [
+                evaluated_item
+                for index, data in enumerate(raw_results)
+                for evaluated_item in self._evaluate_parsed_items(
+                    compiled_mapping, index, data, items_to_parse, parse_all
+                )
+            ]
+
+        if not raw_results:
+            return []
+
+        # Indexes of the items to run the program on, along with the values evaluated before it,
+        # which are the selector result when the selector is simple
+        items_to_evaluate: list[tuple[int, list[Any]]] = []
+        results: list[EvaluatedItem | None] = [None] * len(raw_results)
+        for index, data in enumerate(raw_results):
+            if compiled_mapping.simple_selector is None:
+                items_to_evaluate.append((index, []))
+                continue
+            try:
+                should_run = self._first_result(data, compiled_mapping.selector_query)
+            except Exception as exc:
+                results[index] = (index, None, exc)
+                continue
+            if parse_all or should_run is True:
+                items_to_evaluate.append((index, [should_run]))
+            else:
+                results[index] = (index, None, [should_run])
+
+        program_outputs: list[list[Any]] = [[] for _ in items_to_evaluate]
+        if compiled_mapping.batch_program is not None and items_to_evaluate:
+            try:
+                program_outputs = compiled_mapping.batch_program.input_value(
+                    [raw_results[index] for index, _ in items_to_evaluate]
+                ).first()
+            except Exception as exc:
+                logger.debug(
+                    f"Combined mapping program failed for batch, evaluating each item on its own. Error: {exc}"
+                )
+                program_outputs = []
+                for index, _ in items_to_evaluate:
+                    results[index] = self._evaluate_item(
+                        compiled_mapping, index, None, raw_results[index], parse_all
+                    )
+
+        for (index, values), program_output in zip(items_to_evaluate, program_outputs):
+            should_run, *program_values = values + program_output
+            if parse_all or should_run is True:
+                results[index] = (
+                    index,
+                    None,
+                    [
+                        should_run,
+                        *self._evaluate_fields(
+                            compiled_mapping, raw_results[index], program_values
+                        ),
+                    ],
+                )
+            else:
+                results[index] = (index, None, [should_run])
+        return [result for result in results if result is not None]
+
+    def _to_mapped_entity(
+        self,
+        compiled_mapping: CompiledEntityMapping,
+        data: dict[str, Any],
+        values: list[Any],
+        parse_all: bool,
+    ) -> MappedEntity:
+        should_run = self._validate_selector_result(values[0])
+        if not (parse_all or should_run):
+            return MappedEntity()
+
+        misconfigurations: dict[str, str] = {}
+        mapped_entity = self._fill_mapping_shape(
+            compiled_mapping.shape,
+            values[1:],
+            compiled_mapping.patterns,
+            misconfigurations,
         )
+        return MappedEntity(
+            mapped_entity,
+            did_entity_pass_selector=should_run,
+            raw_data=data if should_run else None,
+            misconfigurations=misconfigurations,
+        )
+
+    @staticmethod
+    def _fill_mapping_shape(
+        shape: dict[str, Any],
+        values: list[Any],
+        patterns: list[str | None],
+        misconfigurations: dict[str, str],
+    ) -> dict[str, Any | None]:
+        result: dict[str, Any | None] = {}
+        for key, value_shape in shape.items():
+            if isinstance(value_shape, list):
+                result[key] = [
+                    JQEntityProcessor._fill_mapping_shape(
+                        item_shape, values, patterns, misconfigurations
+                    )
+                    for item_shape in value_shape
+                ]
+            elif isinstance(value_shape, dict):
+                result[key] = JQEntityProcessor._fill_mapping_shape(
+                    value_shape, values, patterns, misconfigurations
+                )
+            else:
+                result[key] = values[value_shape]
+                if result[key] is None:
+                    misconfigurations[key] = patterns[value_shape]
+        return result
 
     async def _search_as_object(
         self,
@@ -173,6 +696,20 @@ class JQEntityProcessor(BaseEntityProcessor):
         selector_query: str,
         parse_all: bool = False,
     ) -> MappedEntity:
+        compiled_mapping = self._compile_entity_mapping(
+            selector_query, json.dumps(raw_entity_mappings), parse_all
+        )
+        if compiled_mapping is not None:
+            loop = asyncio.get_event_loop()
+            values = await loop.run_in_executor(
+                None,
+                self._evaluate_compiled_mapping,
+                compiled_mapping,
+                data,
+                parse_all,
+            )
+            return self._to_mapped_entity(compiled_mapping, data, values, parse_all)
+
         should_run = await self._search_as_bool(data, selector_query)
         if parse_all or should_run:
             misconfigurations: dict[str, str] = {}
@@ -224,6 +761,362 @@ class JQEntityProcessor(BaseEntityProcessor):
             )
         return entities, errors
 
+    def _get_process_pool(self, pool_size: int) -> Executor:
+        if self._process_pool is None:
+            logger.info(
+                f"Starting entity processing process pool with {pool_size} workers"
+            )
+            # Spawning the workers instead of forking them, as forking a process that runs threads is not safe
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=pool_size,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_entity_processing_worker,
+                initargs=(self.allow_environment_variables_jq_access,),
+            )
+            try:
+                signal_handler.register(self.shutdown_process_pool)
+            except SignalHandlerNotInitialized:
+                pass
+        return self._process_pool
+
+    def shutdown_process_pool(self) -> None:
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    async def _evaluate_in_process_pool(
+        self,
+        process_pool: Executor,
+        pool_size: int,
+        selector_query: str,
+        raw_entity_mappings_json: str,
+        raw_results: list[RAW_ITEM],
+        items_to_parse: str | None,
+        parse_all: bool,
+    ) -> list[EvaluatedItem]:
+        loop = asyncio.get_event_loop()
+        chunk_size = max(MIN_PROCESS_POOL_CHUNK_SIZE, -(-len(raw_results) // pool_size))
+        chunks_results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    process_pool,
+                    _evaluate_mapping_batch_in_worker,
+                    selector_query,
+                    raw_entity_mappings_json,
+                    raw_results[start : start + chunk_size],
+                    items_to_parse,
+                    parse_all,
+                )
+                for start in range(0, len(raw_results), chunk_size)
+            )
+        )
+        return [
+            (start + index, item, values)
+            for start, chunk_results in zip(
+                range(0, len(raw_results), chunk_size), chunks_results
+            )
+            for index, item, values in chunk_results
+        ]
+
+    async def _evaluate_batch(
+        self,
+        compiled_mapping: CompiledEntityMapping,
+        raw_entity_mappings_json: str,
+        raw_results: list[RAW_ITEM],
+        items_to_parse: str | None,
+        parse_all: bool,
+    ) -> list[EvaluatedItem]:
+        if pool_size := ocean.config.entity_processing_process_pool_size:
+            try:
+                return await self._evaluate_in_process_pool(
+                    self._get_process_pool(pool_size),
+                    pool_size,
+                    compiled_mapping.selector_query,
+                    raw_entity_mappings_json,
+                    raw_results,
+                    items_to_parse,
+                    parse_all,
+                )
+            except BrokenProcessPool as exc:
+                # The pool can't be used anymore once a worker died, a new one will be started for the next batch
+                logger.warning(
+                    f"Entity processing process pool is broken, mapping the batch on the thread pool. Error: {exc}"
+                )
+                self.shutdown_process_pool()
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            self._evaluate_compiled_mapping_batch,
+            compiled_mapping,
+            raw_results,
+            items_to_parse,
+            parse_all,
+        )
+
+    def _get_fingerprint_cache(self) -> FingerprintCache | None:
+        cache_size = ocean.config.entity_processing_fingerprint_cache_size
+        if not cache_size:
+            return None
+
+        if self._fingerprint_cache is None:
+            self._fingerprint_cache = FingerprintCache(
+                cache_size, ocean.config.entity_processing_fingerprint_cache_path
+            )
+            self._fingerprint_cache.load()
+            try:
+                signal_handler.register(self._fingerprint_cache.save)
+            except SignalHandlerNotInitialized:
+                pass
+        return self._fingerprint_cache
+
+    def _is_cacheable_mapping(
+        self,
+        raw_entity_mappings_json: str,
+        selector_query: str,
+        items_to_parse: str | None,
+    ) -> bool:
+        """Whether the mapping results depend only on the raw item, so they can be reused while it is unchanged"""
+        sources = (
+            f"{raw_entity_mappings_json}\n{selector_query}\n{items_to_parse or ''}"
+        )
+        if NON_DETERMINISTIC_JQ_PATTERN.search(sources):
+            return False
+        # Without access to the environment variables, `env` and `$ENV` are empty objects
+        return not (
+            self.allow_environment_variables_jq_access
+            and ENVIRONMENT_JQ_PATTERN.search(sources)
+        )
+
+    def _mapping_version(
+        self,
+        raw_entity_mappings_json: str,
+        selector_query: str,
+        items_to_parse: str | None,
+        parse_all: bool,
+    ) -> str:
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    raw_entity_mappings_json,
+                    selector_query,
+                    items_to_parse,
+                    parse_all,
+                    self.allow_environment_variables_jq_access,
+                ]
+            ).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def _serialize_mapped_entities(mapped_entities: list[MappedEntity]) -> str:
+        return json.dumps(
+            [
+                [
+                    mapped_entity.entity,
+                    mapped_entity.did_entity_pass_selector,
+                    mapped_entity.misconfigurations,
+                ]
+                for mapped_entity in mapped_entities
+            ]
+        )
+
+    @staticmethod
+    def _deserialize_mapped_entities(
+        serialized_mapped_entities: str, data: RAW_ITEM, items_to_parse: str | None
+    ) -> list[MappedEntity]:
+        return [
+            MappedEntity(
+                entity,
+                did_entity_pass_selector=did_entity_pass_selector,
+                # The expanded items aren't kept by the cache, only the raw item itself is available
+                raw_data=(
+                    data if did_entity_pass_selector and not items_to_parse else None
+                ),
+                misconfigurations=misconfigurations,
+            )
+            for entity, did_entity_pass_selector, misconfigurations in json.loads(
+                serialized_mapped_entities
+            )
+        ]
+
+    async def _restore_items_to_parse_examples(
+        self,
+        mapped_entities: list[list[MappedEntity] | None],
+        raw_results: list[RAW_ITEM],
+        items_to_parse: str,
+        examples_amount: int,
+    ) -> None:
+        """
+        Restores the raw data of cached entities expanded by `itemsToParse`, which the cache doesn't keep, until
+        there are enough raw data examples to send. The cached entities of a raw item follow the order of its items.
+        """
+        for index, entities in enumerate(mapped_entities):
+            if examples_amount <= 0:
+                return
+            if not entities or not any(
+                entity.did_entity_pass_selector for entity in entities
+            ):
+                continue
+
+            items = await self._search(raw_results[index], items_to_parse)
+            if not isinstance(items, list) or len(items) != len(entities):
+                continue
+            for entity, item in zip(entities, items):
+                if entity.did_entity_pass_selector and examples_amount > 0:
+                    entity.raw_data = {"item": item, **raw_results[index]}
+                    examples_amount -= 1
+
+    async def _calculate_entities_in_batch(
+        self,
+        compiled_mapping: CompiledEntityMapping,
+        raw_entity_mappings_json: str,
+        raw_results: list[RAW_ITEM],
+        items_to_parse: str | None,
+        parse_all: bool = False,
+        send_raw_data_examples_amount: int = 0,
+    ) -> tuple[list[MappedEntity], list[Exception]]:
+        # The mapped entities of every raw item, None for the raw items that still need to be mapped
+        mapped_entities: list[list[MappedEntity] | None] = [None] * len(raw_results)
+        fingerprints: list[str | None] = [None] * len(raw_results)
+        fingerprint_cache = self._get_fingerprint_cache()
+        if fingerprint_cache is not None and not self._is_cacheable_mapping(
+            raw_entity_mappings_json, compiled_mapping.selector_query, items_to_parse
+        ):
+            logger.debug(
+                "The mapping depends on the time or the environment, its results aren't cached"
+            )
+            fingerprint_cache = None
+        if fingerprint_cache is not None:
+            loop = asyncio.get_event_loop()
+            fingerprints = await loop.run_in_executor(
+                None,
+                fingerprint_cache.fingerprint_batch,
+                self._mapping_version(
+                    raw_entity_mappings_json,
+                    compiled_mapping.selector_query,
+                    items_to_parse,
+                    parse_all,
+                ),
+                raw_results,
+            )
+            for index, fingerprint in enumerate(fingerprints):
+                if fingerprint and (cached := fingerprint_cache.get(fingerprint)):
+                    mapped_entities[index] = self._deserialize_mapped_entities(
+                        cached, raw_results[index], items_to_parse
+                    )
+            if items_to_parse and send_raw_data_examples_amount > 0:
+                await self._restore_items_to_parse_examples(
+                    mapped_entities,
+                    raw_results,
+                    items_to_parse,
+                    send_raw_data_examples_amount,
+                )
+
+        indexes_to_map = [
+            index for index, entities in enumerate(mapped_entities) if entities is None
+        ]
+        if fingerprint_cache is not None:
+            logger.debug(
+                f"Reusing the mapping of {len(raw_results) - len(indexes_to_map)} out of {len(raw_results)}"
+                f" raw results from the fingerprint cache"
+            )
+
+        evaluated_items: list[EvaluatedItem] = []
+        if indexes_to_map:
+            evaluated_items = await self._evaluate_batch(
+                compiled_mapping,
+                raw_entity_mappings_json,
+                (
+                    raw_results
+                    if len(indexes_to_map) == len(raw_results)
+                    else [raw_results[index] for index in indexes_to_map]
+                ),
+                items_to_parse,
+                parse_all,
+            )
+        newly_mapped_entities: dict[int, list[MappedEntity]] = {
+            index: [] for index in indexes_to_map
+        }
+        errors: list[Exception] = []
+        failed_indexes: set[int] = set()
+        for position, item, values in evaluated_items:
+            index = indexes_to_map[position]
+            if isinstance(values, Exception):
+                errors.append(values)
+                failed_indexes.add(index)
+                continue
+            data = (
+                {"item": item, **raw_results[index]}
+                if items_to_parse
+                else raw_results[index]
+            )
+            try:
+                newly_mapped_entities[index].append(
+                    self._to_mapped_entity(compiled_mapping, data, values, parse_all)
+                )
+            except Exception as exc:
+                errors.append(exc)
+                failed_indexes.add(index)
+
+        for index, entities in newly_mapped_entities.items():
+            mapped_entities[index] = entities
+            fingerprint = fingerprints[index]
+            # Raw items that failed to map are left out of the cache, so they are mapped again on the next resync
+            if (
+                fingerprint_cache is not None
+                and fingerprint
+                and index not in failed_indexes
+            ):
+                fingerprint_cache.set(
+                    fingerprint, self._serialize_mapped_entities(entities)
+                )
+
+        if errors:
+            logger.error(
+                f"Failed to calculate entities with {len(errors)} errors. errors: {errors}"
+            )
+        return [
+            mapped_entity
+            for entities in mapped_entities
+            for mapped_entity in entities or []
+        ], errors
+
+    def persist_state(self) -> None:
+        if self._fingerprint_cache is not None:
+            self._fingerprint_cache.save()
+
+    def precompile(self, port_app_config: PortAppConfig) -> None:
+        config_hash = hashlib.sha256(
+            port_app_config.json(sort_keys=True).encode()
+        ).hexdigest()
+        if not compiled_mapping_registry.register_config(config_hash):
+            return
+
+        start = time.perf_counter()
+        for resource in port_app_config.resources:
+            raw_entity_mappings_json = json.dumps(
+                resource.port.entity.mappings.dict(exclude_unset=True)
+            )
+            # Resyncs map only the entities passing the selector, while realtime events map all of them
+            for parse_all in (False, True):
+                compiled_mapping = self._compile_entity_mapping(
+                    resource.selector.query, raw_entity_mappings_json, parse_all
+                )
+                if (
+                    compiled_mapping is not None
+                    and compiled_mapping.item_program_source is not None
+                    and resource.port.items_to_parse
+                ):
+                    self._compile_items_to_parse_program(
+                        compiled_mapping.item_program_source,
+                        resource.port.items_to_parse,
+                    )
+
+        logger.info(
+            f"Precompiled the entity mappings of {len(port_app_config.resources)} resources"
+            f" in {time.perf_counter() - start:.3f} seconds, registry stats: {asdict(compiled_mapping_registry.stats)}"
+        )
+
     @staticmethod
     async def _send_examples(data: list[dict[str, Any]], kind: str) -> None:
         try:
@@ -248,16 +1141,32 @@ class JQEntityProcessor(BaseEntityProcessor):
             exclude_unset=True
         )
         logger.info(f"Parsing {len(raw_results)} raw results into entities")
-        calculated_entities_results, errors = zip_and_sum(
-            await process_in_queue(
-                raw_results,
-                self._calculate_entity,
-                raw_entity_mappings,
-                mapping.port.items_to_parse,
-                mapping.selector.query,
-                parse_all,
-            )
+        raw_entity_mappings_json = json.dumps(raw_entity_mappings)
+        compiled_mapping = self._compile_entity_mapping(
+            mapping.selector.query, raw_entity_mappings_json, parse_all
         )
+        if compiled_mapping is not None:
+            calculated_entities_results, errors = (
+                await self._calculate_entities_in_batch(
+                    compiled_mapping,
+                    raw_entity_mappings_json,
+                    raw_results,
+                    mapping.port.items_to_parse,
+                    parse_all,
+                    send_raw_data_examples_amount,
+                )
+            )
+        else:
+            calculated_entities_results, errors = zip_and_sum(
+                await process_in_queue(
+                    raw_results,
+                    self._calculate_entity,
+                    raw_entity_mappings,
+                    mapping.port.items_to_parse,
+                    mapping.selector.query,
+                    parse_all,
+                )
+            )
         logger.debug(
             f"Finished parsing raw results into entities with {len(errors)} errors. errors: {errors}"
         )
@@ -311,3 +1220,58 @@ class JQEntityProcessor(BaseEntityProcessor):
             errors,
             misonfigured_entity_keys=entity_misconfigurations,
         )
+
+
+class _EntityProcessingWorker(JQEntityProcessor):
+    """The entity processor living inside each worker process of the entity processing process pool.
+
+    Workers have no access to the Ocean context, so the settings they need are passed on initialization.
+    """
+
+    def __init__(self, allow_environment_variables_jq_access: bool):
+        super().__init__(ocean)
+        self._allow_environment_variables_jq_access = (
+            allow_environment_variables_jq_access
+        )
+
+    @property
+    def allow_environment_variables_jq_access(self) -> bool:
+        return self._allow_environment_variables_jq_access
+
+
+_worker_entity_processor: _EntityProcessingWorker | None = None
+
+
+def _init_entity_processing_worker(allow_environment_variables_jq_access: bool) -> None:
+    # Imported here as the log handlers depend on the Ocean app, which imports this module
+    from port_ocean.config.settings import ApplicationSettings
+    from port_ocean.log.logger_setup import setup_logger
+
+    global _worker_entity_processor
+    setup_logger(ApplicationSettings().log_level, enable_http_handler=False)
+    _worker_entity_processor = _EntityProcessingWorker(
+        allow_environment_variables_jq_access
+    )
+
+
+def _evaluate_mapping_batch_in_worker(
+    selector_query: str,
+    raw_entity_mappings_json: str,
+    raw_results: list[RAW_ITEM],
+    items_to_parse: str | None,
+    parse_all: bool,
+) -> list[EvaluatedItem]:
+    if _worker_entity_processor is None:
+        raise EntityProcessorException("Entity processing worker is not initialized")
+
+    # Each worker process has its own compiled mapping registry, so every mapping is compiled once per worker
+    compiled_mapping = _worker_entity_processor._compile_entity_mapping(
+        selector_query, raw_entity_mappings_json, parse_all
+    )
+    if compiled_mapping is None:
+        raise EntityProcessorException(
+            "Failed to compile the entity mapping in the entity processing worker"
+        )
+    return _worker_entity_processor._evaluate_compiled_mapping_batch(
+        compiled_mapping, raw_results, items_to_parse, parse_all
+    )
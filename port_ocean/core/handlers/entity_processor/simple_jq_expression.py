@@ -0,0 +1,91 @@
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+# Largest integer JQ represents exactly, bigger numbers are left for JQ to stringify
+MAX_SAFE_INTEGER = 2**53
+
+_KEY = r'(?:[a-zA-Z_][a-zA-Z0-9_]*|"[^"\\]*")'
+_PATH_PATTERN = re.compile(rf"^\.(?:{_KEY}(?:\.{_KEY})*)?$")
+_KEY_PATTERN = re.compile(_KEY)
+_TOSTRING_PATTERN = re.compile(r"^(?P<path>.*?)\s*\|\s*tostring$", re.DOTALL)
+_STRING_LITERAL_PATTERN = re.compile(r'^"[^"\\]*"$')
+_INTEGER_LITERAL_PATTERN = re.compile(r"^-?(?:0|[1-9][0-9]*)$")
+_KEYWORD_LITERALS = {"true": True, "false": False, "null": None}
+
+
+class RequiresJQ(Exception):
+    """Raised when a simple expression can't reproduce the exact JQ result for the given input"""
+
+
+@dataclass(frozen=True)
+class SimpleJQExpression:
+    """A JQ expression simple enough to be evaluated without JQ
+
+    Either a literal (`"service"`, `true`, `42`), or a path of object keys (`.metadata.labels.team`),
+    optionally piped into `tostring`.
+    """
+
+    path: tuple[str, ...] | None = None
+    literal: Any = None
+    to_string: bool = False
+
+    def evaluate(self, data: Any) -> Any:
+        if self.path is None:
+            return self.literal
+
+        value = data
+        for key in self.path:
+            if value is None:
+                continue
+            if not isinstance(value, dict):
+                # JQ fails when indexing anything but an object or null, let it produce the error
+                raise RequiresJQ()
+            value = value.get(key)
+
+        if not self.to_string or isinstance(value, str):
+            return value
+        if value is None or isinstance(value, bool):
+            return json.dumps(value)
+        if isinstance(value, int) and abs(value) < MAX_SAFE_INTEGER:
+            return str(value)
+        # Floats, objects and arrays are formatted by JQ's own serializer
+        raise RequiresJQ()
+
+
+def _parse_path(pattern: str) -> tuple[str, ...] | None:
+    if not _PATH_PATTERN.match(pattern):
+        return None
+    return tuple(key.strip('"') for key in _KEY_PATTERN.findall(pattern[1:]))
+
+
+@lru_cache
+def parse_simple_expression(pattern: str | None) -> SimpleJQExpression | None:
+    """
+    Classify a JQ expression, returning a SimpleJQExpression when it can be evaluated with plain lookups,
+    or None when it has to run through JQ.
+    """
+    if not isinstance(pattern, str):
+        return None
+    pattern = pattern.strip()
+
+    if pattern in _KEYWORD_LITERALS:
+        return SimpleJQExpression(literal=_KEYWORD_LITERALS[pattern])
+    if _STRING_LITERAL_PATTERN.match(pattern):
+        return SimpleJQExpression(literal=pattern[1:-1])
+    if _INTEGER_LITERAL_PATTERN.match(pattern):
+        if abs(int(pattern)) < MAX_SAFE_INTEGER:
+            return SimpleJQExpression(literal=int(pattern))
+        return None
+
+    to_string = False
+    if match := _TOSTRING_PATTERN.match(pattern):
+        pattern = match.group("path")
+        to_string = True
+
+    path = _parse_path(pattern)
+    if path is None:
+        return None
+    return SimpleJQExpression(path=path, to_string=to_string)
@@ -1,3 +1,5 @@
+import asyncio
+import hashlib
 from abc import abstractmethod
 from typing import Type, Any
 
@@ -55,11 +57,34 @@ class BasePortAppConfig(BaseHandler):
         self._app_config_cache = PortAppConfigCache(
             self.context.config.port.port_app_config_cache_ttl
         )
+        self._precompiled_config_hash: str | None = None
 
     @abstractmethod
     async def _get_port_app_config(self) -> dict[str, Any]:
         pass
 
+    async def _precompile_mappings(self, port_app_config: PortAppConfig) -> None:
+        config_hash = hashlib.sha256(
+            port_app_config.json(sort_keys=True).encode()
+        ).hexdigest()
+        if config_hash == self._precompiled_config_hash:
+            return
+
+        try:
+            # Compiling the mappings of a large config takes a while, so it doesn't block the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.context.integration.entity_processor.precompile,
+                port_app_config,
+            )
+        except ValueError as exc:
+            # JQ raises a ValueError for expressions it fails to compile
+            logger.warning(
+                f"Failed to precompile the entity mappings, they will be compiled on first use. Error: {exc}"
+            )
+            return
+        self._precompiled_config_hash = config_hash
+
     async def get_port_app_config(self, use_cache: bool = True) -> PortAppConfig:
         """
         Retrieve and parse the port application configuration.
@@ -79,6 +104,7 @@ class BasePortAppConfig(BaseHandler):
                 )
                 logger.warning(f"Invalid port app config: {raw_config}")
                 raise
+            await self._precompile_mappings(self._app_config_cache.port_app_config)
 
         event.port_app_config = self._app_config_cache.port_app_config
         return self._app_config_cache.port_app_config
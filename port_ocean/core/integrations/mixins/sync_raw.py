@@ -1,17 +1,32 @@
 import asyncio
-from graphlib import CycleError
+import contextvars
+import functools
+import hashlib
+from graphlib import CycleError, TopologicalSorter
 import inspect
+import json
 import typing
-from typing import Callable, Awaitable, Any
+from uuid import uuid4
+from typing import AsyncIterator, Callable, Awaitable, Any
 
 import httpx
 from loguru import logger
 
+from port_ocean.clients.port.mixins.entities import SEARCH_ENTITIES_PAGE_SIZE
 from port_ocean.clients.port.types import UserAgentType
-from port_ocean.context.event import TriggerType, event_context, EventType, event
+from port_ocean.context.event import (
+    ResyncType,
+    TriggerType,
+    event_context,
+    EventType,
+    event,
+)
 from port_ocean.context.ocean import ocean
-from port_ocean.context.resource import resource_context
-from port_ocean.core.handlers.port_app_config.models import ResourceConfig
+from port_ocean.context.resource import resource, resource_context
+from port_ocean.core.handlers.port_app_config.models import (
+    PortAppConfig,
+    ResourceConfig,
+)
 from port_ocean.core.integrations.mixins import HandlerMixin, EventsMixin
 from port_ocean.core.integrations.mixins.utils import (
     is_resource_supported,
@@ -27,9 +42,37 @@ from port_ocean.core.ocean_types import (
     ASYNC_GENERATOR_RESYNC_TYPE,
     RAW_ITEM,
     CalculationResult,
+    EntitySelectorDiff,
+)
+from port_ocean.core.utils.entity_identity_store import EntityIdentityStore
+from port_ocean.core.utils.port_state_snapshot import PortStateSnapshot
+from port_ocean.core.utils.realtime_batcher import (
+    RealtimeChangesBatcher,
+    RealtimeOperation,
+)
+from port_ocean.core.utils.resync_checkpoint import (
+    PageTokenTracker,
+    ResyncCheckpointStore,
+    resource_checkpoint_key,
+)
+from port_ocean.core.utils.resync_watermarks import ResyncWatermarkStore
+from port_ocean.core.utils.synced_state_store import SyncedStateStore
+from port_ocean.core.utils.utils import (
+    deduplicate_entities,
+    resolve_entities_diff,
+    zip_and_sum,
+    gather_and_split_errors_from_results,
 )
-from port_ocean.core.utils.utils import resolve_entities_diff, zip_and_sum, gather_and_split_errors_from_results
 from port_ocean.exceptions.core import OceanAbortException
+from port_ocean.exceptions.utils import SignalHandlerNotInitialized
+from port_ocean.utils.async_iterators import (
+    rebatch_async_iterator,
+    semaphore_async_iterator,
+    stream_async_iterators_tasks,
+    tee_async_iterator,
+)
+from port_ocean.utils.queue_utils import process_in_pipeline
+from port_ocean.utils.signal import signal_handler
 
 SEND_RAW_DATA_EXAMPLES_AMOUNT = 5
 
@@ -47,6 +90,8 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
     def __init__(self) -> None:
         HandlerMixin.__init__(self)
         EventsMixin.__init__(self)
+        self._resync_watermarks: ResyncWatermarkStore | None = None
+        self._realtime_batcher: RealtimeChangesBatcher | None = None
 
     async def _on_resync(self, kind: str) -> RAW_RESULT:
         raise NotImplementedError("on_resync must be implemented")
@@ -160,6 +205,7 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         entities: list[Entity],
         resource: ResourceConfig,
         user_agent_type: UserAgentType,
+        port_state_snapshot: PortStateSnapshot | None = None,
     ) -> list[Entity]:
         if not entities:
             return []
@@ -170,15 +216,21 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         BATCH_SIZE = 50
         entities_at_port_with_properties = []
 
-        # Process entities in batches
-        for start_index in range(0, len(entities), BATCH_SIZE):
-            entities_batch = entities[start_index:start_index + BATCH_SIZE]
-            batch_results = await self._fetch_entities_batch_from_port(
-                entities_batch,
-                resource,
-                user_agent_type
+        if port_state_snapshot is not None and port_state_snapshot.is_complete(
+            entities
+        ):
+            # The entities at Port were prefetched for the resync, so they are compared without searching Port
+            entities_at_port_with_properties = port_state_snapshot.get_many(
+                entities, self._get_parameters_to_include(resource)
             )
-            entities_at_port_with_properties.extend(batch_results)
+        else:
+            # Process entities in batches
+            for start_index in range(0, len(entities), BATCH_SIZE):
+                entities_batch = entities[start_index : start_index + BATCH_SIZE]
+                batch_results = await self._fetch_entities_batch_from_port(
+                    entities_batch, resource, user_agent_type
+                )
+                entities_at_port_with_properties.extend(batch_results)
 
         logger.info("Got entities from port with properties and relations", port_entities=len(entities_at_port_with_properties))
 
@@ -186,6 +238,23 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             return resolve_entities_diff(entities, entities_at_port_with_properties)
         return entities
 
+    @staticmethod
+    def _get_parameters_to_include(resource: ResourceConfig) -> list[str]:
+        """Returns the parameters of the entities at Port the resource maps, which are the ones compared with Port"""
+        return (
+            ["blueprint", "identifier"]
+            + (["title"] if resource.port.entity.mappings.title != None else [])
+            + (["team"] if resource.port.entity.mappings.team != None else [])
+            + [
+                f"properties.{prop}"
+                for prop in resource.port.entity.mappings.properties
+            ]
+            + [
+                f"relations.{relation}"
+                for relation in resource.port.entity.mappings.relations
+            ]
+        )
+
     async def _fetch_entities_batch_from_port(
         self,
         entities_batch: list[Entity],
@@ -195,17 +264,60 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         query = self._construct_search_query_for_entities(entities_batch)
         return await ocean.port_client.search_entities(
             user_agent_type,
-            parameters_to_include=["blueprint", "identifier"] + (
-                ["title"] if resource.port.entity.mappings.title != None else []
-            ) + (
-                ["team"] if resource.port.entity.mappings.team != None else []
-            ) + [
-                f"properties.{prop}" for prop in resource.port.entity.mappings.properties
-            ] + [
-                f"relations.{relation}" for relation in resource.port.entity.mappings.relations
-            ],
-            query=query
+            parameters_to_include=self._get_parameters_to_include(resource),
+            query=query,
+        )
+
+    async def _prefetch_port_state(
+        self, resources: list[ResourceConfig], user_agent_type: UserAgentType
+    ) -> PortStateSnapshot:
+        """Fetches the entities at Port of the blueprints the resources are mapped to, with the parameters they map"""
+        parameters_by_blueprint: dict[str, set[str]] = {}
+        for resource in resources:
+            blueprint = self._get_resource_blueprint(resource)
+            if (
+                blueprint is None
+                or resource.port.entity.mappings.is_using_search_identifier
+            ):
+                continue
+            parameters_by_blueprint.setdefault(blueprint, set()).update(
+                self._get_parameters_to_include(resource)
+            )
+
+        port_state_snapshot = PortStateSnapshot(
+            ocean.config.resync_port_state_snapshot_directory
+        )
+
+        async def prefetch_blueprint(blueprint: str, parameters: set[str]) -> None:
+            try:
+                async for (
+                    entities
+                ) in ocean.port_client.search_blueprint_entities_in_pages(
+                    blueprint,
+                    user_agent_type,
+                    parameters_to_include=sorted(parameters),
+                    page_size=ocean.config.resync_port_state_page_size
+                    or SEARCH_ENTITIES_PAGE_SIZE,
+                ):
+                    port_state_snapshot.add_many(entities)
+            except Exception as e:
+                # Entities of a blueprint that wasn't prefetched are compared by searching Port, as without a snapshot
+                logger.warning(
+                    f"Failed to prefetch the entities of blueprint {blueprint} from Port: {str(e)}"
+                )
+                return
+            port_state_snapshot.complete_blueprint(blueprint)
+
+        await asyncio.gather(
+            *(
+                prefetch_blueprint(blueprint, parameters)
+                for blueprint, parameters in parameters_by_blueprint.items()
+            )
         )
+        logger.info(
+            f"Prefetched {len(port_state_snapshot)} entities of {len(parameters_by_blueprint)} blueprints from Port"
+        )
+        return port_state_snapshot
 
     async def _register_resource_raw(
         self,
@@ -218,41 +330,162 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         objects_diff = await self._calculate_raw(
             [(resource, results)], parse_all, send_raw_data_examples_amount
         )
+        return await self._register_calculation_result(
+            resource, objects_diff[0], user_agent_type
+        )
+
+    async def _register_calculation_result(
+        self,
+        resource: ResourceConfig,
+        calculation_result: CalculationResult,
+        user_agent_type: UserAgentType,
+    ) -> CalculationResult:
+        entities_to_upsert = await self._resolve_entities_to_upsert(
+            resource, calculation_result, user_agent_type
+        )
+        return await self._upsert_calculation_result(
+            calculation_result, entities_to_upsert, user_agent_type
+        )
+
+    async def _resolve_entities_to_upsert(
+        self,
+        resource: ResourceConfig,
+        calculation_result: CalculationResult,
+        user_agent_type: UserAgentType,
+    ) -> list[Entity] | None:
+        """Returns the entities that changed compared to Port, or None when every passed entity should be upserted"""
+        if event.event_type != EventType.RESYNC:
+            return None
+
+        passed_entities = calculation_result.entity_selector_diff.passed
+        if event.synced_state is not None:
+            # Entities whose content didn't change since the integration synced them are skipped without querying Port
+            passed_entities = await event.synced_state.filter_changed(passed_entities)
+
+        try:
+            changed_entities = await self._map_entities_compared_with_port(
+                passed_entities,
+                resource,
+                user_agent_type,
+                event.port_state_snapshot,
+            )
+            if event.port_state_snapshot is not None:
+                # The changed entities are about to be upserted, so their state in the snapshot is no longer accurate
+                event.port_state_snapshot.discard_many(changed_entities)
+            return changed_entities
+        except Exception as e:
+            logger.warning(
+                f"Failed to resolve batch entities with Port, falling back to upserting all entities: {str(e)}"
+            )
+            return None
+
+    async def _upsert_calculation_result(
+        self,
+        calculation_result: CalculationResult,
+        entities_to_upsert: list[Entity] | None,
+        user_agent_type: UserAgentType,
+    ) -> CalculationResult:
+        passed_entities = calculation_result.entity_selector_diff.passed
         modified_objects = []
 
-        if event.event_type == EventType.RESYNC:
+        if entities_to_upsert is None:
+            modified_objects = await self.entities_state_applier.upsert(
+                passed_entities, user_agent_type
+            )
+            await self._record_synced_entities(
+                passed_entities, passed_entities, modified_objects
+            )
+        else:
             try:
-                changed_entities = await self._map_entities_compared_with_port(
-                    objects_diff[0].entity_selector_diff.passed,
-                    resource,
-                    user_agent_type
-                )
-                if changed_entities:
-                    logger.info("Upserting changed entities", changed_entities=len(changed_entities),
-                        total_entities=len(objects_diff[0].entity_selector_diff.passed))
-                    await self.entities_state_applier.upsert(
-                        changed_entities, user_agent_type
+                upserted_entities = []
+                if entities_to_upsert:
+                    logger.info(
+                        "Upserting changed entities",
+                        changed_entities=len(entities_to_upsert),
+                        total_entities=len(passed_entities),
+                    )
+                    upserted_entities = await self.entities_state_applier.upsert(
+                        entities_to_upsert, user_agent_type
                     )
                 else:
-                    logger.info("Entities in batch didn't changed since last sync, skipping", total_entities=len(objects_diff[0].entity_selector_diff.passed))
-                modified_objects = [ocean.port_client._reduce_entity(entity) for entity in objects_diff[0].entity_selector_diff.passed]
+                    logger.info(
+                        "Entities in batch didn't changed since last sync, skipping",
+                        total_entities=len(passed_entities),
+                    )
+                modified_objects = [
+                    ocean.port_client._reduce_entity(entity)
+                    for entity in passed_entities
+                ]
+                await self._record_synced_entities(
+                    passed_entities, entities_to_upsert, upserted_entities
+                )
             except Exception as e:
                 logger.warning(f"Failed to resolve batch entities with Port, falling back to upserting all entities: {str(e)}")
                 modified_objects = await self.entities_state_applier.upsert(
-                    objects_diff[0].entity_selector_diff.passed, user_agent_type
-                    )
-        else:
-           modified_objects = await self.entities_state_applier.upsert(
-                    objects_diff[0].entity_selector_diff.passed, user_agent_type
-                    )
-
+                    passed_entities, user_agent_type
+                )
+                await self._record_synced_entities(
+                    passed_entities, passed_entities, modified_objects
+                )
 
         return CalculationResult(
-            objects_diff[0].entity_selector_diff._replace(passed=modified_objects),
-            errors=objects_diff[0].errors,
-            misonfigured_entity_keys=objects_diff[0].misonfigured_entity_keys
+            calculation_result.entity_selector_diff._replace(passed=modified_objects),
+            errors=calculation_result.errors,
+            misonfigured_entity_keys=calculation_result.misonfigured_entity_keys,
+        )
+
+    @staticmethod
+    async def _record_synced_entities(
+        passed_entities: list[Entity],
+        entities_to_upsert: list[Entity],
+        upserted_entities: list[Entity],
+    ) -> None:
+        """Records in the synced state the passed entities that are in sync with Port, the ones upserted
+        successfully and the ones that didn't need to be upserted"""
+        if event.synced_state is None:
+            return
+
+        # Entities with a search identifier aren't recorded, and their identifier can't be hashed
+        failed_keys = {
+            (entity.identifier, entity.blueprint)
+            for entity in entities_to_upsert
+            if isinstance(entity.identifier, str)
+        } - {
+            (entity.identifier, entity.blueprint)
+            for entity in upserted_entities
+            if isinstance(entity.identifier, str)
+        }
+        await event.synced_state.record(
+            entity
+            for entity in passed_entities
+            if isinstance(entity.identifier, str)
+            and (entity.identifier, entity.blueprint) not in failed_keys
         )
 
+    @staticmethod
+    async def _invalidate_synced_entities(entities: list[Entity]) -> None:
+        """Makes the next resync compare the entities changed in Port outside of it, such as by realtime events,
+        with Port instead of skipping them"""
+        if not entities or not ocean.config.resync_synced_state_path:
+            return
+
+        if event.synced_state is not None:
+            await event.synced_state.invalidate_many(entities)
+            return
+
+        synced_state = SyncedStateStore(ocean.config.resync_synced_state_path)
+        try:
+            await synced_state.open(verify=False)
+            if not synced_state.needs_rebuild:
+                # A failure degrades the store, and closing a degraded store makes the next resync rebuild it
+                await synced_state.invalidate_many(entities)
+            await synced_state.close()
+        except Exception as e:
+            logger.warning(
+                f"Failed to update the synced state with {len(entities)} changed entities, "
+                f"the next resync may skip them until the synced state is rebuilt. Error: {e}"
+            )
+
     async def _unregister_resource_raw(
         self,
         resource: ResourceConfig,
@@ -275,9 +508,31 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         return entities_selector_diff.passed, errors
 
     async def _register_in_batches(
-        self, resource_config: ResourceConfig, user_agent_type: UserAgentType
+        self,
+        resource_config: ResourceConfig,
+        user_agent_type: UserAgentType,
+        registered_entities: EntityIdentityStore | None = None,
+        resource_raw_results: tuple[RESYNC_RESULT, list[Exception]] | None = None,
     ) -> tuple[list[Entity], list[Exception]]:
-        results, errors = await self._get_resource_raw_results(resource_config)
+        """
+        Register the entities of a kind batch by batch.
+        When `registered_entities` is given, the identities of the passed entities are added to it instead of being
+        returned, so a resync doesn't hold every passed entity until its delete phase.
+        When `resource_raw_results` is given, the resource registers them instead of running the resync functions.
+        """
+        checkpoint = event.resync_checkpoint
+        checkpoint_key = resource_checkpoint_key(resource_config)
+        if checkpoint is not None and checkpoint_key in checkpoint.completed_resources:
+            logger.info(
+                f"Skipping kind {resource_config.kind}, as the resumed resync already registered it"
+            )
+            return [], []
+
+        results, errors = (
+            resource_raw_results
+            if resource_raw_results is not None
+            else await self._get_resource_raw_results(resource_config)
+        )
         async_generators: list[ASYNC_GENERATOR_RESYNC_TYPE] = []
         raw_results: RAW_RESULT = []
         for result in results:
@@ -286,45 +541,134 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             else:
                 async_generators.append(result)
 
+        # A page token can't tell apart the batches of several generators, so it is checkpointed for a single one
+        page_token_tracker = (
+            PageTokenTracker(len(raw_results))
+            if checkpoint is not None and len(async_generators) == 1
+            else None
+        )
+
         send_raw_data_examples_amount = (
             SEND_RAW_DATA_EXAMPLES_AMOUNT if ocean.config.send_raw_data_examples else 0
         )
 
-        passed_entities = []
-        if raw_results:
-            calculation_result = await self._register_resource_raw(
-                resource_config,
-                raw_results,
-                user_agent_type,
-                send_raw_data_examples_amount=send_raw_data_examples_amount
-            )
-            errors.extend(calculation_result.errors)
-            passed_entities = list(calculation_result.entity_selector_diff.passed)
-
-        for generator in async_generators:
+        async def consume_generator(
+            generator: ASYNC_GENERATOR_RESYNC_TYPE,
+        ) -> AsyncIterator[list[RAW_ITEM]]:
             try:
                 async for items in generator:
-                    if send_raw_data_examples_amount > 0:
-                        send_raw_data_examples_amount = max(
-                            0, send_raw_data_examples_amount - len(passed_entities)
+                    if page_token_tracker is not None and checkpoint is not None:
+                        # The generator stages the token to continue from after a batch before yielding it
+                        page_token_tracker.fetched(
+                            len(items), checkpoint.get_staged_page_token(checkpoint_key)
                         )
-
-                    calculation_result = await self._register_resource_raw(
-                        resource_config,
-                        items,
-                        user_agent_type,
-                        send_raw_data_examples_amount=send_raw_data_examples_amount
-                    )
-                    errors.extend(calculation_result.errors)
-                    passed_entities.extend(calculation_result.entity_selector_diff.passed)
+                    yield items
             except* OceanAbortException as error:
                 errors.append(error)
 
+        async def fetch_batches() -> AsyncIterator[list[RAW_ITEM]]:
+            if raw_results:
+                yield raw_results
+
+            generators_concurrency = ocean.config.resync_generators_concurrency
+            if generators_concurrency > 1 and len(async_generators) > 1:
+                # Generators are consumed together, each failing on its own, while at most
+                # `generators_concurrency` of them are in progress at once
+                semaphore = asyncio.BoundedSemaphore(generators_concurrency)
+                async for items in stream_async_iterators_tasks(
+                    *(
+                        semaphore_async_iterator(
+                            semaphore, functools.partial(consume_generator, generator)
+                        )
+                        for generator in async_generators
+                    )
+                ):
+                    yield items
+                return
+
+            for generator in async_generators:
+                async for items in consume_generator(generator):
+                    yield items
+
+        async def map_batch(items: list[RAW_ITEM]) -> CalculationResult:
+            nonlocal send_raw_data_examples_amount
+            calculation_result = (
+                await self._calculate_raw(
+                    [(resource_config, items)],
+                    send_raw_data_examples_amount=send_raw_data_examples_amount,
+                )
+            )[0]
+            if send_raw_data_examples_amount > 0:
+                send_raw_data_examples_amount = max(
+                    0,
+                    send_raw_data_examples_amount
+                    - len(calculation_result.entity_selector_diff.passed),
+                )
+            return calculation_result
+
+        async def resolve_batch(
+            calculation_result: CalculationResult,
+        ) -> tuple[CalculationResult, list[Entity] | None]:
+            return calculation_result, await self._resolve_entities_to_upsert(
+                resource_config, calculation_result, user_agent_type
+            )
+
+        async def upsert_batch(
+            resolved_batch: tuple[CalculationResult, list[Entity] | None]
+        ) -> CalculationResult:
+            return await self._upsert_calculation_result(
+                *resolved_batch, user_agent_type
+            )
+
+        batches = fetch_batches()
+        if ocean.config.resync_batch_size or ocean.config.resync_batch_max_bytes:
+            # Generators yield batches of any size, they are coalesced and split so every upsert handles a similar load
+            batches = rebatch_async_iterator(
+                batches,
+                batch_size=ocean.config.resync_batch_size,
+                max_batch_bytes=ocean.config.resync_batch_max_bytes,
+                flush_timeout=ocean.config.resync_batch_flush_timeout,
+            )
+
+        if page_token_tracker is not None:
+            batches = self._track_pipelined_batches(batches, page_token_tracker)
+
+        passed_entities: list[Entity] = []
+        passed_entities_count = 0
+        # Each stage works on its own batch, so the next batches are fetched and mapped while earlier ones are upserted
+        async for calculation_result in process_in_pipeline(
+            batches,
+            [map_batch, resolve_batch, upsert_batch],
+            ocean.config.resync_pipeline_prefetch,
+        ):
+            errors.extend(calculation_result.errors)
+            passed_entities_count += len(calculation_result.entity_selector_diff.passed)
+            if registered_entities is not None:
+                registered_entities.add_many(
+                    calculation_result.entity_selector_diff.passed
+                )
+            else:
+                passed_entities.extend(calculation_result.entity_selector_diff.passed)
+            if page_token_tracker is not None and checkpoint is not None:
+                page_token = page_token_tracker.upserted()
+                if page_token is not None:
+                    checkpoint.set_page_token(checkpoint_key, page_token)
+
+        if checkpoint is not None and not errors:
+            checkpoint.complete_resource(checkpoint_key)
         logger.info(
-            f"Finished registering change for {len(results)} raw results for kind: {resource_config.kind}. {len(passed_entities)} entities were affected"
+            f"Finished registering change for {len(results)} raw results for kind: {resource_config.kind}. {passed_entities_count} entities were affected"
         )
         return passed_entities, errors
 
+    @staticmethod
+    async def _track_pipelined_batches(
+        batches: AsyncIterator[list[RAW_ITEM]], page_token_tracker: PageTokenTracker
+    ) -> AsyncIterator[list[RAW_ITEM]]:
+        async for items in batches:
+            page_token_tracker.pipelined(len(items))
+            yield items
+
     async def register_raw(
         self,
         kind: str,
@@ -343,6 +687,18 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         Returns:
             list[Entity]: A list of registered entities.
         """
+        if realtime_batch_window := ocean.config.realtime_batch_window:
+            return await self._get_realtime_batcher(realtime_batch_window).submit(
+                kind, "register", results, user_agent_type
+            )
+        return await self._register_raw(kind, results, user_agent_type)
+
+    async def _register_raw(
+        self,
+        kind: str,
+        results: list[dict[Any, Any]],
+        user_agent_type: UserAgentType,
+    ) -> list[Entity]:
         logger.info(f"Registering state for {kind}")
         config = await self.port_app_config_handler.get_port_app_config()
         resource_mappings = [
@@ -366,7 +722,8 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         diffs = list(diffs)
         errors = sum(errors, [])
         misconfigured_entity_keys = list(misconfigured_entity_keys)
-
+        registered_entities, entities_to_delete = zip_and_sum(diffs)
+        await self._invalidate_synced_entities(registered_entities)
 
         if errors:
             message = f"Failed to register {len(errors)} entities. Skipping delete phase due to incomplete state"
@@ -376,8 +733,17 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 errors,
             )
 
-        registered_entities, entities_to_delete = zip_and_sum(diffs)
+        await self._delete_entities_that_failed_selectors(
+            registered_entities, entities_to_delete, user_agent_type
+        )
+        return registered_entities
 
+    async def _delete_entities_that_failed_selectors(
+        self,
+        registered_entities: list[Entity],
+        entities_to_delete: list[Entity],
+        user_agent_type: UserAgentType,
+    ) -> None:
         registered_entities_attributes = {
             (entity.identifier, entity.blueprint) for entity in registered_entities
         }
@@ -403,8 +769,188 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             await self.entities_state_applier.delete(
                 filtered_entities_to_delete, user_agent_type
             )
+            await self._invalidate_synced_entities(filtered_entities_to_delete)
 
-        return registered_entities
+    async def _calculate_raw_changes(
+        self,
+        resource: ResourceConfig,
+        changes_results: list[list[RAW_ITEM]],
+        changes_contexts: list[contextvars.Context],
+        parse_all: bool = False,
+    ) -> list[CalculationResult]:
+        """Calculates the results of every change apart, in the context of its caller, such as the event it belongs to"""
+
+        async def calculate(
+            results: list[RAW_ITEM], context: contextvars.Context
+        ) -> CalculationResult:
+            try:
+                (calculation_result,) = await asyncio.create_task(
+                    self._calculate_raw([(resource, results)], parse_all),
+                    context=context.copy(),
+                )
+            except Exception as e:
+                return CalculationResult(
+                    EntitySelectorDiff(passed=[], failed=[]),
+                    errors=[e],
+                    misonfigured_entity_keys={},
+                )
+            return calculation_result
+
+        return await asyncio.gather(
+            *(
+                calculate(results, context)
+                for results, context in zip(changes_results, changes_contexts)
+            )
+        )
+
+    async def _register_raw_changes(
+        self,
+        kind: str,
+        changes_results: list[list[RAW_ITEM]],
+        changes_contexts: list[contextvars.Context],
+        user_agent_type: UserAgentType,
+    ) -> list[list[Entity] | Exception]:
+        """
+        Registers the results of a batch of realtime changes together, returning the entities of every change or the
+        error it failed with, so a change that failed doesn't fail the others.
+        """
+        logger.info(f"Registering state for {kind}")
+        config = await self.port_app_config_handler.get_port_app_config()
+        resource_mappings = [
+            resource for resource in config.resources if resource.kind == kind
+        ]
+
+        resources_changes_results = await asyncio.gather(
+            *(
+                self._register_resource_raw_changes(
+                    resource, changes_results, changes_contexts, user_agent_type
+                )
+                for resource in resource_mappings
+            )
+        )
+        registered_entities = deduplicate_entities(
+            entity
+            for resource_changes_results in resources_changes_results
+            for change_result in resource_changes_results
+            for entity in change_result.entity_selector_diff.passed
+        )
+        await self._invalidate_synced_entities(registered_entities)
+
+        outcomes: list[list[Entity] | Exception] = []
+        entities_to_delete: list[Entity] = []
+        deleting_changes: list[int] = []
+        for index in range(len(changes_results)):
+            change_results = [
+                resource_changes_results[index]
+                for resource_changes_results in resources_changes_results
+            ]
+            errors = [
+                error
+                for change_result in change_results
+                for error in change_result.errors
+            ]
+            if errors:
+                message = f"Failed to register {len(errors)} entities. Skipping delete phase due to incomplete state"
+                logger.error(message, exc_info=errors)
+                outcomes.append(ExceptionGroup(message, errors))
+                continue
+
+            change_entities_to_delete = [
+                entity
+                for change_result in change_results
+                for entity in change_result.entity_selector_diff.failed
+            ]
+            if change_entities_to_delete:
+                entities_to_delete.extend(change_entities_to_delete)
+                deleting_changes.append(index)
+            outcomes.append(
+                [
+                    entity
+                    for change_result in change_results
+                    for entity in change_result.entity_selector_diff.passed
+                ]
+            )
+
+        try:
+            await self._delete_entities_that_failed_selectors(
+                registered_entities, entities_to_delete, user_agent_type
+            )
+        except Exception as e:
+            for index in deleting_changes:
+                outcomes[index] = e
+        return outcomes
+
+    async def _register_resource_raw_changes(
+        self,
+        resource: ResourceConfig,
+        changes_results: list[list[RAW_ITEM]],
+        changes_contexts: list[contextvars.Context],
+        user_agent_type: UserAgentType,
+    ) -> list[CalculationResult]:
+        """
+        Calculates the results of every change apart, to know which entities every change registered, and upserts
+        the entities of all changes together. Returns the result of every change, with the entities it registered.
+        """
+        changes_diffs = await self._calculate_raw_changes(
+            resource, changes_results, changes_contexts, True
+        )
+        calculation_result = await self._register_calculation_result(
+            resource,
+            CalculationResult(
+                EntitySelectorDiff(
+                    # A batch of realtime changes may hold several versions of an item, of which only the latest is upserted
+                    passed=deduplicate_entities(
+                        entity
+                        for diff in changes_diffs
+                        for entity in diff.entity_selector_diff.passed
+                    ),
+                    failed=[
+                        entity
+                        for diff in changes_diffs
+                        for entity in diff.entity_selector_diff.failed
+                    ],
+                ),
+                errors=[error for diff in changes_diffs for error in diff.errors],
+                misonfigured_entity_keys={
+                    key: value
+                    for diff in changes_diffs
+                    for key, value in diff.misonfigured_entity_keys.items()
+                },
+            ),
+            user_agent_type,
+        )
+        registered_entities = calculation_result.entity_selector_diff.passed
+
+        changes_entities: list[list[Entity]] = [[] for _ in changes_diffs]
+        changes_by_key: dict[tuple[str, str], list[int]] = {}
+        # The identifier a search identifier resolved to isn't known, so such an entity belongs to every change
+        # that upserted an entity with a search identifier of its blueprint
+        changes_by_searched_blueprint: dict[str, list[int]] = {}
+        for index, diff in enumerate(changes_diffs):
+            for entity in diff.entity_selector_diff.passed:
+                if isinstance(entity.identifier, str):
+                    changes_by_key.setdefault(
+                        (entity.identifier, entity.blueprint), []
+                    ).append(index)
+                else:
+                    changes_by_searched_blueprint.setdefault(
+                        entity.blueprint, []
+                    ).append(index)
+
+        for entity in registered_entities:
+            indexes = changes_by_key.get(
+                (entity.identifier, entity.blueprint)
+            ) or changes_by_searched_blueprint.get(entity.blueprint, [])
+            for index in dict.fromkeys(indexes):
+                changes_entities[index].append(entity)
+        return [
+            diff._replace(
+                entity_selector_diff=diff.entity_selector_diff._replace(
+                    passed=change_entities
+                )
+            )
+            for diff, change_entities in zip(changes_diffs, changes_entities)
+        ]
 
     async def unregister_raw(
         self,
@@ -424,6 +970,18 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         Returns:
             list[Entity]: A list of unregistered entities.
         """
+        if realtime_batch_window := ocean.config.realtime_batch_window:
+            return await self._get_realtime_batcher(realtime_batch_window).submit(
+                kind, "unregister", results, user_agent_type
+            )
+        return await self._unregister_raw(kind, results, user_agent_type)
+
+    async def _unregister_raw(
+        self,
+        kind: str,
+        results: list[dict[Any, Any]],
+        user_agent_type: UserAgentType,
+    ) -> list[Entity]:
         logger.info(f"Registering state for {kind}")
         config = await self.port_app_config_handler.get_port_app_config()
         resource_mappings = [
@@ -438,6 +996,8 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 )
             )
         )
+        # Entities that failed to be deleted are kept in the synced state, so the next resync compares them with Port
+        await self._invalidate_synced_entities(entities)
 
         if errors:
             message = f"Failed to unregister all entities with {len(errors)} errors"
@@ -449,6 +1009,98 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
 
         return entities
 
+    async def _unregister_raw_changes(
+        self,
+        kind: str,
+        changes_results: list[list[RAW_ITEM]],
+        changes_contexts: list[contextvars.Context],
+        user_agent_type: UserAgentType,
+    ) -> list[list[Entity] | Exception]:
+        """
+        Unregisters the results of a batch of realtime changes together, returning the entities of every change or
+        the error it failed with, so a change that failed doesn't fail the others.
+        """
+        logger.info(f"Unregistering state for {kind}")
+        config = await self.port_app_config_handler.get_port_app_config()
+        resource_mappings = [
+            resource
+            for resource in config.resources
+            if resource.kind == kind
+            and not resource.port.entity.mappings.is_using_search_identifier
+        ]
+
+        resources_changes_diffs = await asyncio.gather(
+            *(
+                self._calculate_raw_changes(resource, changes_results, changes_contexts)
+                for resource in resource_mappings
+            )
+        )
+        entities = deduplicate_entities(
+            entity
+            for resource_changes_diffs in resources_changes_diffs
+            for diff in resource_changes_diffs
+            for entity in diff.entity_selector_diff.passed
+        )
+        await self.entities_state_applier.delete(entities, user_agent_type)
+        logger.info("Finished unregistering change")
+        # Entities that failed to be deleted are kept in the synced state, so the next resync compares them with Port
+        await self._invalidate_synced_entities(entities)
+
+        outcomes: list[list[Entity] | Exception] = []
+        for index in range(len(changes_results)):
+            changes_diffs = [
+                resource_changes_diffs[index]
+                for resource_changes_diffs in resources_changes_diffs
+            ]
+            errors = [error for diff in changes_diffs for error in diff.errors]
+            if errors:
+                message = f"Failed to unregister all entities with {len(errors)} errors"
+                logger.error(message, exc_info=errors)
+                outcomes.append(ExceptionGroup(message, errors))
+                continue
+
+            outcomes.append(
+                deduplicate_entities(
+                    entity
+                    for diff in changes_diffs
+                    for entity in diff.entity_selector_diff.passed
+                )
+            )
+        return outcomes
+
+    def _get_realtime_batcher(self, window: float) -> RealtimeChangesBatcher:
+        if self._realtime_batcher is None:
+            self._realtime_batcher = RealtimeChangesBatcher(
+                self._process_realtime_batch,
+                window,
+                ocean.config.realtime_batch_max_items,
+            )
+            try:
+                # Pending realtime changes are processed on shutdown rather than discarded
+                signal_handler.register(self._realtime_batcher.flush_all)
+            except SignalHandlerNotInitialized:
+                pass
+        return self._realtime_batcher
+
+    async def _process_realtime_batch(
+        self,
+        kind: str,
+        operation: RealtimeOperation,
+        changes_results: list[list[RAW_ITEM]],
+        changes_contexts: list[contextvars.Context],
+        user_agent_type: UserAgentType,
+    ) -> list[list[Entity] | Exception]:
+        # The batch holds the changes of unrelated callers, so it is processed under an event of its own, while the
+        # results of every change are calculated in the context of its caller
+        async with event_context(EventType.HTTP_REQUEST, trigger_type="request"):
+            if operation == "register":
+                return await self._register_raw_changes(
+                    kind, changes_results, changes_contexts, user_agent_type
+                )
+            return await self._unregister_raw_changes(
+                kind, changes_results, changes_contexts, user_agent_type
+            )
+
     async def update_raw_diff(
         self,
         kind: str,
@@ -506,43 +1158,434 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 {"before": entities_before_flatten, "after": entities_after_flatten},
                 user_agent_type,
             )
-    async def sort_and_upsert_failed_entities(self,user_agent_type: UserAgentType)->None:
+
+    @staticmethod
+    def _get_resource_blueprint(resource: ResourceConfig) -> str | None:
+        """Returns the blueprint of the resource when it is mapped to a constant blueprint"""
+        try:
+            blueprint = json.loads(resource.port.entity.mappings.blueprint)
+        except ValueError:
+            return None
+        return blueprint if isinstance(blueprint, str) else None
+
+    async def _get_resources_dependencies(
+        self, resources: list[ResourceConfig]
+    ) -> list[set[int]]:
+        """Returns for every resource the indexes of the resources that must be synced before it.
+
+        Resources mapped to the same blueprint keep their order in the config, as later resources override the
+        entities of earlier ones, and resources are synced after the resources their mapped relations target.
+        Resources of the same kind whose blueprint depends on the raw items may map to the same blueprint, so they keep
+        their order as well. When the relations form a cycle, only the config order is kept.
+        """
+        resources_blueprints = [
+            self._get_resource_blueprint(resource) for resource in resources
+        ]
+        blueprint_identifiers = {
+            blueprint for blueprint in resources_blueprints if blueprint
+        }
+        blueprints = await asyncio.gather(
+            *(
+                ocean.port_client.get_blueprint(identifier, should_log=False)
+                for identifier in blueprint_identifiers
+            ),
+            return_exceptions=True,
+        )
+        relations_targets: dict[str, dict[str, str]] = {}
+        for identifier, fetched_blueprint in zip(blueprint_identifiers, blueprints):
+            if isinstance(fetched_blueprint, BaseException):
+                logger.warning(
+                    f"Failed to fetch blueprint {identifier}, its kinds won't wait for the kinds it relates to. Error: {fetched_blueprint}"
+                )
+                continue
+            relations_targets[identifier] = {
+                name: relation.target
+                for name, relation in fetched_blueprint.relations.items()
+            }
+
+        ordering_dependencies: list[set[int]] = [set() for _ in resources]
+        relation_dependencies: list[set[int]] = [set() for _ in resources]
+        for index, (resource, blueprint) in enumerate(
+            zip(resources, resources_blueprints)
+        ):
+            targets = {
+                relations_targets.get(blueprint or "", {}).get(relation)
+                for relation in resource.port.entity.mappings.relations
+            }
+            for other_index, (other_resource, other_blueprint) in enumerate(
+                zip(resources, resources_blueprints)
+            ):
+                if other_index == index:
+                    continue
+                if other_index < index and (
+                    (blueprint and other_blueprint == blueprint)
+                    or (
+                        other_resource.kind == resource.kind
+                        and (blueprint is None or other_blueprint is None)
+                    )
+                ):
+                    ordering_dependencies[index].add(other_index)
+                elif other_blueprint and other_blueprint in targets:
+                    relation_dependencies[index].add(other_index)
+
+        dependencies = [
+            ordering | relations
+            for ordering, relations in zip(ordering_dependencies, relation_dependencies)
+        ]
+        try:
+            TopologicalSorter(dict(enumerate(dependencies))).prepare()
+        except CycleError:
+            logger.warning(
+                "The relations between the resynced kinds form a cycle, resyncing the kinds regardless of their relations"
+            )
+            return ordering_dependencies
+        return dependencies
+
+    def _get_resource_fetch_groups(
+        self, resources: list[ResourceConfig]
+    ) -> list[list[int]]:
+        """Returns the indexes of the resources grouped by the items their resync functions fetch.
+
+        When fetches are shared, resources of the same kind whose configs differ only in their port mappings, which
+        are applied to the items after they were fetched, are grouped together. Their selectors must be identical, as
+        resync functions may read the selector of the resource they fetch for, such as its query or filters. Only
+        resources mapped to distinct constant blueprints are grouped, as resources of the same blueprint must keep
+        their order.
+        """
+        if (
+            not ocean.config.resync_share_kind_fetches
+            or event.resync_checkpoint is not None
+        ):
+            return [[index] for index in range(len(resources))]
+
+        groups: list[list[int]] = []
+        shared_groups: dict[str, list[int]] = {}
+        for index, resource in enumerate(resources):
+            blueprint = self._get_resource_blueprint(resource)
+            fetch_key = json.dumps(
+                resource.dict(exclude={"port"}),
+                sort_keys=True,
+                default=str,
+            )
+            group = shared_groups.get(fetch_key)
+            if (
+                blueprint is not None
+                and group is not None
+                and all(
+                    self._get_resource_blueprint(resources[member]) != blueprint
+                    for member in group
+                )
+            ):
+                group.append(index)
+                continue
+
+            group = [index]
+            groups.append(group)
+            if blueprint is not None and fetch_key not in shared_groups:
+                shared_groups[fetch_key] = group
+        return groups
+
+    async def _register_resource_group(
+        self,
+        resources: list[ResourceConfig],
+        user_agent_type: UserAgentType,
+        registered_entities: EntityIdentityStore | None = None,
+    ) -> list[tuple[list[Entity], list[Exception]]]:
+        """Registers resources whose resync functions fetch the same items, fetching the items only once"""
+        if len(resources) == 1:
+            async with resource_context(resources[0]):
+                return [
+                    await self._register_in_batches(
+                        resources[0], user_agent_type, registered_entities
+                    )
+                ]
+
+        logger.info(
+            f"Fetching {resources[0].kind} once for {len(resources)} resources of the kind"
+        )
+        async with resource_context(resources[0]):
+            results, errors = await self._get_resource_raw_results(resources[0])
+        raw_items = [result for result in results if isinstance(result, dict)]
+        # Every batch of a generator is handed to every resource, each mapping it with its own selector and mappings
+        generators = [
+            tee_async_iterator(
+                result, len(resources), ocean.config.resync_pipeline_prefetch + 1
+            )
+            for result in results
+            if not isinstance(result, dict)
+        ]
+
+        async def register(
+            index: int, resource: ResourceConfig
+        ) -> tuple[list[Entity], list[Exception]]:
+            resource_results: RESYNC_RESULT = [
+                *raw_items,
+                *(generator[index] for generator in generators),
+            ]
+            async with resource_context(resource):
+                return await self._register_in_batches(
+                    resource,
+                    user_agent_type,
+                    registered_entities,
+                    (resource_results, list(errors)),
+                )
+
+        tasks = [
+            asyncio.create_task(register(index, resource))
+            for index, resource in enumerate(resources)
+        ]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def _register_resources_concurrently(
+        self,
+        resources: list[ResourceConfig],
+        user_agent_type: UserAgentType,
+        concurrency: int,
+        registered_entities: EntityIdentityStore | None = None,
+    ) -> list[tuple[list[Entity], list[Exception]]]:
+        dependencies = await self._get_resources_dependencies(resources)
+        groups = self._get_resource_fetch_groups(resources)
+        resource_groups = {
+            index: group_index
+            for group_index, group in enumerate(groups)
+            for index in group
+        }
+        groups_dependencies = [
+            {
+                resource_groups[dependency]
+                for index in group
+                for dependency in dependencies[index]
+            }
+            - {group_index}
+            for group_index, group in enumerate(groups)
+        ]
+        try:
+            TopologicalSorter(dict(enumerate(groups_dependencies))).prepare()
+        except CycleError:
+            logger.warning(
+                "Fetching the resources of a kind once would contradict the order of the resources, fetching them separately"
+            )
+            groups = [[index] for index in range(len(resources))]
+            groups_dependencies = dependencies
+
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks: list[asyncio.Task[list[tuple[list[Entity], list[Exception]]]]] = []
+
+        async def register(
+            group_index: int,
+        ) -> list[tuple[list[Entity], list[Exception]]]:
+            if groups_dependencies[group_index]:
+                await asyncio.wait(
+                    [
+                        tasks[dependency]
+                        for dependency in groups_dependencies[group_index]
+                    ]
+                )
+            async with semaphore:
+                return await self._register_resource_group(
+                    [resources[index] for index in groups[group_index]],
+                    user_agent_type,
+                    registered_entities,
+                )
+
+        for group_index in range(len(groups)):
+            tasks.append(asyncio.create_task(register(group_index)))
+
+        def cancel_tasks() -> None:
+            for task in tasks:
+                task.cancel()
+
+        event.on_abort(cancel_tasks)
+        try:
+            groups_results = await asyncio.gather(*tasks)
+        except BaseException:
+            cancel_tasks()
+            raise
+
+        results: dict[int, tuple[list[Entity], list[Exception]]] = {}
+        for group, group_results in zip(groups, groups_results):
+            results.update(zip(group, group_results))
+        return [results[index] for index in range(len(resources))]
+
+    async def _open_synced_state(
+        self, path: str, user_agent_type: UserAgentType, resync_id: str | None = None
+    ) -> SyncedStateStore | None:
+        """Opens the synced state of the integration, rebuilding it from the entities at Port when it is new or corrupted"""
+        synced_state = SyncedStateStore(path)
+        try:
+            await synced_state.open()
+            if synced_state.needs_rebuild:
+                logger.info("Rebuilding the synced state from the entities at Port")
+                await synced_state.rebuild(
+                    await ocean.port_client.search_entities(user_agent_type)
+                )
+        except Exception as e:
+            logger.warning(
+                f"Failed to open the synced state, resyncing without it: {str(e)}"
+            )
+            await synced_state.close()
+            return None
+
+        synced_state.begin_resync(resync_id)
+        return synced_state
+
+    async def _iterate_synced_entities(
+        self, synced_state: SyncedStateStore
+    ) -> AsyncIterator[list[Entity]]:
+        async for entities in synced_state.iterate_entities(
+            ocean.config.resync_port_state_page_size or SEARCH_ENTITIES_PAGE_SIZE
+        ):
+            yield entities
+
+    def _get_resync_watermarks(self) -> ResyncWatermarkStore:
+        if self._resync_watermarks is None:
+            self._resync_watermarks = ResyncWatermarkStore(
+                ocean.config.resync_watermark_path
+            )
+            self._resync_watermarks.load()
+        return self._resync_watermarks
+
+    def get_resync_watermark(self, kind: str) -> Any:
+        if event.resync_type != "delta":
+            return None
+        return self._get_resync_watermarks().get(kind)
+
+    def set_resync_watermark(self, kind: str, watermark: Any) -> None:
+        event.resync_watermarks[kind] = watermark
+
+    def get_resync_page_token(self) -> Any:
+        checkpoint = event.resync_checkpoint
+        if checkpoint is None:
+            return None
+        return checkpoint.get_resumed_page_token(
+            resource_checkpoint_key(resource.resource_config)
+        )
+
+    def set_resync_page_token(self, page_token: Any) -> None:
+        checkpoint = event.resync_checkpoint
+        if checkpoint is not None:
+            checkpoint.stage_page_token(
+                resource_checkpoint_key(resource.resource_config), page_token
+            )
+
+    @staticmethod
+    def _get_resync_config_hash(
+        app_config: PortAppConfig, resync_type: ResyncType
+    ) -> str:
+        return hashlib.sha256(
+            f"{resync_type}:{app_config.json(sort_keys=True)}".encode()
+        ).hexdigest()
+
+    def get_scheduled_resync_type(self) -> ResyncType:
+        """Returns whether a scheduled resync should be a delta one, or a full one as the last full resync is due"""
+        if ocean.config.scheduled_delta_resync_interval is None:
+            return "full"
+        if self._get_resync_watermarks().is_full_resync_due(
+            ocean.config.scheduled_resync_interval
+        ):
+            return "full"
+        return "delta"
+
+    def _commit_resync_watermarks(
+        self,
+        resources: list[ResourceConfig],
+        creation_results: list[tuple[list[Entity], list[Exception]]],
+    ) -> None:
+        """Commits the watermarks of the kinds whose resources were all resynced without errors"""
+        failed_kinds = {
+            resource.kind
+            for resource, (_, errors) in zip(resources, creation_results)
+            if errors
+        }
+        watermarks = self._get_resync_watermarks()
+        watermarks.commit(
+            event.resync_watermarks,
+            (
+                resource.kind
+                for resource in resources
+                if resource.kind not in failed_kinds
+            ),
+        )
+        if event.resync_type == "full" and not failed_kinds:
+            watermarks.complete_full_resync()
+        watermarks.save()
+
+    async def _upsert_failed_entities(
+        self, entities: list[Entity], user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        # The port client limits the number of concurrent requests, so all the entities are upserted at once
+        results = await self.entities_state_applier.context.port_client.upsert_entities(
+            entities,
+            event.port_app_config.get_port_request_options(),
+            user_agent_type,
+            should_raise=False,
+        )
+        if event.synced_state is not None:
+            # Entities that got to Port only through the retry are recorded too, so the delete phase lists them
+            await event.synced_state.record(
+                entity for entity, result in zip(entities, results) if result
+            )
+        return [result for result in results if result]
+
+    async def sort_and_upsert_failed_entities(
+        self, user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        """Retries upserting the entities that failed due to related entities missing from Port, returning the ones upserted"""
+        upserted_entities: list[Entity] = []
         try:
             if not event.entity_topological_sorter.should_execute():
-                return None
+                return upserted_entities
             logger.info(f"Executings topological sort of {event.entity_topological_sorter.get_entities_count()} entities failed to upsert.",failed_toupsert_entities_count=event.entity_topological_sorter.get_entities_count())
 
-            for entity in event.entity_topological_sorter.get_entities():
-                await self.entities_state_applier.context.port_client.upsert_entity(entity,event.port_app_config.get_port_request_options(),user_agent_type,should_raise=False)
+            # Every level only depends on the levels before it, so its entities are upserted concurrently
+            for level in event.entity_topological_sorter.get_entities_levels():
+                upserted_entities.extend(
+                    await self._upsert_failed_entities(level, user_agent_type)
+                )
 
         except OceanAbortException as ocean_abort:
             logger.info(f"Failed topological sort of failed to upsert entites - trying to upsert unordered {event.entity_topological_sorter.get_entities_count()} entities.",failed_topological_sort_entities_count=event.entity_topological_sorter.get_entities_count() )
             if isinstance(ocean_abort.__cause__,CycleError):
-                for entity in event.entity_topological_sorter.get_entities(False):
-                    await self.entities_state_applier.context.port_client.upsert_entity(entity,event.port_app_config.get_port_request_options(),user_agent_type,should_raise=False)
+                upserted_entities.extend(
+                    await self._upsert_failed_entities(
+                        list(event.entity_topological_sorter.get_entities(False)),
+                        user_agent_type,
+                    )
+                )
+        return upserted_entities
+
     async def sync_raw_all(
         self,
         _: dict[Any, Any] | None = None,
         trigger_type: TriggerType = "machine",
         user_agent_type: UserAgentType = UserAgentType.exporter,
         silent: bool = True,
+        resync_type: ResyncType = "full",
     ) -> None:
         """Perform a full synchronization of raw entities.
 
         This method performs a full synchronization of raw entities, including registration, unregistration,
-        and state updates.
+        and state updates. A delta synchronization lets resync functions fetch only the items updated since the
+        watermark of their kind, and as it doesn't list every entity it skips the unregistration.
 
         Args:
             _ (dict[Any, Any] | None): Unused parameter.
             trigger_type (TriggerType): The type of trigger for the synchronization.
             user_agent_type (UserAgentType): The type of user agent.
             silent (bool): Whether to raise exceptions or handle them silently.
+            resync_type (ResyncType): Whether to perform a full or a delta synchronization.
         """
-        logger.info("Resync was triggered")
+        logger.info("Resync was triggered", resync_type=resync_type)
         async with event_context(
             EventType.RESYNC,
             trigger_type=trigger_type,
         ):
+            event.resync_type = resync_type
             # If a resync is triggered due to a mappings change, we want to make sure that we have the updated version
             # rather than the old cache
             app_config = await self.port_app_config_handler.get_port_app_config(
@@ -563,25 +1606,84 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 did_fetched_current_state = False
 
             creation_results: list[tuple[list[Entity], list[Exception]]] = []
-
+            # Only the identities of the registered entities are kept, as they are all the delete phase compares
+            registered_entities = EntityIdentityStore(
+                spill_threshold=ocean.config.resync_identity_store_spill_threshold
+            )
+            resumed_from_checkpoint = False
+            if ocean.config.resync_checkpoint_path:
+                event.resync_checkpoint = ResyncCheckpointStore(
+                    ocean.config.resync_checkpoint_path
+                )
+                resumed_from_checkpoint = event.resync_checkpoint.start(
+                    self._get_resync_config_hash(app_config, resync_type), str(uuid4())
+                )
+                if resumed_from_checkpoint:
+                    logger.info(
+                        f"Resuming the resync from its checkpoint, {len(event.resync_checkpoint.completed_resources)} resources were already registered"
+                    )
+            if ocean.config.resync_synced_state_path:
+                event.synced_state = await self._open_synced_state(
+                    ocean.config.resync_synced_state_path,
+                    user_agent_type,
+                    # A resumed resync continues the one it resumes, so the entities that one saw count as seen
+                    (
+                        event.resync_checkpoint.resync_id
+                        if event.resync_checkpoint
+                        else None
+                    ),
+                )
+            # A delta resync compares only the few updated entities, which isn't worth prefetching Port's state for
+            if ocean.config.resync_port_state_prefetch and resync_type == "full":
+                event.port_state_snapshot = await self._prefetch_port_state(
+                    app_config.resources, user_agent_type
+                )
 
             try:
-                for resource in app_config.resources:
-                    # create resource context per resource kind, so resync method could have access to the resource
-                    # config as we might have multiple resources in the same event
-                    async with resource_context(resource):
+                if ocean.config.resync_kinds_concurrency > 1:
+                    creation_results = await self._register_resources_concurrently(
+                        app_config.resources,
+                        user_agent_type,
+                        ocean.config.resync_kinds_concurrency,
+                        registered_entities,
+                    )
+                else:
+                    results_by_index: dict[
+                        int, tuple[list[Entity], list[Exception]]
+                    ] = {}
+                    for group in self._get_resource_fetch_groups(app_config.resources):
+                        # the resource context is created per resource kind in the group, so resync method could have
+                        # access to the resource config as we might have multiple resources in the same event
                         task = asyncio.get_event_loop().create_task(
-                            self._register_in_batches(resource, user_agent_type)
+                            self._register_resource_group(
+                                [app_config.resources[index] for index in group],
+                                user_agent_type,
+                                registered_entities,
+                            )
                         )
 
                         event.on_abort(lambda: task.cancel())
-                        creation_results.append(await task)
+                        results_by_index.update(zip(group, await task))
+                    creation_results = [
+                        results_by_index[index]
+                        for index in range(len(app_config.resources))
+                    ]
 
-                await self.sort_and_upsert_failed_entities(user_agent_type)
+                # The entities upserted by the retry are registered as well, so the delete phase keeps them
+                registered_entities.add_many(
+                    await self.sort_and_upsert_failed_entities(user_agent_type)
+                )
+                await asyncio.get_event_loop().run_in_executor(
+                    None, self.entity_processor.persist_state
+                )
             except asyncio.CancelledError as e:
                 logger.warning("Resync aborted successfully, skipping delete phase. This leads to an incomplete state")
                 raise
             else:
+                if event.resync_checkpoint is not None:
+                    # Every resource was registered, so the next resync starts from the beginning
+                    event.resync_checkpoint.clear()
+
                 if not did_fetched_current_state:
                     logger.warning(
                         "Due to an error before the resync, the previous state of entities at Port is unknown."
@@ -590,10 +1692,12 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                     return
 
                 logger.info("Starting resync diff calculation")
-                generated_entities, errors = zip_and_sum(creation_results) or [
-                    [],
-                    [],
+                errors = [
+                    error
+                    for _, resource_errors in creation_results
+                    for error in resource_errors
                 ]
+                self._commit_resync_watermarks(app_config.resources, creation_results)
 
                 if errors:
                     message = f"Resync failed with {len(errors)}. Skipping delete phase due to incomplete state"
@@ -605,16 +1709,68 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                         raise error_group
 
                     logger.error(message, exc_info=error_group)
-                else:
+                elif resync_type == "delta":
                     logger.info(
-                        f"Running resync diff calculation, number of entities created during sync: {len(generated_entities)}"
+                        "Delta resync finished successfully, skipping delete phase as it only synced updated entities"
                     )
-                    entities_at_port = await ocean.port_client.search_entities(
-                        user_agent_type
+                elif resumed_from_checkpoint and (
+                    event.synced_state is None or event.synced_state.degraded
+                ):
+                    logger.warning(
+                        "The resync was resumed from a checkpoint, and without a synced state the entities registered"
+                        " before it was resumed are unknown. Skipping delete phase due to incomplete state"
+                    )
+                else:
+                    if resumed_from_checkpoint and event.synced_state is not None:
+                        # The resources registered before the resync was resumed were only recorded in the synced state
+                        async for entities in event.synced_state.iterate_seen_entities(
+                            ocean.config.resync_port_state_page_size
+                            or SEARCH_ENTITIES_PAGE_SIZE
+                        ):
+                            registered_entities.add_many(entities)
+
+                    logger.info(
+                        f"Running resync diff calculation, number of entities created during sync: {len(registered_entities)}"
                     )
-                    await self.entities_state_applier.delete_diff(
-                        {"before": entities_at_port, "after": generated_entities},
-                        user_agent_type, app_config.entity_deletion_threshold
+                    entities_at_port: list[Entity] | AsyncIterator[list[Entity]]
+                    if (
+                        event.synced_state is not None
+                        and not event.synced_state.degraded
+                    ):
+                        # The synced state lists the entities the integration synced, so Port isn't searched
+                        logger.info(
+                            f"{await event.synced_state.count_unseen()} entities of the synced state weren't seen by the resync"
+                        )
+                        entities_at_port = self._iterate_synced_entities(
+                            event.synced_state
+                        )
+                    elif ocean.config.resync_port_state_page_size:
+                        entities_at_port = ocean.port_client.search_entities_in_pages(
+                            user_agent_type,
+                            page_size=ocean.config.resync_port_state_page_size,
+                        )
+                    else:
+                        entities_at_port = await ocean.port_client.search_entities(
+                            user_agent_type
+                        )
+                    deleted_entities = (
+                        await self.entities_state_applier.delete_unregistered_entities(
+                            entities_at_port,
+                            registered_entities,
+                            user_agent_type,
+                            app_config.entity_deletion_threshold,
+                        )
                     )
+                    if event.synced_state is not None:
+                        await event.synced_state.discard_many(deleted_entities)
 
                     logger.info("Resync finished successfully")
+            finally:
+                registered_entities.close()
+                if event.port_state_snapshot is not None:
+                    event.port_state_snapshot.close()
+                    event.port_state_snapshot = None
+                if event.synced_state is not None:
+                    await event.synced_state.close()
+                    event.synced_state = None
+                event.resync_checkpoint = None
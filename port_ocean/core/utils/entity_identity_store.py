@@ -0,0 +1,187 @@
+import json
+import mmap
+import tempfile
+from array import array
+from bisect import bisect_left
+from itertools import chain
+from typing import IO, Any, Iterable, Sequence
+
+from port_ocean.core.models import Entity
+
+
+def _identity_hash(identifier: Any) -> int:
+    if not isinstance(identifier, str):
+        identifier = json.dumps(identifier, sort_keys=True, default=str)
+    return hash(identifier)
+
+
+class _IdentitySet:
+    """A set of identifier hashes, stored as sorted arrays of 64 bit integers and searched with a binary search
+
+    Hashes are appended to a pending array and sorted once the set is queried. Spilled hashes are written to a
+    temporary file and searched through a memory map, so only the pages actually searched are loaded to memory.
+    """
+
+    def __init__(self) -> None:
+        self._pending = array("q")
+        self._in_memory = array("q")
+        self._spilled: list[tuple[IO[bytes], mmap.mmap, memoryview]] = []
+
+    def __len__(self) -> int:
+        return (
+            len(self._pending)
+            + len(self._in_memory)
+            + sum(len(hashes) for *_, hashes in self._spilled)
+        )
+
+    def add(self, identity_hash: int) -> None:
+        self._pending.append(identity_hash)
+
+    def _seal(self) -> None:
+        if self._pending:
+            # The already sorted hashes form a single run, so timsort only has to sort the pending ones into it
+            self._in_memory = array("q", sorted(chain(self._in_memory, self._pending)))
+            self._pending = array("q")
+
+    def spill(self, directory: str | None) -> None:
+        self._seal()
+        if not self._in_memory:
+            return
+
+        file = tempfile.TemporaryFile(dir=directory)
+        self._in_memory.tofile(file)
+        file.flush()
+        mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._spilled.append((file, mapped_file, memoryview(mapped_file).cast("q")))
+        self._in_memory = array("q")
+
+    def __contains__(self, identity_hash: int) -> bool:
+        self._seal()
+        segments: Iterable[Sequence[int]] = chain(
+            [self._in_memory], (hashes for *_, hashes in self._spilled)
+        )
+        for segment in segments:
+            index = bisect_left(segment, identity_hash)
+            if index < len(segment) and segment[index] == identity_hash:
+                return True
+        return False
+
+    def close(self) -> None:
+        for file, mapped_file, hashes in self._spilled:
+            hashes.release()
+            mapped_file.close()
+            file.close()
+        self._spilled = []
+        self._pending = array("q")
+        self._in_memory = array("q")
+
+
+class EntityIdentityStore:
+    """A compact store of the identities of entities, and of the entities their relations point to
+
+    Instead of keeping entity models, blueprints are interned to integer ids and identifiers are kept as 64 bit
+    hashes, which takes a few bytes per entity. As only hashes are kept, an entity that isn't in the store may
+    still be reported as a member on a hash collision, which for the delete phase means it is kept rather than
+    deleted. Once `spill_threshold` hashes are held in memory they are spilled to temporary files, which are
+    removed when the store is closed.
+    """
+
+    def __init__(
+        self, spill_threshold: int | None = None, spill_directory: str | None = None
+    ):
+        self._spill_threshold = spill_threshold
+        self._spill_directory = spill_directory
+        self._blueprint_ids: dict[str, int] = {}
+        self._identifiers: dict[int, _IdentitySet] = {}
+        self._related_identifiers: dict[tuple[int, str], _IdentitySet] = {}
+        self._entities_count = 0
+        self._hashes_in_memory = 0
+
+    @classmethod
+    def from_entities(cls, entities: Iterable[Entity]) -> "EntityIdentityStore":
+        store = cls()
+        store.add_many(entities)
+        return store
+
+    def __len__(self) -> int:
+        return self._entities_count
+
+    def _blueprint_id(self, blueprint: str) -> int:
+        return self._blueprint_ids.setdefault(blueprint, len(self._blueprint_ids))
+
+    def add(self, entity: Entity) -> None:
+        blueprint_id = self._blueprint_id(entity.blueprint)
+        self._identifiers.setdefault(blueprint_id, _IdentitySet()).add(
+            _identity_hash(entity.identifier)
+        )
+        self._entities_count += 1
+        self._hashes_in_memory += 1
+
+        for relation_name, relation in entity.relations.items():
+            related_identifiers = relation if isinstance(relation, list) else [relation]
+            for related_identifier in related_identifiers:
+                if related_identifier is None:
+                    continue
+                self._related_identifiers.setdefault(
+                    (blueprint_id, relation_name), _IdentitySet()
+                ).add(_identity_hash(related_identifier))
+                self._hashes_in_memory += 1
+
+        if self._spill_threshold and self._hashes_in_memory >= self._spill_threshold:
+            self._spill()
+
+    def add_many(self, entities: Iterable[Entity]) -> None:
+        for entity in entities:
+            self.add(entity)
+
+    def _spill(self) -> None:
+        for identity_set in chain(
+            self._identifiers.values(), self._related_identifiers.values()
+        ):
+            identity_set.spill(self._spill_directory)
+        self._hashes_in_memory = 0
+
+    def __contains__(self, entity: Entity) -> bool:
+        blueprint_id = self._blueprint_ids.get(entity.blueprint)
+        if blueprint_id is None or blueprint_id not in self._identifiers:
+            return False
+        return _identity_hash(entity.identifier) in self._identifiers[blueprint_id]
+
+    def get_related_blueprints(self) -> list[str]:
+        """Returns the blueprints of the entities that have relations"""
+        blueprints = {
+            blueprint_id: blueprint
+            for blueprint, blueprint_id in self._blueprint_ids.items()
+        }
+        return sorted(
+            {blueprints[blueprint_id] for blueprint_id, _ in self._related_identifiers}
+        )
+
+    def is_related(
+        self, entity: Entity, relations_targets: dict[tuple[str, str], str]
+    ) -> bool:
+        """
+        Returns whether a relation of a stored entity points to the given entity.
+        `relations_targets` maps the blueprint and name of every relation to the blueprint it targets.
+        """
+        identity_hash = _identity_hash(entity.identifier)
+        for (blueprint, relation_name), target in relations_targets.items():
+            if target != entity.blueprint or blueprint not in self._blueprint_ids:
+                continue
+            related_identifiers = self._related_identifiers.get(
+                (self._blueprint_ids[blueprint], relation_name)
+            )
+            if related_identifiers is not None and identity_hash in related_identifiers:
+                return True
+        return False
+
+    def close(self) -> None:
+        for identity_set in chain(
+            self._identifiers.values(), self._related_identifiers.values()
+        ):
+            identity_set.close()
+        self._identifiers.clear()
+        self._related_identifiers.clear()
+        self._blueprint_ids.clear()
+        self._entities_count = 0
+        self._hashes_in_memory = 0
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import Any, Generator
 from port_ocean.context import event
 from port_ocean.core.models import Entity
@@ -43,48 +44,89 @@ class EntityTopologicalSorter:
         for entity in sorted_and_mapped:
             yield entity
 
+    def get_entities_levels(self) -> list[list[Entity]]:
+        """
+        Returns the entities grouped by levels of dependency, where the entities of a level only depend on entities
+        of the levels before it, so the entities of a level can be upserted concurrently
+        """
+        return EntityTopologicalSorter.group_by_entities_dependencies(self.entities)
+
     @staticmethod
     def node(entity: Entity) -> Node:
         return entity.identifier, entity.blueprint
 
     @staticmethod
-    def order_by_entities_dependencies(entities: list[Entity]) -> list[Entity]:
+    def build_dependencies_graph(
+        entities: list[Entity],
+    ) -> tuple[dict[Node, Set[Node]], dict[Node, Entity]]:
+        """
+        Builds the graph of the dependencies between the entities, in time linear to the number of entities and
+        relations, by looking up the targets of the relations in an index of the entities by identifier
+        """
         nodes: dict[Node, Set[Node]] = {}
-        entities_map = {}
+        entities_map: dict[Node, Entity] = {}
+        nodes_by_identifier: dict[str, list[Node]] = defaultdict(list)
         for entity in entities:
-            nodes[EntityTopologicalSorter.node(entity)] = set()
-            entities_map[EntityTopologicalSorter.node(entity)] = entity
-
-        for entity in entities:
-            relation_target_ids: list[str] = sum(
-                [
+            node = EntityTopologicalSorter.node(entity)
+            if node not in entities_map:
+                nodes[node] = set()
+                nodes_by_identifier[entity.identifier].append(node)
+            entities_map[node] = entity
+
+        for node, entity in entities_map.items():
+            for identifiers in entity.relations.values():
+                if identifiers is None:
+                    continue
+                for identifier in (
                     identifiers if isinstance(identifiers, list) else [identifiers]
-                    for identifiers in entity.relations.values()
-                    if identifiers is not None
-                ],
-                [],
-            )
-            related_entities = [
-                related
-                for related in entities
-                if related.identifier in relation_target_ids
-            ]
-
-            for related_entity in related_entities:
-                if (
-                    entity.blueprint is not related_entity.blueprint
-                    or entity.identifier is not related_entity.identifier
                 ):
-                    nodes[EntityTopologicalSorter.node(entity)].add(
-                        EntityTopologicalSorter.node(related_entity)
+                    # Relations to a search query can't be matched with the entities
+                    if not isinstance(identifier, str):
+                        continue
+                    nodes[node].update(
+                        related_node
+                        for related_node in nodes_by_identifier.get(identifier, [])
+                        if related_node != node
                     )
 
+        return nodes, entities_map
+
+    @staticmethod
+    def _cyclic_dependencies_error() -> OceanAbortException:
+        return OceanAbortException(
+            "Cannot order entities due to cyclic dependencies. \n"
+            "If you do want to have cyclic dependencies, please make sure to set the keys"
+            " 'createMissingRelatedEntities' and 'deleteDependentEntities' in the integration config in Port."
+        )
+
+    @staticmethod
+    def order_by_entities_dependencies(entities: list[Entity]) -> list[Entity]:
+        nodes, entities_map = EntityTopologicalSorter.build_dependencies_graph(entities)
         sort_op = TopologicalSorter(nodes)
         try:
             return [entities_map[item] for item in sort_op.static_order()]
         except CycleError as ex:
-            raise OceanAbortException(
-                "Cannot order entities due to cyclic dependencies. \n"
-                "If you do want to have cyclic dependencies, please make sure to set the keys"
-                " 'createMissingRelatedEntities' and 'deleteDependentEntities' in the integration config in Port."
-            ) from ex
+            raise EntityTopologicalSorter._cyclic_dependencies_error() from ex
+
+    @staticmethod
+    def group_by_dependencies_graph(nodes: dict[Node, Set[Node]]) -> list[list[Node]]:
+        sort_op = TopologicalSorter(nodes)
+        try:
+            sort_op.prepare()
+        except CycleError as ex:
+            raise EntityTopologicalSorter._cyclic_dependencies_error() from ex
+
+        levels = []
+        while sort_op.is_active():
+            level = sort_op.get_ready()
+            levels.append(list(level))
+            sort_op.done(*level)
+        return levels
+
+    @staticmethod
+    def group_by_entities_dependencies(entities: list[Entity]) -> list[list[Entity]]:
+        nodes, entities_map = EntityTopologicalSorter.build_dependencies_graph(entities)
+        return [
+            [entities_map[item] for item in level]
+            for level in EntityTopologicalSorter.group_by_dependencies_graph(nodes)
+        ]
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import tempfile
+from itertools import groupby
+from typing import Any, Iterable
+
+from port_ocean.core.models import Entity
+
+# Number of identifiers looked up per query, below the default limit of variables in an SQLite statement
+SQLITE_LOOKUP_CHUNK_SIZE = 500
+
+
+def _project_entity(entity: Entity, parameters_to_include: list[str]) -> Entity:
+    """Returns the entity as a search including only the given parameters would have returned it"""
+    included = set(parameters_to_include)
+    return Entity(
+        identifier=entity.identifier,
+        blueprint=entity.blueprint,
+        title=entity.title if "title" in included else None,
+        team=entity.team if "team" in included else [],
+        properties={
+            name: value
+            for name, value in entity.properties.items()
+            if f"properties.{name}" in included
+        },
+        relations={
+            name: value
+            for name, value in entity.relations.items()
+            if f"relations.{name}" in included
+        },
+    )
+
+
+class PortStateSnapshot:
+    """A snapshot of the entities at Port, indexed by blueprint and identifier
+
+    Entities are kept in memory, or in a temporary SQLite database created in `directory` when one is given, for
+    states too large to hold in memory. Only blueprints marked as complete are answered from the snapshot, as the
+    entities of any other blueprint may be missing from it.
+    """
+
+    def __init__(self, directory: str | None = None):
+        self._complete_blueprints: set[str] = set()
+        self._entities: dict[tuple[Any, str], Entity] = {}
+        self._database_path: str | None = None
+        self._database: sqlite3.Connection | None = None
+
+        if directory is not None:
+            file_descriptor, self._database_path = tempfile.mkstemp(
+                suffix=".sqlite", dir=directory
+            )
+            os.close(file_descriptor)
+            self._database = sqlite3.connect(self._database_path)
+            # The database is temporary, so it is written without the journaling that protects it from crashes
+            self._database.execute("PRAGMA journal_mode = OFF")
+            self._database.execute("PRAGMA synchronous = OFF")
+            self._database.execute(
+                "CREATE TABLE entities (blueprint TEXT, identifier TEXT, entity TEXT, "
+                "PRIMARY KEY (blueprint, identifier)) WITHOUT ROWID"
+            )
+
+    def __len__(self) -> int:
+        if self._database is not None:
+            return self._database.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+        return len(self._entities)
+
+    def add_many(self, entities: Iterable[Entity]) -> None:
+        if self._database is not None:
+            self._database.executemany(
+                "INSERT OR REPLACE INTO entities VALUES (?, ?, ?)",
+                (
+                    (entity.blueprint, entity.identifier, entity.json())
+                    for entity in entities
+                ),
+            )
+            return
+
+        for entity in entities:
+            self._entities[(entity.identifier, entity.blueprint)] = entity
+
+    def discard_many(self, entities: Iterable[Entity]) -> None:
+        """Remove entities whose state at Port is no longer known, so they are compared as missing"""
+        if self._database is not None:
+            self._database.executemany(
+                "DELETE FROM entities WHERE blueprint = ? AND identifier = ?",
+                ((entity.blueprint, entity.identifier) for entity in entities),
+            )
+            return
+
+        for entity in entities:
+            self._entities.pop((entity.identifier, entity.blueprint), None)
+
+    def complete_blueprint(self, blueprint: str) -> None:
+        self._complete_blueprints.add(blueprint)
+
+    def is_complete(self, entities: Iterable[Entity]) -> bool:
+        """Returns whether the snapshot holds every entity at Port of the blueprints of the given entities"""
+        return all(
+            entity.blueprint in self._complete_blueprints
+            and isinstance(entity.identifier, str)
+            for entity in entities
+        )
+
+    def get_many(
+        self, entities: list[Entity], parameters_to_include: list[str]
+    ) -> list[Entity]:
+        """Returns the entities at Port matching the given entities, including only the given parameters"""
+        if self._database is None:
+            entities_at_port = [
+                self._entities[key]
+                for key in (
+                    (entity.identifier, entity.blueprint) for entity in entities
+                )
+                if key in self._entities
+            ]
+        else:
+            entities_at_port = []
+            for blueprint, blueprint_entities in groupby(
+                sorted(entities, key=lambda entity: entity.blueprint),
+                key=lambda entity: entity.blueprint,
+            ):
+                identifiers = [entity.identifier for entity in blueprint_entities]
+                for start in range(0, len(identifiers), SQLITE_LOOKUP_CHUNK_SIZE):
+                    chunk = identifiers[start : start + SQLITE_LOOKUP_CHUNK_SIZE]
+                    rows = self._database.execute(
+                        "SELECT entity FROM entities WHERE blueprint = ? "
+                        f"AND identifier IN ({', '.join('?' * len(chunk))})",
+                        (blueprint, *chunk),
+                    )
+                    entities_at_port.extend(Entity.parse_raw(row[0]) for row in rows)
+
+        return [
+            _project_entity(entity, parameters_to_include)
+            for entity in entities_at_port
+        ]
+
+    def close(self) -> None:
+        self._entities.clear()
+        self._complete_blueprints.clear()
+        if self._database is not None:
+            self._database.close()
+            self._database = None
+        if self._database_path is not None:
+            os.remove(self._database_path)
+            self._database_path = None
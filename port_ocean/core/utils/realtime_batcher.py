@@ -0,0 +1,150 @@
+import asyncio
+import contextvars
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import Any, Callable, Coroutine, Literal
+
+from loguru import logger
+
+from port_ocean.clients.port.types import UserAgentType
+from port_ocean.core.models import Entity
+from port_ocean.core.ocean_types import RAW_ITEM
+
+RealtimeOperation = Literal["register", "unregister"]
+# Processes the results of a batch of changes along with the contexts of their callers, returning the entities of
+# every change in the order given, or the error the change failed with
+ProcessRealtimeChanges = Callable[
+    [
+        str,
+        RealtimeOperation,
+        list[list[RAW_ITEM]],
+        list[contextvars.Context],
+        UserAgentType,
+    ],
+    Coroutine[Any, Any, list[list[Entity] | Exception]],
+]
+
+
+@dataclass
+class _PendingChange:
+    operation: RealtimeOperation
+    results: list[RAW_ITEM]
+    user_agent_type: UserAgentType
+    # The context of the caller, such as its event, which the change is processed in
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+    future: asyncio.Future[list[Entity]] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class RealtimeChangesBatcher:
+    """Coalesces the realtime changes of every kind into batches, processed once a window passes or enough piled up
+
+    Changes are processed in the order they were submitted, with consecutive changes of the same operation
+    processed together as a single batch, so a register followed by an unregister of the same item keeps its
+    meaning. Every caller waits for the batch holding its change and receives the entities of its own change, or
+    the error its change failed with. Batches of a kind are processed one at a time in a context of their own, as
+    they hold the changes of unrelated callers, and every change is passed along with the context of its caller.
+    The pending changes are processed on shutdown instead of being discarded.
+    """
+
+    def __init__(
+        self,
+        process: ProcessRealtimeChanges,
+        window: float,
+        max_items: int,
+    ):
+        self._process = process
+        self._window = window
+        self._max_items = max_items
+        self._pending: dict[str, list[_PendingChange]] = {}
+        self._pending_items_count: dict[str, int] = {}
+        self._timers: dict[str, asyncio.Task[None]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(
+        self,
+        kind: str,
+        operation: RealtimeOperation,
+        results: list[RAW_ITEM],
+        user_agent_type: UserAgentType,
+    ) -> list[Entity]:
+        change = _PendingChange(operation, results, user_agent_type)
+        self._pending.setdefault(kind, []).append(change)
+        self._pending_items_count[kind] = self._pending_items_count.get(kind, 0) + len(
+            results
+        )
+
+        if self._pending_items_count[kind] >= self._max_items:
+            timer = self._timers.pop(kind, None)
+            if timer is not None:
+                timer.cancel()
+            self._start_flush(self._flush(kind))
+        elif kind not in self._timers:
+            self._timers[kind] = self._start_flush(self._flush_after_window(kind))
+
+        return await change.future
+
+    async def flush_all(self) -> None:
+        """Processes the pending changes of every kind without waiting for their window, as on shutdown"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        await asyncio.gather(
+            *(self._flush(kind) for kind in list(self._pending)),
+            *self._flush_tasks,
+            return_exceptions=True,
+        )
+
+    def _start_flush(self, flush: Coroutine[Any, Any, None]) -> asyncio.Task[None]:
+        task = asyncio.create_task(flush, context=contextvars.copy_context())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+        return task
+
+    async def _flush_after_window(self, kind: str) -> None:
+        await asyncio.sleep(self._window)
+        self._timers.pop(kind, None)
+        await self._flush(kind)
+
+    async def _flush(self, kind: str) -> None:
+        changes = self._pending.pop(kind, [])
+        self._pending_items_count.pop(kind, None)
+        if not changes:
+            return
+
+        async with self._locks.setdefault(kind, asyncio.Lock()):
+            for (operation, user_agent_type), batch in groupby(
+                changes, key=lambda change: (change.operation, change.user_agent_type)
+            ):
+                batch_changes = list(batch)
+                results = [item for change in batch_changes for item in change.results]
+                logger.info(
+                    f"Processing a batch of {len(batch_changes)} realtime {operation} changes of kind {kind}",
+                    kind=kind,
+                    changes_count=len(batch_changes),
+                    items_count=len(results),
+                )
+                try:
+                    outcomes: list[list[Entity] | Exception] = list(
+                        await asyncio.create_task(
+                            self._process(
+                                kind,
+                                operation,
+                                [change.results for change in batch_changes],
+                                [change.context for change in batch_changes],
+                                user_agent_type,
+                            ),
+                            context=contextvars.Context(),
+                        )
+                    )
+                except Exception as error:
+                    outcomes = [error for _ in batch_changes]
+                for change, outcome in zip(batch_changes, outcomes):
+                    if change.future.done():
+                        continue
+                    if isinstance(outcome, Exception):
+                        change.future.set_exception(outcome)
+                    else:
+                        change.future.set_result(outcome)
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from port_ocean.core.handlers.port_app_config.models import ResourceConfig
+
+
+def resource_checkpoint_key(resource_config: "ResourceConfig") -> str:
+    """Returns the key a resource is checkpointed under, which stays the same as long as its config doesn't change"""
+    resource_hash = hashlib.blake2b(
+        resource_config.json(sort_keys=True).encode(), digest_size=8
+    ).hexdigest()
+    return f"{resource_config.kind}:{resource_hash}"
+
+
+class ResyncCheckpointStore:
+    """The progress of a resync, persisted so a resync that was aborted or crashed resumes from where it stopped
+
+    The checkpoint holds the resources the resync completed, and for the resources in progress the page token their
+    resync function staged for the last batch that was upserted. A checkpoint is resumed only by a resync of the same
+    config, and it is cleared once the resync completes registering every resource.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self.config_hash: str | None = None
+        self.resync_id: str | None = None
+        self.completed_resources: set[str] = set()
+        self.page_tokens: dict[str, Any] = {}
+        self._resumed_page_tokens: dict[str, Any] = {}
+        self._staged_page_tokens: dict[str, Any] = {}
+
+    @property
+    def is_resumed(self) -> bool:
+        return bool(self.completed_resources or self._resumed_page_tokens)
+
+    def start(self, config_hash: str, resync_id: str) -> bool:
+        """
+        Starts checkpointing a resync of the given config, resuming the persisted checkpoint when it was taken for
+        the same config. Returns whether the checkpoint was resumed.
+        """
+        self.config_hash = config_hash
+        self.resync_id = resync_id
+        state = self._load()
+        if state is None or state.get("config_hash") != config_hash:
+            return False
+
+        self.resync_id = state["resync_id"]
+        self.completed_resources = set(state.get("completed_resources", []))
+        self.page_tokens = dict(state.get("page_tokens", {}))
+        self._resumed_page_tokens = dict(self.page_tokens)
+        return self.is_resumed
+
+    def _load(self) -> dict[str, Any] | None:
+        if not os.path.exists(self._path):
+            return None
+
+        try:
+            with open(self._path) as file:
+                return json.load(file)
+        except Exception as exc:
+            logger.warning(
+                f"Failed to load the resync checkpoint from {self._path}, resyncing from the start. Error: {exc}"
+            )
+            return None
+
+    def get_resumed_page_token(self, key: str) -> Any:
+        return self._resumed_page_tokens.get(key)
+
+    def stage_page_token(self, key: str, page_token: Any) -> None:
+        self._staged_page_tokens[key] = page_token
+
+    def get_staged_page_token(self, key: str) -> Any:
+        return self._staged_page_tokens.get(key)
+
+    def set_page_token(self, key: str, page_token: Any) -> None:
+        self.page_tokens[key] = page_token
+        self.save()
+
+    def complete_resource(self, key: str) -> None:
+        self.completed_resources.add(key)
+        self.page_tokens.pop(key, None)
+        self.save()
+
+    def save(self) -> None:
+        temporary_path = f"{self._path}.tmp"
+        try:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temporary_path, "w") as file:
+                json.dump(
+                    {
+                        "config_hash": self.config_hash,
+                        "resync_id": self.resync_id,
+                        "completed_resources": sorted(self.completed_resources),
+                        "page_tokens": self.page_tokens,
+                    },
+                    file,
+                    default=str,
+                )
+            # Replacing the file at once, so a crash while saving won't leave a corrupted checkpoint behind
+            os.replace(temporary_path, self._path)
+        except Exception as exc:
+            logger.warning(
+                f"Failed to save the resync checkpoint to {self._path}. Error: {exc}"
+            )
+
+    def clear(self) -> None:
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logger.warning(
+                f"Failed to remove the resync checkpoint at {self._path}. Error: {exc}"
+            )
+
+
+class PageTokenTracker:
+    """Matches the page tokens a resync function staged with the batches they follow
+
+    Batches are fetched ahead of the ones being upserted, so a page token is checkpointed only once every item
+    fetched before it was staged was upserted. Items are counted rather than batches, as batches may be coalesced
+    or split on their way to be upserted.
+    """
+
+    def __init__(self, fetched_items_count: int = 0):
+        self._fetched_items_count = fetched_items_count
+        self._upserted_items_count = 0
+        self._page_tokens: deque[tuple[int, Any]] = deque()
+        self._pipelined_batch_sizes: deque[int] = deque()
+
+    def fetched(self, items_count: int, page_token: Any) -> None:
+        self._fetched_items_count += items_count
+        if page_token is not None:
+            self._page_tokens.append((self._fetched_items_count, page_token))
+
+    def pipelined(self, items_count: int) -> None:
+        self._pipelined_batch_sizes.append(items_count)
+
+    def upserted(self) -> Any:
+        """Marks the oldest pipelined batch as upserted, returning the latest page token that can be checkpointed"""
+        self._upserted_items_count += self._pipelined_batch_sizes.popleft()
+        page_token = None
+        while (
+            self._page_tokens and self._page_tokens[0][0] <= self._upserted_items_count
+        ):
+            _, page_token = self._page_tokens.popleft()
+        return page_token
@@ -0,0 +1,88 @@
+import json
+import os
+import time
+from typing import Any, Iterable
+
+from loguru import logger
+
+
+class ResyncWatermarkStore:
+    """The watermarks of the kinds an integration resyncs, such as the time of the latest item a resync fetched
+
+    A resync function reads the watermark of its kind to fetch only the items updated since the last resync, and
+    stores the watermark to continue from next time. Watermarks are committed only once their kind was resynced
+    successfully, so a failed resync is retried from the previous watermark. The time of the last successful full
+    resync is kept as well, for scheduling full resyncs between the delta ones, and when a path is given the store is
+    persisted to it, so it survives restarts of the integration.
+    """
+
+    def __init__(self, path: str | None = None):
+        self._path = path
+        self._watermarks: dict[str, Any] = {}
+        self.last_full_resync_at: float | None = None
+
+    def get(self, kind: str) -> Any:
+        return self._watermarks.get(kind)
+
+    def commit(self, watermarks: dict[str, Any], kinds: Iterable[str]) -> None:
+        """Commit the watermarks staged for the given kinds"""
+        for kind in kinds:
+            if kind in watermarks:
+                self._watermarks[kind] = watermarks[kind]
+
+    def complete_full_resync(self, completed_at: float | None = None) -> None:
+        self.last_full_resync_at = (
+            completed_at if completed_at is not None else time.time()
+        )
+
+    def is_full_resync_due(self, interval: int | None) -> bool:
+        """
+        Returns whether a full resync is due, when no full resync completed yet or when the last one completed more
+        than `interval` minutes ago
+        """
+        if self.last_full_resync_at is None:
+            return True
+        if interval is None:
+            return False
+        return time.time() - self.last_full_resync_at >= interval * 60
+
+    def load(self) -> None:
+        if not self._path or not os.path.exists(self._path):
+            return
+
+        try:
+            with open(self._path) as file:
+                state = json.load(file)
+        except Exception as exc:
+            logger.warning(
+                f"Failed to load the resync watermarks from {self._path}, starting with a full resync. Error: {exc}"
+            )
+            return
+
+        self._watermarks = state.get("watermarks", {})
+        self.last_full_resync_at = state.get("last_full_resync_at")
+        logger.info(
+            f"Loaded the watermarks of {len(self._watermarks)} kinds from {self._path}"
+        )
+
+    def save(self) -> None:
+        if not self._path:
+            return
+
+        temporary_path = f"{self._path}.tmp"
+        try:
+            with open(temporary_path, "w") as file:
+                json.dump(
+                    {
+                        "watermarks": self._watermarks,
+                        "last_full_resync_at": self.last_full_resync_at,
+                    },
+                    file,
+                    default=str,
+                )
+            # Replacing the file at once, so a crash while saving won't leave corrupted watermarks behind
+            os.replace(temporary_path, self._path)
+        except Exception as exc:
+            logger.warning(
+                f"Failed to save the resync watermarks to {self._path}. Error: {exc}"
+            )
@@ -0,0 +1,311 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from typing import Any, AsyncIterator, Callable, Iterable, TypeVar
+from uuid import uuid4
+
+from loguru import logger
+
+from port_ocean.core.models import Entity
+
+SCHEMA_VERSION = "1"
+# Number of identifiers looked up per query, below the default limit of variables in an SQLite statement
+SQLITE_LOOKUP_CHUNK_SIZE = 500
+# Seconds to wait for a lock held by another job on a shared volume, before resyncing without skipping entities
+SQLITE_LOCK_TIMEOUT = 5
+
+T = TypeVar("T")
+
+
+def entity_content_hash(entity: Entity) -> str:
+    return hashlib.blake2b(
+        json.dumps(entity.dict(), sort_keys=True, default=str).encode(), digest_size=16
+    ).hexdigest()
+
+
+class SyncedStateStore:
+    """A file-backed record of the entities an integration synced to Port, kept between resyncs
+
+    Every entity is recorded with the hash of its content and the id of the last resync that saw it, so an entity
+    whose content didn't change since it was synced is skipped without comparing it with Port, and the entities the
+    integration synced can be listed without searching Port. The state is rebuilt from Port when the file is new or
+    corrupted, and entities changed in Port by anything but the integration are noticed only once it is rebuilt,
+    which can be forced by removing the file.
+
+    The database is accessed from a thread of its own, so waiting for a lock never blocks the event loop. Once a query
+    fails, for example when another job holds the lock for too long, the store is degraded: no entity is skipped,
+    nothing is recorded, the entities to delete are searched in Port, and the state is rebuilt by the next resync.
+    """
+
+    def __init__(self, path: str, timeout: float = SQLITE_LOCK_TIMEOUT):
+        self._path = path
+        self._timeout = timeout
+        self._database: sqlite3.Connection | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self.resync_id: str | None = None
+        self.needs_rebuild = False
+        self.degraded = False
+
+    @property
+    def database(self) -> sqlite3.Connection:
+        if self._database is None:
+            raise ValueError("The synced state store is not open")
+        return self._database
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._executor is None:
+            raise ValueError("The synced state store is not open")
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    async def _run_or_degrade(
+        self, fallback: T, func: Callable[..., T], *args: Any
+    ) -> T:
+        if self.degraded:
+            return fallback
+        try:
+            return await self._run(func, *args)
+        except sqlite3.Error as e:
+            logger.warning(
+                f"Failed to access the synced state at {self._path}, it will be rebuilt by the next resync. Error: {e}"
+            )
+            self.degraded = True
+            return fallback
+
+    async def open(self, verify: bool = True) -> None:
+        """Opens the store, verifying the integrity of the database unless `verify` is False"""
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="synced-state"
+        )
+        self.degraded = False
+        try:
+            await self._run(self._open, verify)
+        except Exception:
+            await self.close()
+            raise
+
+    def _open(self, verify: bool) -> None:
+        try:
+            self._connect(verify)
+        except sqlite3.OperationalError:
+            # The database is locked or can't be read, which doesn't mean it is corrupted
+            raise
+        except sqlite3.DatabaseError as e:
+            logger.warning(
+                f"The synced state at {self._path} is corrupted and will be rebuilt from Port. Error: {e}"
+            )
+            self._close()
+            os.replace(self._path, f"{self._path}.corrupted")
+            self._connect(verify)
+
+    def _connect(self, verify: bool) -> None:
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A short timeout lets a job wait for another one that is still writing to a shared volume
+        self._database = sqlite3.connect(self._path, timeout=self._timeout)
+        if verify and self.database.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+            raise sqlite3.DatabaseError("quick check failed")
+
+        self.database.executescript(
+            "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS entities (blueprint TEXT, identifier TEXT, content_hash TEXT, "
+            "last_seen_resync_id TEXT, PRIMARY KEY (blueprint, identifier)) WITHOUT ROWID;"
+        )
+        schema_version = self.database.execute(
+            "SELECT value FROM metadata WHERE key = 'schema_version'"
+        ).fetchone()
+        self.needs_rebuild = (
+            schema_version is None or schema_version[0] != SCHEMA_VERSION
+        )
+
+    def begin_resync(self, resync_id: str | None = None) -> str:
+        """Begins a resync, or continues the one with the given id so the entities it already saw count as seen"""
+        self.resync_id = resync_id or str(uuid4())
+        return self.resync_id
+
+    async def rebuild(self, entities: Iterable[Entity]) -> None:
+        """Replace the state with the given entities, whose content is unknown so they are compared with Port"""
+        await self._run(self._rebuild, list(entities))
+        self.needs_rebuild = False
+
+    def _rebuild(self, entities: list[Entity]) -> None:
+        with self.database:
+            self.database.execute("DELETE FROM entities")
+            self.database.executemany(
+                "INSERT OR REPLACE INTO entities VALUES (?, ?, NULL, NULL)",
+                (
+                    (entity.blueprint, entity.identifier)
+                    for entity in entities
+                    if isinstance(entity.identifier, str)
+                ),
+            )
+            self.database.execute(
+                "INSERT OR REPLACE INTO metadata VALUES ('schema_version', ?)",
+                (SCHEMA_VERSION,),
+            )
+
+    def _get_content_hashes(
+        self, entities: list[Entity]
+    ) -> dict[tuple[str, str], str | None]:
+        content_hashes: dict[tuple[str, str], str | None] = {}
+        for blueprint, blueprint_entities in groupby(
+            sorted(entities, key=lambda entity: entity.blueprint),
+            key=lambda entity: entity.blueprint,
+        ):
+            identifiers = [entity.identifier for entity in blueprint_entities]
+            for start in range(0, len(identifiers), SQLITE_LOOKUP_CHUNK_SIZE):
+                chunk = identifiers[start : start + SQLITE_LOOKUP_CHUNK_SIZE]
+                rows = self.database.execute(
+                    "SELECT identifier, content_hash FROM entities WHERE blueprint = ? "
+                    f"AND identifier IN ({', '.join('?' * len(chunk))})",
+                    (blueprint, *chunk),
+                )
+                content_hashes.update(
+                    ((blueprint, identifier), content_hash)
+                    for identifier, content_hash in rows
+                )
+        return content_hashes
+
+    async def filter_changed(self, entities: list[Entity]) -> list[Entity]:
+        """
+        Returns the entities whose content changed since they were synced, or that weren't synced yet.
+        The unchanged entities are marked as seen by the current resync.
+        """
+        return await self._run_or_degrade(entities, self._filter_changed, entities)
+
+    def _filter_changed(self, entities: list[Entity]) -> list[Entity]:
+        trackable_entities = [
+            entity for entity in entities if isinstance(entity.identifier, str)
+        ]
+        content_hashes = self._get_content_hashes(trackable_entities)
+        unchanged_keys = {
+            (entity.blueprint, entity.identifier)
+            for entity in trackable_entities
+            if content_hashes.get((entity.blueprint, entity.identifier))
+            == entity_content_hash(entity)
+        }
+
+        with self.database:
+            self.database.executemany(
+                "UPDATE entities SET last_seen_resync_id = ? WHERE blueprint = ? AND identifier = ?",
+                ((self.resync_id, *key) for key in unchanged_keys),
+            )
+        return [
+            entity
+            for entity in entities
+            if (entity.blueprint, entity.identifier) not in unchanged_keys
+        ]
+
+    async def record(self, entities: Iterable[Entity]) -> None:
+        """Record the content of entities synced to Port by the current resync"""
+        await self._run_or_degrade(None, self._record, list(entities))
+
+    def _record(self, entities: list[Entity]) -> None:
+        with self.database:
+            self.database.executemany(
+                "INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        entity.blueprint,
+                        entity.identifier,
+                        entity_content_hash(entity),
+                        self.resync_id,
+                    )
+                    for entity in entities
+                    if isinstance(entity.identifier, str)
+                ),
+            )
+
+    async def invalidate_many(self, entities: Iterable[Entity]) -> None:
+        """
+        Forget the content of entities changed in Port by anything but a resync, such as realtime events, so the next
+        resync compares them with Port. They are kept as candidates for deletion, without marking them as seen.
+        """
+        await self._run_or_degrade(None, self._invalidate_many, list(entities))
+
+    def _invalidate_many(self, entities: list[Entity]) -> None:
+        with self.database:
+            self.database.executemany(
+                "INSERT INTO entities VALUES (?, ?, NULL, NULL) ON CONFLICT (blueprint, identifier) "
+                "DO UPDATE SET content_hash = NULL",
+                (
+                    (entity.blueprint, entity.identifier)
+                    for entity in entities
+                    if isinstance(entity.identifier, str)
+                ),
+            )
+
+    async def discard_many(self, entities: Iterable[Entity]) -> None:
+        await self._run_or_degrade(None, self._discard_many, list(entities))
+
+    def _discard_many(self, entities: list[Entity]) -> None:
+        with self.database:
+            self.database.executemany(
+                "DELETE FROM entities WHERE blueprint = ? AND identifier = ?",
+                ((entity.blueprint, entity.identifier) for entity in entities),
+            )
+
+    async def count_unseen(self) -> int:
+        """Returns the number of recorded entities the current resync didn't see"""
+        return await self._run_or_degrade(0, self._count_unseen)
+
+    def _count_unseen(self) -> int:
+        return self.database.execute(
+            "SELECT COUNT(*) FROM entities WHERE last_seen_resync_id IS NOT ?",
+            (self.resync_id,),
+        ).fetchone()[0]
+
+    async def _iterate_rows(
+        self, page_size: int, query: str, parameters: tuple[Any, ...] = ()
+    ) -> AsyncIterator[list[Entity]]:
+        cursor = await self._run(self.database.execute, query, parameters)
+        while rows := await self._run(cursor.fetchmany, page_size):
+            yield [
+                Entity(identifier=identifier, blueprint=blueprint)
+                for blueprint, identifier in rows
+            ]
+
+    def iterate_entities(self, page_size: int) -> AsyncIterator[list[Entity]]:
+        """Yields the identities of the recorded entities page by page"""
+        return self._iterate_rows(
+            page_size, "SELECT blueprint, identifier FROM entities"
+        )
+
+    def iterate_seen_entities(self, page_size: int) -> AsyncIterator[list[Entity]]:
+        """Yields the identities of the recorded entities the current resync saw page by page"""
+        return self._iterate_rows(
+            page_size,
+            "SELECT blueprint, identifier FROM entities WHERE last_seen_resync_id = ?",
+            (self.resync_id,),
+        )
+
+    def _invalidate(self) -> None:
+        with self.database:
+            self.database.execute("DELETE FROM metadata WHERE key = 'schema_version'")
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+
+        if self.degraded and self._database is not None:
+            try:
+                # The state missed changes, so the next resync rebuilds it from Port rather than trusting it
+                await self._run(self._invalidate)
+            except sqlite3.Error as e:
+                logger.warning(
+                    f"Failed to invalidate the synced state at {self._path}, remove it to rebuild it. Error: {e}"
+                )
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+        self._executor = None
+
+    def _close(self) -> None:
+        if self._database is not None:
+            self._database.close()
+            self._database = None
@@ -23,6 +23,21 @@ def zip_and_sum(collection: Iterable[T]) -> T:
     return tuple(sum(items, []) for items in zip(*collection))  # type: ignore
 
 
+def deduplicate_entities(entities: Iterable[Entity]) -> list[Entity]:
+    """Returns the entities without duplicates, keeping the last occurrence of every entity"""
+    deduplicated_entities: dict[tuple[str, str], Entity] = {}
+    for entity in entities:
+        identifier = (
+            entity.identifier
+            if isinstance(entity.identifier, str)
+            else json.dumps(entity.identifier, sort_keys=True, default=str)
+        )
+        key = (identifier, entity.blueprint)
+        deduplicated_entities.pop(key, None)
+        deduplicated_entities[key] = entity
+    return list(deduplicated_entities.values())
+
+
 def validate_result(result: Any) -> RAW_RESULT:
     try:
         return parse_obj_as(list[dict[str, Any]], result)
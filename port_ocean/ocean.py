@@ -65,13 +65,15 @@ class Ocean:
             integration_identifier=self.config.integration.identifier,
             integration_type=self.config.integration.type,
             integration_version=__integration_version__,
+            blueprint_cache_ttl=self.config.port.blueprint_cache_ttl,
+            bulk_upsert_entities=self.config.port.bulk_upsert_entities,
         )
         self.integration = (
             integration_class(ocean) if integration_class else BaseIntegration(ocean)
         )
 
         self.resync_state_updater = ResyncStateUpdater(
-            self.port_client, self.config.scheduled_resync_interval
+            self.port_client, self._get_scheduled_resync_interval()
         )
 
         self.app_initialized = False
@@ -79,14 +81,25 @@ class Ocean:
     def is_saas(self) -> bool:
         return self.config.runtime.is_saas_runtime
 
+    def _get_scheduled_resync_interval(self) -> int | None:
+        """Returns the minutes between scheduled resyncs, full ones are scheduled in place of delta ones"""
+        interval = self.config.scheduled_resync_interval
+        delta_interval = self.config.scheduled_delta_resync_interval
+        # Resyncs run every delta interval when one is set, or every full resync interval when it is the shorter one
+        # so full resyncs aren't delayed
+        if delta_interval is not None and interval is not None:
+            return min(delta_interval, interval)
+        return delta_interval or interval
+
     async def _setup_scheduled_resync(
         self,
     ) -> None:
         async def execute_resync_all() -> None:
             await self.resync_state_updater.update_before_resync()
-            logger.info("Starting a new scheduled resync")
+            resync_type = self.integration.get_scheduled_resync_type()
+            logger.info(f"Starting a new scheduled {resync_type} resync")
             try:
-                await self.integration.sync_raw_all()
+                await self.integration.sync_raw_all(resync_type=resync_type)
                 await self.resync_state_updater.update_after_resync()
             except asyncio.CancelledError:
                 logger.warning(
@@ -99,14 +112,34 @@ class Ocean:
                 raise e
 
         interval = self.config.scheduled_resync_interval
+        delta_interval = self.config.scheduled_delta_resync_interval
         loop = asyncio.get_event_loop()
-        if interval is not None:
+        if delta_interval is not None:
+            logger.info(
+                f"Setting up scheduled resync, the integration will automatically perform a delta resync every {delta_interval} minutes"
+                + (
+                    f", and a full resync once {interval} minutes passed since the last one"
+                    if interval is not None
+                    else ""
+                ),
+                scheduled_interval=interval,
+                scheduled_delta_interval=delta_interval,
+            )
+            if self.config.resync_watermark_path is None:
+                logger.warning(
+                    "resync_watermark_path is not set, so the watermarks and the time of the last full resync are "
+                    "kept in memory only and every restart of the integration begins with a full resync"
+                )
+        elif interval is not None:
             logger.info(
                 f"Setting up scheduled resync, the integration will automatically perform a full resync every {interval} minutes)",
                 scheduled_interval=interval,
             )
+
+        schedule_interval = self._get_scheduled_resync_interval()
+        if schedule_interval is not None:
             repeated_function = repeat_every(
-                seconds=interval * 60,
+                seconds=schedule_interval * 60,
                 # Not running the resync immediately because the event listener should run resync on startup
                 wait_first=True,
             )(
@@ -0,0 +1,56 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from port_ocean.clients.port.mixins.blueprints import BlueprintClientMixin
+
+
+def create_blueprint_mixin(blueprint_cache_ttl: int) -> BlueprintClientMixin:
+    auth = MagicMock()
+    auth.headers = AsyncMock(return_value={"auth": "enticated"})
+    client = MagicMock()
+    client.get = AsyncMock()
+    client.get.return_value = MagicMock(is_error=False)
+    client.get.return_value.json.return_value = {
+        "blueprint": {"identifier": "service", "schema": {}, "relations": {}}
+    }
+    client.patch = AsyncMock(return_value=MagicMock(is_error=False))
+    return BlueprintClientMixin(
+        auth=auth, client=client, blueprint_cache_ttl=blueprint_cache_ttl
+    )
+
+
+async def test_get_blueprint_serves_cached_blueprint_until_ttl_passes() -> None:
+    blueprint_mixin = create_blueprint_mixin(blueprint_cache_ttl=60)
+
+    with patch(
+        "port_ocean.clients.port.mixins.blueprints.get_time", return_value=1000
+    ) as mock_get_time:
+        await blueprint_mixin.get_blueprint("service")
+        blueprint = await blueprint_mixin.get_blueprint("service")
+        assert blueprint.identifier == "service"
+        assert blueprint_mixin.client.get.call_count == 1  # type: ignore
+
+        await blueprint_mixin.get_blueprint("service", use_cache=False)
+        assert blueprint_mixin.client.get.call_count == 2  # type: ignore
+
+        mock_get_time.return_value = 1061
+        await blueprint_mixin.get_blueprint("service")
+        assert blueprint_mixin.client.get.call_count == 3  # type: ignore
+
+
+async def test_patch_blueprint_invalidates_cached_blueprint() -> None:
+    blueprint_mixin = create_blueprint_mixin(blueprint_cache_ttl=60)
+
+    await blueprint_mixin.get_blueprint("service")
+    await blueprint_mixin.patch_blueprint("service", {"title": "Service"})
+    await blueprint_mixin.get_blueprint("service")
+
+    assert blueprint_mixin.client.get.call_count == 2  # type: ignore
+
+
+async def test_get_blueprint_without_cache() -> None:
+    blueprint_mixin = create_blueprint_mixin(blueprint_cache_ttl=0)
+
+    await blueprint_mixin.get_blueprint("service")
+    await blueprint_mixin.get_blueprint("service")
+
+    assert blueprint_mixin.client.get.call_count == 2  # type: ignore
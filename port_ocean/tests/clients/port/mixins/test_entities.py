@@ -1,10 +1,14 @@
+import json
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
 
 from port_ocean.clients.port.mixins.entities import EntityClientMixin
+from port_ocean.clients.port.types import RequestOptions
 from port_ocean.core.models import Entity
+from port_ocean.exceptions.clients import PortClientException
 from httpx import ReadTimeout
 
 
@@ -51,3 +55,308 @@ async def test_batch_upsert_entities_read_timeout_should_raise_true(
         await entity_client.batch_upsert_entities(
             entities=all_entities, request_options=MagicMock(), should_raise=True
         )
+
+
+async def test_search_entities_in_pages_follows_cursors() -> None:
+    pages: dict[tuple[str, str | None], dict[str, Any]] = {
+        ("service", None): {
+            "entities": [{"identifier": "service-a", "blueprint": "service"}],
+            "next": "service-cursor",
+        },
+        ("service", "service-cursor"): {
+            "entities": [{"identifier": "service-b", "blueprint": "service"}],
+            "next": None,
+        },
+        ("team", None): {
+            "entities": [{"identifier": "team-a", "blueprint": "team"}],
+        },
+    }
+    requests: list[dict[str, Any]] = []
+    blueprints_requests_count = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal blueprints_requests_count
+        if request.method == "GET":
+            blueprints_requests_count += 1
+            return httpx.Response(
+                200,
+                json={
+                    "blueprints": [{"identifier": "service"}, {"identifier": "team"}]
+                },
+            )
+        body = json.loads(request.content)
+        requests.append(body)
+        blueprint = request.url.path.split("/")[-3]
+        return httpx.Response(200, json=pages[(blueprint, body.get("from"))])
+
+    auth = MagicMock()
+    auth.api_url = "https://api.getport.io/v1"
+    auth.headers = AsyncMock(return_value={})
+    entity_client = EntityClientMixin(
+        auth=auth, client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    entities_pages = [
+        [entity.identifier for entity in entities]
+        async for entities in entity_client.search_entities_in_pages(
+            MagicMock(), page_size=1
+        )
+    ]
+
+    assert entities_pages == [["service-a"], ["service-b"], ["team-a"]]
+    assert [request["limit"] for request in requests] == [1, 1, 1]
+    assert [request.get("from") for request in requests] == [
+        None,
+        "service-cursor",
+        None,
+    ]
+
+    # Only the given blueprints are searched, without listing the blueprints of the organization
+    requests.clear()
+    entities_pages = [
+        [entity.identifier for entity in entities]
+        async for entities in entity_client.search_entities_in_pages(
+            MagicMock(), page_size=1, blueprints=["team"]
+        )
+    ]
+
+    assert entities_pages == [["team-a"]]
+    assert len(requests) == 1
+    assert blueprints_requests_count == 1
+
+
+def create_bulk_entity_client(
+    transport: httpx.AsyncBaseTransport,
+) -> EntityClientMixin:
+    auth = MagicMock()
+    auth.api_url = "http://localhost:5555/v1"
+    auth.headers = AsyncMock(return_value={})
+    return EntityClientMixin(
+        auth=auth,
+        client=httpx.AsyncClient(transport=transport),
+        bulk_upsert_entities=True,
+    )
+
+
+bulk_request_options: RequestOptions = {
+    "merge": True,
+    "create_missing_related_entities": False,
+    "delete_dependent_entities": False,
+    "validation_only": False,
+}
+
+
+async def test_upsert_entities_in_bulk_requests_by_blueprint() -> None:
+    from port_ocean.tests.helpers.fake_port_api import app
+
+    transport = httpx.ASGITransport(app=app)
+    requests: list[httpx.Request] = []
+
+    async def log_request(request: httpx.Request) -> None:
+        requests.append(request)
+
+    entity_client = create_bulk_entity_client(transport)
+    entity_client.client.event_hooks["request"] = [log_request]
+    entities = [
+        Entity(identifier=f"service-{index}", blueprint="service")
+        for index in range(25)
+    ] + [Entity(identifier="team-a", blueprint="team")]
+
+    results = await entity_client.upsert_entities(
+        entities, request_options=bulk_request_options
+    )
+
+    assert [result.identifier for result in results if result] == [
+        entity.identifier for entity in entities
+    ]
+    assert sorted(
+        (request.url.path, len(json.loads(request.content)["entities"]))
+        for request in requests
+    ) == [
+        ("/v1/blueprints/service/entities/bulk", 5),
+        ("/v1/blueprints/service/entities/bulk", 20),
+        ("/v1/blueprints/team/entities/bulk", 1),
+    ]
+
+
+async def test_upsert_entities_in_bulk_fails_entities_port_rejected() -> None:
+    from port_ocean.tests.helpers.fake_port_api import app, FAKE_INVALID_ENTITY_PREFIX
+
+    entity_client = create_bulk_entity_client(httpx.ASGITransport(app=app))
+    entities = [
+        Entity(identifier="service-a", blueprint="service"),
+        Entity(identifier=f"{FAKE_INVALID_ENTITY_PREFIX}service", blueprint="service"),
+    ]
+
+    with pytest.raises(PortClientException, match="is invalid"):
+        await entity_client.upsert_entities(
+            entities, request_options=bulk_request_options
+        )
+    # Without raising, a rejected entity gets the result a single upsert would return
+    assert await entity_client.upsert_entities(
+        entities, request_options=bulk_request_options, should_raise=False
+    ) == [
+        Entity(identifier="service-a", blueprint="service"),
+        Entity(identifier=f"{FAKE_INVALID_ENTITY_PREFIX}service", blueprint="service"),
+    ]
+
+
+async def test_upsert_entities_in_bulk_maps_entity_results() -> None:
+    requested_paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_paths.append(request.url.path)
+        if not request.url.path.endswith("/bulk"):
+            return httpx.Response(
+                200, json={"ok": True, "entity": json.loads(request.content)}
+            )
+        return httpx.Response(
+            207,
+            json={
+                "ok": False,
+                "entities": [
+                    {
+                        "identifier": "service-a",
+                        "index": 0,
+                        "entity": {
+                            "identifier": "service-a",
+                            "blueprint": "service",
+                            "relations": {"team": "team-a"},
+                        },
+                    }
+                ],
+                "errors": [
+                    {
+                        "identifier": "service-b",
+                        "index": 1,
+                        "statusCode": 404,
+                        "error": "not_found",
+                    },
+                    {
+                        "identifier": "service-c",
+                        "index": 2,
+                        "statusCode": 422,
+                        "error": "invalid_request",
+                    },
+                ],
+            },
+        )
+
+    entity_client = create_bulk_entity_client(httpx.MockTransport(handler))
+    entities = [
+        Entity(
+            identifier="service-a",
+            blueprint="service",
+            relations={"team": {"combinator": "and", "rules": []}},
+        )
+    ] + [
+        Entity(identifier=identifier, blueprint="service")
+        for identifier in ("service-b", "service-c", "service-d")
+    ]
+
+    results = await entity_client.upsert_entities(
+        entities, request_options=bulk_request_options, should_raise=False
+    )
+
+    # The relation a search resolved to is taken from Port, and the entity Port returned no result for is upserted
+    assert results == [
+        Entity(
+            identifier="service-a", blueprint="service", relations={"team": "team-a"}
+        ),
+        False,
+        Entity(identifier="service-c", blueprint="service"),
+        Entity(identifier="service-d", blueprint="service"),
+    ]
+    assert requested_paths == [
+        "/v1/blueprints/service/entities/bulk",
+        "/v1/blueprints/service/entities",
+    ]
+    with pytest.raises(PortClientException):
+        await entity_client.upsert_entities(
+            entities, request_options=bulk_request_options
+        )
+
+
+async def test_upsert_entities_in_bulk_falls_back_to_single_upserts() -> None:
+    requested_paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_paths.append(request.url.path)
+        if request.url.path.endswith("/bulk"):
+            return httpx.Response(404, text="Not Found")
+        entity = json.loads(request.content)
+        if entity["identifier"] == "service-b":
+            return httpx.Response(404, json={"ok": False, "error": "not_found"})
+        return httpx.Response(200, json={"ok": True, "entity": entity})
+
+    entity_client = create_bulk_entity_client(httpx.MockTransport(handler))
+    entities = [
+        Entity(identifier=identifier, blueprint="service")
+        for identifier in ("service-a", "service-b")
+    ]
+
+    results = await entity_client.upsert_entities(
+        entities, request_options=bulk_request_options, should_raise=False
+    )
+    await entity_client.upsert_entities(
+        entities[:1], request_options=bulk_request_options, should_raise=False
+    )
+
+    assert results == [Entity(identifier="service-a", blueprint="service"), False]
+    # The bulk endpoint isn't requested again once it turned out to be unavailable
+    assert requested_paths == [
+        "/v1/blueprints/service/entities/bulk",
+        "/v1/blueprints/service/entities",
+        "/v1/blueprints/service/entities",
+        "/v1/blueprints/service/entities",
+    ]
+
+
+async def test_upsert_entities_in_bulk_keeps_bulk_after_missing_blueprint() -> None:
+    requested_paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested_paths.append(request.url.path)
+        if request.url.path.startswith("/v1/blueprints/missing/"):
+            return httpx.Response(
+                404,
+                json={
+                    "ok": False,
+                    "error": "not_found",
+                    "message": "Blueprint with identifier missing was not found",
+                },
+            )
+        entities = json.loads(request.content)["entities"]
+        return httpx.Response(
+            200,
+            json={
+                "ok": True,
+                "entities": [
+                    {"index": index, "identifier": entity["identifier"]}
+                    for index, entity in enumerate(entities)
+                ],
+            },
+        )
+
+    entity_client = create_bulk_entity_client(httpx.MockTransport(handler))
+
+    results = await entity_client.upsert_entities(
+        [Entity(identifier="missing-a", blueprint="missing")],
+        request_options=bulk_request_options,
+        should_raise=False,
+    )
+    assert results == [False]
+    assert entity_client.bulk_upsert_entities
+
+    results = await entity_client.upsert_entities(
+        [Entity(identifier="service-a", blueprint="service")],
+        request_options=bulk_request_options,
+        should_raise=False,
+    )
+    assert results == [Entity(identifier="service-a", blueprint="service")]
+    # Only the chunk of the missing blueprint was upserted one by one
+    assert requested_paths == [
+        "/v1/blueprints/missing/entities/bulk",
+        "/v1/blueprints/missing/entities",
+        "/v1/blueprints/service/entities/bulk",
+    ]
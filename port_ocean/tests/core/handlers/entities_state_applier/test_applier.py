@@ -1,10 +1,16 @@
-from unittest.mock import Mock, patch
+import asyncio
+from typing import Any, AsyncIterator
+from unittest.mock import AsyncMock, Mock, patch
 import pytest
 from port_ocean.core.handlers.entities_state_applier.port.applier import (
     HttpEntitiesStateApplier,
 )
-from port_ocean.core.models import Entity
+from port_ocean.core.handlers.entities_state_applier.port.get_related_entities import (
+    get_related_entities,
+)
+from port_ocean.core.models import Blueprint, Entity
 from port_ocean.core.ocean_types import EntityDiff
+from port_ocean.core.utils.entity_identity_store import EntityIdentityStore
 from port_ocean.clients.port.types import UserAgentType
 
 
@@ -84,3 +90,231 @@ async def test_delete_diff_custom_threshold_above_threshold_not_deleted() -> Non
         )
 
     mock_safe_delete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_diff_keeps_entities_related_to_registered_entities() -> None:
+    port_client = Mock()
+    port_client.get_blueprint = AsyncMock(
+        return_value=Blueprint.parse_obj(
+            {
+                "identifier": "service",
+                "schema": {},
+                "relations": {
+                    "owner": {"target": "team", "many": False, "required": False}
+                },
+            }
+        )
+    )
+    applier = HttpEntitiesStateApplier(Mock(port_client=port_client))
+    entities = EntityDiff(
+        before=[
+            Entity(identifier="service-a", blueprint="service"),
+            Entity(identifier="team-a", blueprint="team"),
+            Entity(identifier="team-b", blueprint="team"),
+        ],
+        after=[
+            Entity(
+                identifier="service-a",
+                blueprint="service",
+                relations={"owner": "team-a"},
+            )
+        ],
+    )
+
+    mock_event = Mock()
+    mock_event.port_app_config.create_missing_related_entities = True
+
+    with (
+        patch(
+            "port_ocean.core.handlers.entities_state_applier.port.applier.event",
+            mock_event,
+        ),
+        patch.object(applier, "delete") as mock_delete,
+    ):
+        await applier.delete_diff(
+            entities, UserAgentType.exporter, entity_deletion_threshold=0.9
+        )
+
+    port_client.get_blueprint.assert_awaited_once_with("service")
+    deleted_entities = mock_delete.call_args[0][0]
+    assert [entity.identifier for entity in deleted_entities] == ["team-b"]
+
+
+@pytest.mark.asyncio
+async def test_delete_unregistered_entities_streams_entities_at_port() -> None:
+    applier = HttpEntitiesStateApplier(Mock())
+
+    async def entities_at_port() -> AsyncIterator[list[Entity]]:
+        yield [Entity(identifier="1", blueprint="test")]
+        yield [
+            Entity(identifier="2", blueprint="test"),
+            Entity(identifier="3", blueprint="test"),
+        ]
+
+    with patch.object(applier, "_safe_delete") as mock_safe_delete:
+        await applier.delete_unregistered_entities(
+            entities_at_port(),
+            EntityIdentityStore.from_entities(
+                [
+                    Entity(identifier="1", blueprint="test"),
+                    Entity(identifier="2", blueprint="test"),
+                ]
+            ),
+            UserAgentType.exporter,
+            entity_deletion_threshold=0.5,
+        )
+
+    mock_safe_delete.assert_called_once()
+    assert [entity.identifier for entity in mock_safe_delete.call_args[0][0]] == ["3"]
+
+
+@pytest.mark.asyncio
+async def test_delete_deletes_dependents_first_level_by_level() -> None:
+    deleted: list[str] = []
+    in_flight: list[str] = []
+    concurrent_deletes: list[set[str]] = []
+
+    async def delete_entity(entity: Entity, *args: Any, **kwargs: Any) -> None:
+        in_flight.append(entity.identifier)
+        await asyncio.sleep(0)
+        concurrent_deletes.append(set(in_flight))
+        in_flight.remove(entity.identifier)
+        deleted.append(entity.identifier)
+
+    port_client = Mock()
+    port_client.delete_entity = AsyncMock(side_effect=delete_entity)
+    applier = HttpEntitiesStateApplier(Mock(port_client=port_client))
+    entities = [
+        Entity(identifier="team", blueprint="team"),
+        Entity(
+            identifier="service-a", blueprint="service", relations={"owner": "team"}
+        ),
+        Entity(
+            identifier="service-b", blueprint="service", relations={"owner": "team"}
+        ),
+        Entity(
+            identifier="deployment",
+            blueprint="deployment",
+            relations={"service": "service-a"},
+        ),
+    ]
+
+    mock_event = Mock()
+    mock_event.port_app_config.delete_dependent_entities = False
+
+    with patch(
+        "port_ocean.core.handlers.entities_state_applier.port.applier.event",
+        mock_event,
+    ):
+        await applier.delete(entities, UserAgentType.exporter)
+
+    assert deleted[0] == "deployment"
+    assert set(deleted[1:3]) == {"service-a", "service-b"}
+    assert deleted[3] == "team"
+    assert {"service-a", "service-b"} in concurrent_deletes
+
+
+@pytest.mark.asyncio
+async def test_upsert_without_creating_missing_related_entities_by_dependencies() -> (
+    None
+):
+    upserted: list[str] = []
+
+    async def upsert_entities(
+        entities: list[Entity], *args: Any, **kwargs: Any
+    ) -> list[Entity | bool]:
+        upserted.extend(entity.identifier for entity in entities)
+        # team-a fails as the team it relates to is missing from Port
+        return [
+            False if entity.identifier == "team-a" else entity for entity in entities
+        ]
+
+    port_client = Mock()
+    port_client.upsert_entities = AsyncMock(side_effect=upsert_entities)
+    applier = HttpEntitiesStateApplier(Mock(port_client=port_client))
+    entities = [
+        Entity(
+            identifier="service-a", blueprint="service", relations={"owner": "team-a"}
+        ),
+        Entity(
+            identifier="service-b", blueprint="service", relations={"owner": "team-b"}
+        ),
+        Entity(identifier="team-a", blueprint="team", relations={"parent": "missing"}),
+        Entity(identifier="team-b", blueprint="team"),
+    ]
+
+    mock_event = Mock()
+    mock_event.port_app_config.create_missing_related_entities = False
+
+    with patch(
+        "port_ocean.core.handlers.entities_state_applier.port.applier.event",
+        mock_event,
+    ):
+        modified_entities = await applier.upsert(entities, UserAgentType.exporter)
+
+    assert set(upserted[:2]) == {"team-a", "team-b"}
+    assert upserted[2:] == ["service-b"]
+    assert sorted(entity.identifier for entity in modified_entities) == [
+        "service-b",
+        "team-b",
+    ]
+    assert sorted(
+        call.args[0].identifier
+        for call in mock_event.entity_topological_sorter.register_entity.call_args_list
+    ) == ["service-a", "team-a"]
+
+
+@pytest.mark.asyncio
+async def test_get_related_entities_of_unsorted_blueprints() -> None:
+    blueprints = {
+        "service": Blueprint.parse_obj(
+            {
+                "identifier": "service",
+                "schema": {},
+                "relations": {
+                    "owner": {"target": "team", "many": False, "required": False}
+                },
+            }
+        ),
+        "team": Blueprint.parse_obj(
+            {
+                "identifier": "team",
+                "schema": {},
+                "relations": {
+                    "members": {"target": "user", "many": True, "required": False}
+                },
+            }
+        ),
+    }
+    port_client = Mock()
+    port_client.get_blueprint = AsyncMock(
+        side_effect=lambda identifier: blueprints[identifier]
+    )
+
+    related_entities = await get_related_entities(
+        [
+            Entity(
+                identifier="service-a",
+                blueprint="service",
+                relations={"owner": "team-a"},
+            ),
+            Entity(
+                identifier="team-a",
+                blueprint="team",
+                relations={"members": ["user-a", "user-b"]},
+            ),
+            Entity(
+                identifier="service-b",
+                blueprint="service",
+                relations={"owner": "team-a"},
+            ),
+            Entity(identifier="team-b", blueprint="team"),
+        ],
+        port_client,
+    )
+
+    assert port_client.get_blueprint.await_count == 2
+    assert sorted(
+        (entity.blueprint, entity.identifier) for entity in related_entities
+    ) == [("team", "team-a"), ("user", "user-a"), ("user", "user-b")]
@@ -0,0 +1,64 @@
+from typing import Any
+from unittest.mock import Mock
+
+from port_ocean.core.handlers.entity_processor.compiled_mapping_registry import (
+    CompiledMappingRegistry,
+)
+
+
+def test_get_or_compile_compiles_once() -> None:
+    registry = CompiledMappingRegistry()
+    compile_value = Mock(return_value="compiled")
+
+    assert registry.get_or_compile("key", compile_value) == "compiled"
+    assert registry.get_or_compile("key", compile_value) == "compiled"
+
+    compile_value.assert_called_once()
+    assert registry.stats.hits == 1
+    assert registry.stats.misses == 1
+    assert registry.stats.compilations == 1
+    assert registry.stats.compile_time >= 0
+
+
+def test_register_config_evicts_oldest_configs() -> None:
+    registry = CompiledMappingRegistry(max_configs=2)
+    compiled: list[Any] = []
+
+    def compile_value() -> Any:
+        compiled.append(object())
+        return compiled[-1]
+
+    assert registry.register_config("first")
+    first_value = registry.get_or_compile("first-key", compile_value)
+    assert registry.register_config("second")
+    assert not registry.register_config("second")
+    registry.get_or_compile("second-key", compile_value)
+    assert registry.register_config("third")
+
+    assert registry.stats.evictions == 1
+    assert registry.get_or_compile("first-key", compile_value) is not first_value
+    assert len(compiled) == 3
+
+
+def test_values_used_by_current_config_survive_eviction() -> None:
+    registry = CompiledMappingRegistry(max_configs=2)
+    registry.register_config("first")
+    value = registry.get_or_compile("shared-key", object)
+
+    registry.register_config("second")
+    assert registry.get_or_compile("shared-key", object) is value
+    registry.register_config("third")
+
+    assert registry.get_or_compile("shared-key", object) is value
+    assert registry.stats.compilations == 1
+
+
+def test_re_registering_config_keeps_it_from_eviction() -> None:
+    registry = CompiledMappingRegistry(max_configs=2)
+    registry.register_config("first")
+    value = registry.get_or_compile("key", object)
+    registry.register_config("second")
+    registry.register_config("first")
+    registry.register_config("third")
+
+    assert registry.get_or_compile("key", object) is value
@@ -0,0 +1,86 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from port_ocean.core.handlers.entity_processor.fingerprint_cache import (
+    FingerprintCache,
+)
+
+
+def test_fingerprint_depends_on_raw_item_and_mapping_version() -> None:
+    fingerprint = FingerprintCache.fingerprint("v1", {"id": 1})
+
+    assert fingerprint == FingerprintCache.fingerprint("v1", {"id": 1})
+    assert fingerprint != FingerprintCache.fingerprint("v1", {"id": 2})
+    assert fingerprint != FingerprintCache.fingerprint("v2", {"id": 1})
+
+
+def test_fingerprint_of_unserializable_raw_item_is_none() -> None:
+    assert FingerprintCache.fingerprint("v1", {"created": datetime.now()}) is None
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = FingerprintCache(max_size=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_cache_is_persisted_between_instances(tmp_path: Path) -> None:
+    path = str(tmp_path / "fingerprints.json")
+    cache = FingerprintCache(max_size=2, path=path)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.set("c", "3")
+    cache.save()
+
+    loaded_cache = FingerprintCache(max_size=1, path=path)
+    loaded_cache.load()
+
+    assert len(loaded_cache) == 1
+    assert loaded_cache.get("c") == "3"
+
+
+def test_cache_is_saved_from_a_copy_of_its_entries(tmp_path: Path) -> None:
+    path = str(tmp_path / "fingerprints.json")
+    cache = FingerprintCache(max_size=2, path=path)
+    cache.set("a", "1")
+    dump = json.dump
+
+    def dump_while_changing(entries: Any, file: Any) -> None:
+        # The entries change while they are written, as when realtime events use the cache during a save
+        cache.set("b", "2")
+        cache.set("c", "3")
+        dump(entries, file)
+
+    with patch(
+        "port_ocean.core.handlers.entity_processor.fingerprint_cache.json.dump",
+        dump_while_changing,
+    ):
+        cache.save()
+    with open(path) as file:
+        assert json.load(file) == {"entries": [["a", "1"]]}
+
+    # The changes made while saving weren't saved, so the next save writes them
+    cache.save()
+    with open(path) as file:
+        assert json.load(file) == {"entries": [["b", "2"], ["c", "3"]]}
+
+
+def test_corrupted_cache_file_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "fingerprints.json"
+    path.write_text("not json")
+    cache = FingerprintCache(max_size=2, path=str(path))
+
+    cache.load()
+
+    assert len(cache) == 0
@@ -1,3 +1,4 @@
+import json
 from typing import Any
 from unittest.mock import AsyncMock, Mock
 from loguru import logger
@@ -5,9 +6,14 @@ import pytest
 from io import StringIO
 
 from port_ocean.context.ocean import PortOceanContext
+from port_ocean.core.handlers.entity_processor.compiled_mapping_registry import (
+    CompiledMappingRegistry,
+)
 from port_ocean.core.handlers.entity_processor.jq_entity_processor import (
     JQEntityProcessor,
 )
+from port_ocean.core.handlers.port_app_config.models import PortAppConfig
+from port_ocean.core.models import Entity
 from port_ocean.core.ocean_types import CalculationResult
 from port_ocean.exceptions.core import EntityProcessorException
 
@@ -18,6 +24,9 @@ class TestJQEntityProcessor:
     @pytest.fixture
     def mocked_processor(self, monkeypatch: Any) -> JQEntityProcessor:
         mock_context = AsyncMock()
+        mock_context.config.entity_processing_process_pool_size = None
+        mock_context.config.entity_processing_fingerprint_cache_size = None
+        mock_context.config.allow_environment_variables_jq_access = True
         monkeypatch.setattr(PortOceanContext, "app", mock_context)
         return JQEntityProcessor(mock_context)
 
@@ -348,3 +357,558 @@ class TestJQEntityProcessor:
             "{'blueprint': '.bar', 'identifier': '.foo'} (null, missing, or misconfigured)"
             in logs_captured
         )
+
+    async def test_compile_entity_mapping_matches_per_field_search(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        data = {
+            "id": 1,
+            "name": "repo",
+            "labels": {"team": "platform"},
+            "parameters": [{"name": "url", "value": "https://example.com"}],
+        }
+        raw_entity_mappings = {
+            "identifier": ".id | tostring",
+            "title": ".name # trailing comment",
+            "blueprint": '"service"',
+            "properties": {
+                "team": ".labels.team",
+                "url": '.parameters[] | select(.name == "url") | .value',
+                "missing": ".not_there",
+            },
+            "relations": {
+                "owner": {
+                    "combinator": '"and"',
+                    "rules": [
+                        {
+                            "property": '"$identifier"',
+                            "operator": '"="',
+                            "value": ".name",
+                        }
+                    ],
+                }
+            },
+        }
+
+        compiled_mapping = mocked_processor._compile_entity_mapping(
+            "true", json.dumps(raw_entity_mappings), False
+        )
+        result = await mocked_processor._get_mapped_entity(
+            data, raw_entity_mappings, "true"
+        )
+        expected_misconfigurations: dict[str, str] = {}
+        expected = await mocked_processor._search_as_object(
+            data, raw_entity_mappings, expected_misconfigurations
+        )
+
+        assert compiled_mapping is not None
+        assert result.entity == expected
+        assert result.misconfigurations == expected_misconfigurations
+        assert result.misconfigurations == {"missing": ".not_there"}
+
+    async def test_get_mapped_entity_falls_back_when_combined_program_fails(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        data = {"foo": "bar", "baz": "qux"}
+        raw_entity_mappings = {"foo": ".foo", "broken": ".baz.nested"}
+        result = await mocked_processor._get_mapped_entity(
+            data, raw_entity_mappings, "true"
+        )
+        assert result.entity == {"foo": "bar", "broken": None}
+        assert result.misconfigurations == {"broken": ".baz.nested"}
+        assert result.did_entity_pass_selector is True
+
+    async def test_get_mapped_entity_invalid_expression_is_mapped_to_none(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        data = {"foo": "bar"}
+        raw_entity_mappings = {"foo": ".foo", "invalid": ".foo."}
+        result = await mocked_processor._get_mapped_entity(
+            data, raw_entity_mappings, "true"
+        )
+        assert result.entity == {"foo": "bar", "invalid": None}
+        assert result.misconfigurations == {"invalid": ".foo."}
+
+    async def test_get_mapped_entity_selector_not_passed(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        data = {"foo": "bar"}
+        raw_entity_mappings = {"foo": ".foo.nested"}
+        result = await mocked_processor._get_mapped_entity(
+            data, raw_entity_mappings, '.foo == "baz"'
+        )
+        assert result.entity == {}
+        assert result.did_entity_pass_selector is False
+
+        result = await mocked_processor._get_mapped_entity(
+            data, {"foo": ".foo"}, '.foo == "baz"', parse_all=True
+        )
+        assert result.entity == {"foo": "bar"}
+        assert result.did_entity_pass_selector is False
+        assert result.raw_data is None
+
+    async def test_get_mapped_entity_non_boolean_selector(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        with pytest.raises(EntityProcessorException):
+            await mocked_processor._get_mapped_entity(
+                {"foo": "bar"}, {"foo": ".foo"}, ".foo"
+            )
+
+    async def test_parse_items_batch_isolates_failing_items(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".id",
+            "blueprint": '"service"',
+            "properties": {"team": ".labels.team"},
+        }
+        mapping.port.items_to_parse = None
+        mapping.selector.query = ".enabled"
+        raw_results: list[dict[str, Any]] = [
+            {"id": "a", "enabled": True, "labels": {"team": "platform"}},
+            {"id": "b", "enabled": True, "labels": "not-an-object"},
+            {"id": "c", "enabled": "yes", "labels": {}},
+            {"id": "d", "enabled": False, "labels": {}},
+        ]
+        result = await mocked_processor._parse_items(mapping, raw_results)
+
+        passed = result.entity_selector_diff.passed
+        assert [entity.identifier for entity in passed] == ["a", "b"]
+        assert passed[0].properties == {"team": "platform"}
+        assert passed[1].properties == {"team": None}
+        assert len(result.errors) == 1
+        assert isinstance(result.errors[0], EntityProcessorException)
+
+    async def test_parse_items_batch_with_items_to_parse(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".item.name",
+            "blueprint": '"file"',
+            "properties": {"repository": ".repository"},
+        }
+        mapping.port.items_to_parse = ".files"
+        mapping.selector.query = "true"
+        raw_results: list[dict[str, Any]] = [
+            {"repository": "repo-a", "files": [{"name": "a1"}, {"name": "a2"}]},
+            {"repository": "repo-b", "files": "not-a-list"},
+            {"repository": "repo-c", "files": [{"name": "c1"}]},
+        ]
+        result = await mocked_processor._parse_items(mapping, raw_results)
+
+        passed = result.entity_selector_diff.passed
+        assert [
+            (entity.identifier, entity.properties["repository"]) for entity in passed
+        ] == [
+            ("a1", "repo-a"),
+            ("a2", "repo-a"),
+            ("c1", "repo-c"),
+        ]
+        assert not result.errors
+
+    async def test_parse_items_with_items_to_parse_evaluates_raw_item_once(
+        self, mocked_processor: JQEntityProcessor, monkeypatch: Any
+    ) -> None:
+        mapping = Mock()
+        raw_entity_mappings = {
+            "identifier": ".item.name",
+            "blueprint": '"file"',
+            "properties": {
+                "repository": ".repository",
+                "path": '.repository + "/" + .item.name',
+                "size": ".item.size | tostring",
+            },
+        }
+        mapping.port.entity.mappings.dict.return_value = raw_entity_mappings
+        mapping.port.items_to_parse = ".files | map(select(.size > 0))"
+        mapping.selector.query = '.repository != "skipped"'
+        raw_results: list[dict[str, Any]] = [
+            {
+                "repository": "repo-a",
+                "files": [
+                    {"name": "a1", "size": 1},
+                    {"name": "empty", "size": 0},
+                    {"name": "a2", "size": 2.5},
+                ],
+            },
+            {"repository": "skipped", "files": [{"name": "s1", "size": 1}]},
+            {"repository": "repo-c", "files": [{"name": "c1", "size": 3}]},
+        ]
+        expected = [
+            (
+                await mocked_processor._calculate_entity(
+                    data,
+                    raw_entity_mappings,
+                    mapping.port.items_to_parse,
+                    mapping.selector.query,
+                )
+            )[0]
+            for data in raw_results
+        ]
+
+        def fail_per_item_evaluation(*args: Any, **kwargs: Any) -> None:
+            raise AssertionError("Items should be mapped by the items to parse program")
+
+        monkeypatch.setattr(
+            mocked_processor, "_evaluate_item", fail_per_item_evaluation
+        )
+        result = await mocked_processor._parse_items(mapping, raw_results)
+
+        passed = result.entity_selector_diff.passed
+        assert [entity.dict() for entity in passed] == [
+            Entity.parse_obj(mapped_entity.entity).dict()
+            for mapped_entities in expected
+            for mapped_entity in mapped_entities
+            if mapped_entity.did_entity_pass_selector
+        ]
+        assert [entity.properties["path"] for entity in passed] == [
+            "repo-a/a1",
+            "repo-a/a2",
+            "repo-c/c1",
+        ]
+        assert passed[1].properties["size"] == "2.5"
+
+    async def test_parse_items_with_items_to_parse_isolates_failing_items(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".item.name",
+            "blueprint": '"file"',
+            "properties": {"first_label": ".item.labels | keys[0]"},
+        }
+        mapping.port.items_to_parse = ".files"
+        mapping.selector.query = '.item.name | startswith("a")'
+        raw_results: list[dict[str, Any]] = [
+            {
+                "item": "overridden by the raw item",
+                "files": [
+                    {"name": "a1", "labels": {"x": 1}},
+                    {"name": 7},
+                    {"name": "a2", "labels": {"y": 1}},
+                    {"name": "b1"},
+                ],
+            },
+        ]
+        result = await mocked_processor._parse_items(mapping, raw_results)
+
+        # The raw item's own `item` key shadows the expanded item, same as when every item is mapped on its own
+        assert not result.entity_selector_diff.passed
+        assert len(result.errors) == 4
+
+        raw_results[0].pop("item")
+        result = await mocked_processor._parse_items(mapping, raw_results)
+
+        passed = result.entity_selector_diff.passed
+        assert [
+            (entity.identifier, entity.properties["first_label"]) for entity in passed
+        ] == [("a1", "x"), ("a2", "y")]
+        assert len(result.errors) == 1
+
+    async def test_precompile_registers_config_mappings(
+        self, mocked_processor: JQEntityProcessor, monkeypatch: Any
+    ) -> None:
+        registry = CompiledMappingRegistry()
+        monkeypatch.setattr(
+            "port_ocean.core.handlers.entity_processor.jq_entity_processor.compiled_mapping_registry",
+            registry,
+        )
+        port_app_config = PortAppConfig.parse_obj(
+            {
+                "resources": [
+                    {
+                        "kind": "repository",
+                        "selector": {"query": ".archived | not"},
+                        "port": {
+                            "itemsToParse": ".files",
+                            "entity": {
+                                "mappings": {
+                                    "identifier": ".item.name",
+                                    "blueprint": '"file"',
+                                    "properties": {"size": ".item.size * 2"},
+                                }
+                            },
+                        },
+                    }
+                ]
+            }
+        )
+
+        mocked_processor.precompile(port_app_config)
+        compilations = registry.stats.compilations
+        assert compilations == 4
+        mocked_processor.precompile(port_app_config)
+        assert registry.stats.compilations == compilations
+
+        result = await mocked_processor._parse_items(
+            port_app_config.resources[0],
+            [{"archived": False, "files": [{"name": "a", "size": 2}]}],
+        )
+
+        assert [entity.properties for entity in result.entity_selector_diff.passed] == [
+            {"size": 4}
+        ]
+        assert registry.stats.compilations == compilations
+
+    async def test_parse_items_reuses_fingerprint_cache(
+        self, mocked_processor: JQEntityProcessor, monkeypatch: Any, tmp_path: Any
+    ) -> None:
+        cache_path = str(tmp_path / "fingerprints.json")
+        mocked_processor.context.config.entity_processing_fingerprint_cache_size = 10
+        mocked_processor.context.config.entity_processing_fingerprint_cache_path = (
+            cache_path
+        )
+        monkeypatch.setattr(
+            "port_ocean.core.handlers.entity_processor.jq_entity_processor.ocean",
+            mocked_processor.context,
+        )
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".id",
+            "blueprint": '"service"',
+            "properties": {"owners": '.owners | join(",")'},
+        }
+        mapping.port.items_to_parse = None
+        mapping.selector.query = ".enabled"
+        raw_results: list[dict[str, Any]] = [
+            {"id": "a", "enabled": True, "owners": ["x", "y"]},
+            {"id": "b", "enabled": False, "owners": []},
+            {"id": "c", "enabled": "yes", "owners": ["z"]},
+        ]
+        first_result = await mocked_processor._parse_items(mapping, raw_results)
+        assert len(first_result.errors) == 1
+
+        evaluate_batch = mocked_processor._evaluate_batch
+        mapped_batches: list[list[dict[str, Any]]] = []
+
+        async def tracked_evaluate_batch(*args: Any) -> Any:
+            mapped_batches.append(args[2])
+            return await evaluate_batch(*args)
+
+        monkeypatch.setattr(mocked_processor, "_evaluate_batch", tracked_evaluate_batch)
+        raw_results[1]["enabled"] = True
+        second_result = await mocked_processor._parse_items(mapping, raw_results)
+
+        # Only the changed raw item and the one that failed to map are mapped again
+        assert mapped_batches == [raw_results[1:]]
+        assert [
+            (entity.identifier, entity.properties)
+            for entity in second_result.entity_selector_diff.passed
+        ] == [("a", {"owners": "x,y"}), ("b", {"owners": ""})]
+        assert len(second_result.errors) == 1
+
+        mocked_processor.persist_state()
+        restarted_processor = JQEntityProcessor(mocked_processor.context)
+        monkeypatch.setattr(
+            restarted_processor, "_evaluate_batch", tracked_evaluate_batch
+        )
+        mapped_batches.clear()
+        third_result = await restarted_processor._parse_items(mapping, raw_results)
+
+        assert mapped_batches == [raw_results[2:]]
+        assert [
+            entity.identifier for entity in third_result.entity_selector_diff.passed
+        ] == ["a", "b"]
+
+    async def test_parse_items_doesnt_cache_non_deterministic_mappings(
+        self, mocked_processor: JQEntityProcessor, monkeypatch: Any
+    ) -> None:
+        mocked_processor.context.config.entity_processing_fingerprint_cache_size = 10
+        mocked_processor.context.config.entity_processing_fingerprint_cache_path = None
+        monkeypatch.setattr(
+            "port_ocean.core.handlers.entity_processor.jq_entity_processor.ocean",
+            mocked_processor.context,
+        )
+        evaluate_batch = mocked_processor._evaluate_batch
+        mapped_batches: list[list[dict[str, Any]]] = []
+
+        async def tracked_evaluate_batch(*args: Any) -> Any:
+            mapped_batches.append(args[2])
+            return await evaluate_batch(*args)
+
+        monkeypatch.setattr(mocked_processor, "_evaluate_batch", tracked_evaluate_batch)
+        raw_results: list[dict[str, Any]] = [{"id": "a", "env": "prod"}]
+
+        for properties in (
+            {"syncedAt": "now | todate"},
+            {"region": "env.REGION"},
+            {"region": "$ENV.REGION"},
+            {"environment": ".env"},
+        ):
+            mapping = Mock()
+            mapping.port.entity.mappings.dict.return_value = {
+                "identifier": ".id",
+                "blueprint": '"service"',
+                "properties": properties,
+            }
+            mapping.port.items_to_parse = None
+            mapping.selector.query = "true"
+            mapped_batches.clear()
+            await mocked_processor._parse_items(mapping, raw_results)
+            await mocked_processor._parse_items(mapping, raw_results)
+
+            # Only the mapping of the `env` field of the item is reused from the cache
+            assert len(mapped_batches) == (
+                1 if properties == {"environment": ".env"} else 2
+            )
+
+        # Without access to the environment variables, `env` is an empty object and its mapping is cached
+        mocked_processor.context.config.allow_environment_variables_jq_access = False
+        mapping.port.entity.mappings.dict.return_value["properties"] = {
+            "region": "env.REGION"
+        }
+        mapped_batches.clear()
+        await mocked_processor._parse_items(mapping, raw_results)
+        await mocked_processor._parse_items(mapping, raw_results)
+        assert len(mapped_batches) == 1
+
+    async def test_parse_items_sends_examples_of_cached_items_to_parse(
+        self, mocked_processor: JQEntityProcessor, monkeypatch: Any
+    ) -> None:
+        mocked_processor.context.config.entity_processing_fingerprint_cache_size = 10
+        mocked_processor.context.config.entity_processing_fingerprint_cache_path = None
+        monkeypatch.setattr(
+            "port_ocean.core.handlers.entity_processor.jq_entity_processor.ocean",
+            mocked_processor.context,
+        )
+        sent_examples: list[list[dict[str, Any]]] = []
+
+        async def send_examples(data: list[dict[str, Any]], kind: str) -> None:
+            sent_examples.append(data)
+
+        monkeypatch.setattr(mocked_processor, "_send_examples", send_examples)
+        mapping = Mock()
+        mapping.kind = "file"
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".item.name",
+            "blueprint": '"file"',
+        }
+        mapping.port.items_to_parse = ".files"
+        mapping.selector.query = "true"
+        raw_results: list[dict[str, Any]] = [
+            {"repo": "a", "files": [{"name": "a1"}, {"name": "a2"}]},
+            {"repo": "b", "files": [{"name": "b1"}]},
+        ]
+
+        for _ in range(2):
+            await mocked_processor._parse_items(
+                mapping, raw_results, send_raw_data_examples_amount=2
+            )
+
+        # The second parse reused the cache, and still sends the expanded items as examples
+        assert sent_examples[0] == sent_examples[1]
+        assert sent_examples[0] == [
+            {"item": {"name": "a1"}, **raw_results[0]},
+            {"item": {"name": "a2"}, **raw_results[0]},
+        ]
+        assert mocked_processor._fingerprint_cache is not None
+        assert mocked_processor._fingerprint_cache.hits == 2
+
+    @pytest.mark.timeout(60)
+    async def test_parse_items_in_process_pool(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".id | tostring",
+            "blueprint": '"service"',
+            "properties": {"name": ".name", "team": ".labels.team"},
+        }
+        mapping.port.items_to_parse = None
+        mapping.selector.query = ".id % 3 != 0"
+        raw_results: list[dict[str, Any]] = [
+            {"id": index, "name": f"service-{index}", "labels": {"team": "platform"}}
+            for index in range(120)
+        ]
+        raw_results[5]["labels"] = "not-an-object"
+
+        thread_pool_result = await mocked_processor._parse_items(mapping, raw_results)
+
+        mocked_processor.context.config.allow_environment_variables_jq_access = True
+        mocked_processor.context.config.entity_processing_process_pool_size = 2
+        try:
+            process_pool_result = await mocked_processor._parse_items(
+                mapping, raw_results
+            )
+        finally:
+            mocked_processor.shutdown_process_pool()
+
+        assert len(process_pool_result.entity_selector_diff.passed) == 80
+        assert (
+            process_pool_result.entity_selector_diff
+            == thread_pool_result.entity_selector_diff
+        )
+        assert (
+            process_pool_result.misonfigured_entity_keys
+            == thread_pool_result.misonfigured_entity_keys
+            == {"team": ".labels.team"}
+        )
+
+    async def test_parse_items_with_simple_expressions_only_skips_jq(
+        self, mocked_processor: JQEntityProcessor, monkeypatch: Any
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".id | tostring",
+            "title": ".name",
+            "blueprint": '"service"',
+            "properties": {"team": ".metadata.labels.team", "score": ".score"},
+        }
+        mapping.port.items_to_parse = None
+        mapping.selector.query = "true"
+        raw_results: list[dict[str, Any]] = [
+            {"id": 1, "name": "a", "metadata": {"labels": {"team": "platform"}}},
+            {"id": 2, "name": "b", "metadata": "not-an-object", "score": 1.5},
+        ]
+
+        compiled_mapping = mocked_processor._compile_entity_mapping(
+            "true", json.dumps(mapping.port.entity.mappings.dict.return_value), False
+        )
+        assert compiled_mapping is not None
+        assert compiled_mapping.program is None
+
+        result = await mocked_processor._parse_items(mapping, raw_results)
+
+        passed = result.entity_selector_diff.passed
+        assert [entity.identifier for entity in passed] == ["1", "2"]
+        assert passed[0].properties == {"team": "platform", "score": None}
+        assert passed[1].properties == {"team": None, "score": 1.5}
+        assert passed[1].title == "b"
+
+    async def test_parse_items_mixes_simple_and_jq_expressions(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".id",
+            "blueprint": '"service"',
+            "properties": {
+                "languages": ".languages | keys",
+                "name": ".name",
+                "first_language": ".languages | to_entries[0].key",
+            },
+        }
+        mapping.port.items_to_parse = None
+        mapping.selector.query = ".archived | not"
+        raw_results: list[dict[str, Any]] = [
+            {"id": "a", "name": "A", "archived": False, "languages": {"go": 1}},
+            {"id": "b", "name": "B", "archived": True, "languages": {}},
+            {"id": "c", "name": "C", "archived": False, "languages": "broken"},
+        ]
+        result = await mocked_processor._parse_items(mapping, raw_results)
+
+        passed = result.entity_selector_diff.passed
+        assert [entity.identifier for entity in passed] == ["a", "c"]
+        assert passed[0].properties == {
+            "languages": ["go"],
+            "name": "A",
+            "first_language": "go",
+        }
+        assert passed[1].properties == {
+            "languages": None,
+            "name": "C",
+            "first_language": None,
+        }
@@ -0,0 +1,88 @@
+from typing import Any
+
+import jq  # type: ignore
+import pytest
+
+from port_ocean.core.handlers.entity_processor.simple_jq_expression import (
+    RequiresJQ,
+    SimpleJQExpression,
+    parse_simple_expression,
+)
+
+DATA: list[dict[str, Any]] = [
+    {"name": "repo", "id": 7, "metadata": {"labels": {"team": "platform"}}},
+    {"name": None, "id": "7", "metadata": "not-an-object"},
+    {"id": True, "metadata": None, "score": 1.5},
+    {"id": -3, "metadata": {"labels": ["a"]}, "dashed-key": {"x": 1}},
+]
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        (".name", SimpleJQExpression(path=("name",))),
+        (
+            ".metadata.labels.team",
+            SimpleJQExpression(path=("metadata", "labels", "team")),
+        ),
+        ('."dashed-key".x', SimpleJQExpression(path=("dashed-key", "x"))),
+        (".", SimpleJQExpression(path=())),
+        (".id | tostring", SimpleJQExpression(path=("id",), to_string=True)),
+        (".id|tostring", SimpleJQExpression(path=("id",), to_string=True)),
+        ('"service"', SimpleJQExpression(literal="service")),
+        ("true", SimpleJQExpression(literal=True)),
+        ("null", SimpleJQExpression(literal=None)),
+        ("-42", SimpleJQExpression(literal=-42)),
+        ('.name // "default"', None),
+        (".items[]", None),
+        (".[0]", None),
+        (".name?", None),
+        ('"escaped \\" quote"', None),
+        ('"interpolated \\(.name)"', None),
+        ("1.5", None),
+        (".name # comment", None),
+        (None, None),
+    ],
+)
+def test_parse_simple_expression(
+    pattern: str | None, expected: SimpleJQExpression | None
+) -> None:
+    assert parse_simple_expression(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        ".name",
+        ".metadata.labels.team",
+        ".metadata.labels",
+        '."dashed-key".x',
+        ".missing.deep",
+        ".",
+        ".id | tostring",
+        ".name | tostring",
+        ".metadata | tostring",
+        ".score | tostring",
+        '"service"',
+        "false",
+        "42",
+    ],
+)
+@pytest.mark.parametrize("data", DATA)
+def test_simple_expression_matches_jq(pattern: str, data: dict[str, Any]) -> None:
+    simple_expression = parse_simple_expression(pattern)
+    assert simple_expression is not None
+
+    try:
+        expected = jq.compile(pattern).input_value(data).first()
+    except ValueError:
+        with pytest.raises(RequiresJQ):
+            simple_expression.evaluate(data)
+        return
+
+    try:
+        result = simple_expression.evaluate(data)
+    except RequiresJQ:
+        return
+    assert result == expected
+    assert type(result) is type(expected)
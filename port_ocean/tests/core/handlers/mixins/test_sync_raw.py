@@ -1,13 +1,23 @@
+import asyncio
+import contextvars
+import time
+from pathlib import Path
 from contextlib import asynccontextmanager
 from graphlib import CycleError
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator, Callable
 
 from httpx import Response
 from port_ocean.clients.port.client import PortClient
 from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
+from port_ocean.core.utils.entity_identity_store import EntityIdentityStore
+from port_ocean.core.utils.port_state_snapshot import PortStateSnapshot
+from port_ocean.core.utils.resync_checkpoint import ResyncCheckpointStore
+from port_ocean.core.utils.resync_watermarks import ResyncWatermarkStore
+from port_ocean.core.utils.synced_state_store import SyncedStateStore
 from port_ocean.exceptions.core import OceanAbortException
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
+from port_ocean.config.settings import IntegrationConfiguration
 from port_ocean.ocean import Ocean
 from port_ocean.context.ocean import PortOceanContext
 from port_ocean.core.handlers.port_app_config.models import (
@@ -19,14 +29,17 @@ from port_ocean.core.handlers.port_app_config.models import (
     Selector,
 )
 from port_ocean.core.integrations.mixins import SyncRawMixin
+from port_ocean.core.integrations.mixins.utils import resync_generator_wrapper
 from port_ocean.core.handlers.entities_state_applier.port.applier import (
     HttpEntitiesStateApplier,
 )
 from port_ocean.core.handlers.entity_processor.jq_entity_processor import (
     JQEntityProcessor,
 )
-from port_ocean.core.models import Entity
+from port_ocean.core.models import Blueprint, Entity
 from port_ocean.context.event import EventContext, event_context, EventType
+from port_ocean.context.event import event as current_event
+from port_ocean.context.resource import resource_context
 from port_ocean.clients.port.types import UserAgentType
 from port_ocean.context.ocean import ocean
 from dataclasses import dataclass
@@ -89,6 +102,26 @@ def mock_ocean(mock_port_client: PortClient) -> Ocean:
         ocean_mock.config = MagicMock()
         ocean_mock.config.port = MagicMock()
         ocean_mock.config.port.port_app_config_cache_ttl = 60
+        ocean_mock.config.entity_processing_process_pool_size = None
+        ocean_mock.config.entity_processing_fingerprint_cache_size = None
+        ocean_mock.config.resync_kinds_concurrency = 1
+        ocean_mock.config.resync_pipeline_prefetch = 0
+        ocean_mock.config.resync_generators_concurrency = 1
+        ocean_mock.config.resync_batch_size = None
+        ocean_mock.config.resync_batch_max_bytes = None
+        ocean_mock.config.resync_batch_flush_timeout = None
+        ocean_mock.config.resync_identity_store_spill_threshold = None
+        ocean_mock.config.resync_port_state_page_size = None
+        ocean_mock.config.resync_port_state_prefetch = False
+        ocean_mock.config.resync_port_state_snapshot_directory = None
+        ocean_mock.config.resync_synced_state_path = None
+        ocean_mock.config.scheduled_resync_interval = None
+        ocean_mock.config.scheduled_delta_resync_interval = None
+        ocean_mock.config.resync_watermark_path = None
+        ocean_mock.config.resync_checkpoint_path = None
+        ocean_mock.config.realtime_batch_window = None
+        ocean_mock.config.realtime_batch_max_items = 100
+        ocean_mock.config.resync_share_kind_fetches = False
         ocean_mock.port_client = mock_port_client
 
         return ocean_mock
@@ -226,8 +259,8 @@ async def test_sync_raw_mixin_self_dependency(
 
     mock_sync_raw_mixin.entity_processor.parse_items = AsyncMock(return_value=calc_result_mock)  # type: ignore
 
-    mock_order_by_entities_dependencies = MagicMock(
-        side_effect=EntityTopologicalSorter.order_by_entities_dependencies
+    mock_group_by_entities_dependencies = MagicMock(
+        side_effect=EntityTopologicalSorter.group_by_entities_dependencies
     )
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
         app_config = (
@@ -237,15 +270,15 @@ async def test_sync_raw_mixin_self_dependency(
         )
         event.port_app_config = app_config
         event.entity_topological_sorter.register_entity = MagicMock(side_effect=event.entity_topological_sorter.register_entity)  # type: ignore
-        event.entity_topological_sorter.get_entities = MagicMock(side_effect=event.entity_topological_sorter.get_entities)  # type: ignore
+        event.entity_topological_sorter.get_entities_levels = MagicMock(side_effect=event.entity_topological_sorter.get_entities_levels)  # type: ignore
 
         with patch(
             "port_ocean.core.integrations.mixins.sync_raw.event_context",
             lambda *args, **kwargs: no_op_event_context(event),
         ):
             with patch(
-                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies",
-                mock_order_by_entities_dependencies,
+                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.group_by_entities_dependencies",
+                mock_group_by_entities_dependencies,
             ):
 
                 await mock_sync_raw_mixin.sync_raw_all(
@@ -256,12 +289,14 @@ async def test_sync_raw_mixin_self_dependency(
                     len(event.entity_topological_sorter.entities) == 1
                 ), "Expected one failed entity callback due to retry logic"
                 assert event.entity_topological_sorter.register_entity.call_count == 1
-                assert event.entity_topological_sorter.get_entities.call_count == 1
+                assert (
+                    event.entity_topological_sorter.get_entities_levels.call_count == 1
+                )
 
-                assert mock_order_by_entities_dependencies.call_count == 1
+                assert mock_group_by_entities_dependencies.call_count == 1
                 assert [
                     call[0][0][0]
-                    for call in mock_order_by_entities_dependencies.call_args_list
+                    for call in mock_group_by_entities_dependencies.call_args_list
                 ] == [entity for entity in entities if entity.identifier == "entity_1"]
 
 
@@ -281,8 +316,8 @@ async def test_sync_raw_mixin_circular_dependency(
 
     mock_sync_raw_mixin.entity_processor.parse_items = AsyncMock(return_value=calc_result_mock)  # type: ignore
 
-    mock_order_by_entities_dependencies = MagicMock(
-        side_effect=EntityTopologicalSorter.order_by_entities_dependencies
+    mock_group_by_entities_dependencies = MagicMock(
+        side_effect=EntityTopologicalSorter.group_by_entities_dependencies
     )
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
         app_config = (
@@ -300,24 +335,25 @@ async def test_sync_raw_mixin_circular_dependency(
 
         event.entity_topological_sorter.register_entity = MagicMock(side_effect=mock_register_entity)  # type: ignore
         raiesed_error_handle_failed = []
-        org_get_entities = event.entity_topological_sorter.get_entities
+        org_get_entities_levels = event.entity_topological_sorter.get_entities_levels
 
         def handle_failed_wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
-                return list(org_get_entities(*args, **kwargs))
+                return org_get_entities_levels(*args, **kwargs)
             except Exception as e:
                 raiesed_error_handle_failed.append(e)
                 raise e
 
-        event.entity_topological_sorter.get_entities = MagicMock(side_effect=lambda *args, **kwargs: handle_failed_wrapper(*args, **kwargs))  # type: ignore
+        event.entity_topological_sorter.get_entities_levels = MagicMock(side_effect=lambda *args, **kwargs: handle_failed_wrapper(*args, **kwargs))  # type: ignore
+        event.entity_topological_sorter.get_entities = MagicMock(side_effect=event.entity_topological_sorter.get_entities)  # type: ignore
 
         with patch(
             "port_ocean.core.integrations.mixins.sync_raw.event_context",
             lambda *args, **kwargs: no_op_event_context(event),
         ):
             with patch(
-                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies",
-                mock_order_by_entities_dependencies,
+                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.group_by_entities_dependencies",
+                mock_group_by_entities_dependencies,
             ):
 
                 await mock_sync_raw_mixin.sync_raw_all(
@@ -328,11 +364,13 @@ async def test_sync_raw_mixin_circular_dependency(
                     len(event.entity_topological_sorter.entities) == 2
                 ), "Expected one failed entity callback due to retry logic"
                 assert event.entity_topological_sorter.register_entity.call_count == 2
-                assert event.entity_topological_sorter.get_entities.call_count == 2
+                assert (
+                    event.entity_topological_sorter.get_entities_levels.call_count == 1
+                )
                 assert [
                     call[0]
                     for call in event.entity_topological_sorter.get_entities.call_args_list
-                ] == [(), (False,)]
+                ] == [(False,)]
                 assert len(raiesed_error_handle_failed) == 1
                 assert isinstance(raiesed_error_handle_failed[0], OceanAbortException)
                 assert isinstance(raiesed_error_handle_failed[0].__cause__, CycleError)
@@ -362,8 +400,8 @@ async def test_sync_raw_mixin_dependency(
 
     mock_sync_raw_mixin.entity_processor.parse_items = AsyncMock(return_value=calc_result_mock)  # type: ignore
 
-    mock_order_by_entities_dependencies = MagicMock(
-        side_effect=EntityTopologicalSorter.order_by_entities_dependencies
+    mock_group_by_entities_dependencies = MagicMock(
+        side_effect=EntityTopologicalSorter.group_by_entities_dependencies
     )
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
         app_config = (
@@ -381,24 +419,26 @@ async def test_sync_raw_mixin_dependency(
 
         event.entity_topological_sorter.register_entity = MagicMock(side_effect=mock_register_entity)  # type: ignore
         raiesed_error_handle_failed = []
-        org_event_get_entities = event.entity_topological_sorter.get_entities
+        org_event_get_entities_levels = (
+            event.entity_topological_sorter.get_entities_levels
+        )
 
-        def get_entities_wrapper(*args: Any, **kwargs: Any) -> Any:
+        def get_entities_levels_wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
-                return org_event_get_entities(*args, **kwargs)
+                return org_event_get_entities_levels(*args, **kwargs)
             except Exception as e:
                 raiesed_error_handle_failed.append(e)
                 raise e
 
-        event.entity_topological_sorter.get_entities = MagicMock(side_effect=lambda *args, **kwargs: get_entities_wrapper(*args, **kwargs))  # type: ignore
+        event.entity_topological_sorter.get_entities_levels = MagicMock(side_effect=lambda *args, **kwargs: get_entities_levels_wrapper(*args, **kwargs))  # type: ignore
 
         with patch(
             "port_ocean.core.integrations.mixins.sync_raw.event_context",
             lambda *args, **kwargs: no_op_event_context(event),
         ):
             with patch(
-                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies",
-                mock_order_by_entities_dependencies,
+                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.group_by_entities_dependencies",
+                mock_group_by_entities_dependencies,
             ):
 
                 await mock_sync_raw_mixin.sync_raw_all(
@@ -409,17 +449,20 @@ async def test_sync_raw_mixin_dependency(
                 assert (
                     len(event.entity_topological_sorter.entities) == 5
                 ), "Expected one failed entity callback due to retry logic"
-                assert event.entity_topological_sorter.get_entities.call_count == 1
+                assert (
+                    event.entity_topological_sorter.get_entities_levels.call_count == 1
+                )
                 assert len(raiesed_error_handle_failed) == 0
-                assert mock_ocean.port_client.client.post.call_count == 10  # type: ignore
-                assert mock_order_by_entities_dependencies.call_count == 1
+                # The entities depending on entity_3 are deferred without upserting them, as entity_3 failed
+                assert mock_ocean.port_client.client.post.call_count == 6  # type: ignore
+                assert mock_group_by_entities_dependencies.call_count == 1
 
-                first = mock_ocean.port_client.client.post.call_args_list[0:5]  # type: ignore
-                second = mock_ocean.port_client.client.post.call_args_list[5:10]  # type: ignore
+                first = mock_ocean.port_client.client.post.call_args_list[0:1]  # type: ignore
+                second = mock_ocean.port_client.client.post.call_args_list[1:6]  # type: ignore
 
-                assert "-".join(
-                    [call[1].get("json").get("identifier") for call in first]
-                ) == "-".join([entity.identifier for entity in entities])
+                assert [call[1].get("json").get("identifier") for call in first] == [
+                    "entity_3"
+                ]
                 assert "-".join(
                     [call[1].get("json").get("identifier") for call in second]
                 ) in (
@@ -799,3 +842,1096 @@ async def test_register_resource_raw_skip_event_type_http_request_upsert_called_
         mock_sync_raw_mixin._calculate_raw.assert_called_once()
         mock_sync_raw_mixin._map_entities_compared_with_port.assert_not_called()
         mock_sync_raw_mixin.entities_state_applier.upsert.assert_called_once()
+
+
+def create_resource_config(
+    kind: str, blueprint: str, relations: dict[str, Any] | None = None
+) -> ResourceConfig:
+    return ResourceConfig(
+        kind=kind,
+        selector=Selector(query="true"),
+        port=PortResourceConfig(
+            entity=MappingsConfig(
+                mappings=EntityMapping(
+                    identifier=".id",
+                    blueprint=blueprint,
+                    relations=relations or {},
+                )
+            )
+        ),
+    )
+
+
+def mock_blueprints(
+    mock_port_client: PortClient, relations: dict[str, dict[str, str]]
+) -> None:
+    async def get_blueprint(identifier: str, should_log: bool = True) -> Blueprint:
+        return Blueprint.parse_obj(
+            {
+                "identifier": identifier,
+                "schema": {},
+                "relations": {
+                    name: {"target": target, "many": False, "required": False}
+                    for name, target in relations.get(identifier, {}).items()
+                },
+            }
+        )
+
+    mock_port_client.get_blueprint = AsyncMock(side_effect=get_blueprint)  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_get_resources_dependencies_orders_by_relations_and_config(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_client: PortClient,
+    mock_context: PortOceanContext,
+) -> None:
+    mock_blueprints(
+        mock_port_client,
+        {"repository": {"owner": "team", "unmapped": "user"}, "team": {}},
+    )
+    resources = [
+        create_resource_config("repository", '"repository"', {"owner": ".team"}),
+        create_resource_config("team", '"team"'),
+        create_resource_config("user", '"user"'),
+        create_resource_config("repository", '"repository"', {"owner": ".team"}),
+        create_resource_config("dynamic", ".type", {"owner": ".team"}),
+        # Mapped to another blueprint than the earlier resources of its kind, so it doesn't wait for them
+        create_resource_config("repository", '"service"'),
+        create_resource_config("dynamic", '"user"'),
+    ]
+
+    dependencies = await mock_sync_raw_mixin._get_resources_dependencies(resources)
+
+    assert dependencies == [{1}, set(), set(), {0, 1}, set(), set(), {2, 4}]
+
+
+@pytest.mark.asyncio
+async def test_get_resources_dependencies_ignores_relation_cycles(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_client: PortClient,
+    mock_context: PortOceanContext,
+) -> None:
+    mock_blueprints(
+        mock_port_client,
+        {"repository": {"owner": "team"}, "team": {"repositories": "repository"}},
+    )
+    resources = [
+        create_resource_config("repository", '"repository"', {"owner": ".team"}),
+        create_resource_config("team", '"team"', {"repositories": ".repos"}),
+        create_resource_config("team", '"team"'),
+    ]
+
+    dependencies = await mock_sync_raw_mixin._get_resources_dependencies(resources)
+
+    assert dependencies == [set(), set(), {1}]
+
+
+@pytest.mark.asyncio
+async def test_register_resources_concurrently_respects_dependencies_and_budget(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_client: PortClient,
+    mock_context: PortOceanContext,
+) -> None:
+    mock_blueprints(mock_port_client, {"repository": {"owner": "team"}})
+    resources = [
+        create_resource_config("repository", '"repository"', {"owner": ".team"}),
+        create_resource_config("team", '"team"'),
+        create_resource_config("user", '"user"'),
+        create_resource_config("group", '"group"'),
+    ]
+    events: list[tuple[str, str]] = []
+    running = 0
+    max_running = 0
+
+    async def register_in_batches(
+        resource: ResourceConfig,
+        user_agent_type: UserAgentType,
+        registered_entities: EntityIdentityStore | None = None,
+    ) -> tuple[list[Entity], list[Exception]]:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        events.append(("start", resource.kind))
+        await asyncio.sleep(0.01)
+        events.append(("end", resource.kind))
+        running -= 1
+        return [Entity(identifier=resource.kind, blueprint=resource.kind)], []
+
+    mock_sync_raw_mixin._register_in_batches = register_in_batches  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        results = await mock_sync_raw_mixin._register_resources_concurrently(
+            resources, UserAgentType.exporter, 2
+        )
+
+    assert [entities[0].identifier for entities, _ in results] == [
+        "repository",
+        "team",
+        "user",
+        "group",
+    ]
+    assert max_running == 2
+    assert events.index(("end", "team")) < events.index(("start", "repository"))
+
+
+@pytest.mark.asyncio
+async def test_register_resources_concurrently_cancels_on_abort(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_client: PortClient,
+    mock_context: PortOceanContext,
+) -> None:
+    mock_blueprints(mock_port_client, {})
+    resources = [
+        create_resource_config("team", '"team"'),
+        create_resource_config("user", '"user"'),
+    ]
+
+    async def register_in_batches(
+        resource: ResourceConfig,
+        user_agent_type: UserAgentType,
+        registered_entities: EntityIdentityStore | None = None,
+    ) -> tuple[list[Entity], list[Exception]]:
+        if resource.kind == "team":
+            event.abort()
+        await asyncio.sleep(10)
+        return [], []
+
+    mock_sync_raw_mixin._register_in_batches = register_in_batches  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        with pytest.raises(asyncio.CancelledError):
+            await mock_sync_raw_mixin._register_resources_concurrently(
+                resources, UserAgentType.exporter, 2
+            )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [0, 2])
+async def test_register_in_batches_pipelines_generator_batches(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+    prefetch: int,
+) -> None:
+    mock_ocean.config.resync_pipeline_prefetch = prefetch
+    mock_ocean.config.send_raw_data_examples = False
+
+    async def services(kind: str) -> AsyncGenerator[list[dict[str, Any]], None]:
+        for page in range(3):
+            await asyncio.sleep(0.01)
+            yield [{"id": f"service-{page}-{index}"} for index in range(2)]
+
+    async def failing_services(
+        kind: str,
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        yield [{"id": "service-from-failing-generator"}]
+        raise Exception("Failed to fetch the next page")
+
+    mock_sync_raw_mixin_with_jq_processor._get_resource_raw_results = AsyncMock(  # type: ignore
+        return_value=(
+            [
+                {"id": "service-raw"},
+                resync_generator_wrapper(services, "service"),
+                resync_generator_wrapper(failing_services, "service"),
+            ],
+            [],
+        )
+    )
+    upserted_batches: list[list[str]] = []
+
+    async def upsert(
+        entities: list[Entity], user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        upserted_batches.append([entity.identifier for entity in entities])
+        return entities
+
+    mock_sync_raw_mixin_with_jq_processor._map_entities_compared_with_port = AsyncMock(  # type: ignore
+        side_effect=lambda entities, *_: entities
+    )
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = upsert  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        entities, errors = (
+            await mock_sync_raw_mixin_with_jq_processor._register_in_batches(
+                mock_resource_config, UserAgentType.exporter
+            )
+        )
+
+    assert upserted_batches == [
+        ["service-raw"],
+        ["service-0-0", "service-0-1"],
+        ["service-1-0", "service-1-1"],
+        ["service-2-0", "service-2-1"],
+        ["service-from-failing-generator"],
+    ]
+    assert len(entities) == 8
+    assert len(errors) == 1
+    assert isinstance(errors[0], ExceptionGroup)
+    assert errors[0].subgroup(OceanAbortException) is not None
+
+
+@pytest.mark.asyncio
+async def test_register_in_batches_consumes_generators_concurrently(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.config.resync_generators_concurrency = 2
+    mock_ocean.config.send_raw_data_examples = False
+    running = 0
+    max_running = 0
+
+    def create_generator(
+        name: str, pages: int, fail: bool = False
+    ) -> Callable[[str], AsyncGenerator[list[dict[str, Any]], None]]:
+        async def generator(kind: str) -> AsyncGenerator[list[dict[str, Any]], None]:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            try:
+                for page in range(pages):
+                    await asyncio.sleep(0.01)
+                    yield [{"id": f"{name}-{page}"}]
+                if fail:
+                    raise Exception(f"Failed to fetch {name}")
+            finally:
+                running -= 1
+
+        return generator
+
+    mock_sync_raw_mixin_with_jq_processor._get_resource_raw_results = AsyncMock(  # type: ignore
+        return_value=(
+            [
+                resync_generator_wrapper(create_generator(name, pages, fail), "service")
+                for name, pages, fail in [
+                    ("first", 3, False),
+                    ("failing", 1, True),
+                    ("third", 2, False),
+                ]
+            ],
+            [],
+        )
+    )
+    mock_sync_raw_mixin_with_jq_processor._map_entities_compared_with_port = AsyncMock(  # type: ignore
+        side_effect=lambda entities, *_: entities
+    )
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = AsyncMock(  # type: ignore
+        side_effect=lambda entities, *_: entities
+    )
+
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        entities, errors = (
+            await mock_sync_raw_mixin_with_jq_processor._register_in_batches(
+                mock_resource_config, UserAgentType.exporter
+            )
+        )
+
+    identifiers = [entity.identifier for entity in entities]
+    assert sorted(identifiers) == [
+        "failing-0",
+        "first-0",
+        "first-1",
+        "first-2",
+        "third-0",
+        "third-1",
+    ]
+    # The generators were consumed together rather than one after the other
+    assert identifiers.index("failing-0") < identifiers.index("first-2")
+    assert max_running == 2
+    assert len(errors) == 1
+
+
+@pytest.mark.asyncio
+async def test_register_in_batches_rebatches_generator_batches(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.config.resync_batch_size = 3
+    mock_ocean.config.send_raw_data_examples = False
+
+    async def services(kind: str) -> AsyncGenerator[list[dict[str, Any]], None]:
+        yield [{"id": "service-0"}]
+        yield [{"id": f"service-{index}"} for index in range(1, 8)]
+
+    mock_sync_raw_mixin_with_jq_processor._get_resource_raw_results = AsyncMock(  # type: ignore
+        return_value=([resync_generator_wrapper(services, "service")], [])
+    )
+    upserted_batches: list[list[str]] = []
+
+    async def upsert(
+        entities: list[Entity], user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        upserted_batches.append([entity.identifier for entity in entities])
+        return entities
+
+    mock_sync_raw_mixin_with_jq_processor._map_entities_compared_with_port = AsyncMock(  # type: ignore
+        side_effect=lambda entities, *_: entities
+    )
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = upsert  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        entities, errors = (
+            await mock_sync_raw_mixin_with_jq_processor._register_in_batches(
+                mock_resource_config, UserAgentType.exporter
+            )
+        )
+
+    assert upserted_batches == [
+        ["service-0", "service-1", "service-2"],
+        ["service-3", "service-4", "service-5"],
+        ["service-6", "service-7"],
+    ]
+    assert len(entities) == 8
+    assert errors == []
+
+
+@pytest.mark.asyncio
+async def test_register_in_batches_records_identities_in_store(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.config.send_raw_data_examples = False
+
+    async def services(kind: str) -> AsyncGenerator[list[dict[str, Any]], None]:
+        for page in range(2):
+            yield [{"id": f"service-{page}-{index}"} for index in range(2)]
+
+    mock_sync_raw_mixin_with_jq_processor._get_resource_raw_results = AsyncMock(  # type: ignore
+        return_value=([resync_generator_wrapper(services, "service")], [])
+    )
+    mock_sync_raw_mixin_with_jq_processor._map_entities_compared_with_port = AsyncMock(  # type: ignore
+        side_effect=lambda entities, *_: entities
+    )
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = AsyncMock(  # type: ignore
+        side_effect=lambda entities, *_: entities
+    )
+    registered_entities = EntityIdentityStore()
+
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        entities, errors = (
+            await mock_sync_raw_mixin_with_jq_processor._register_in_batches(
+                mock_resource_config, UserAgentType.exporter, registered_entities
+            )
+        )
+
+    assert entities == []
+    assert errors == []
+    assert len(registered_entities) == 4
+    assert Entity(identifier="service-1-1", blueprint="service") in registered_entities
+
+
+@pytest.mark.asyncio
+async def test_prefetch_port_state_fetches_mapped_parameters_per_blueprint(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_ocean: Ocean,
+) -> None:
+    resources = [
+        create_resource_config("repository", '"repository"', {"owner": ".team"}),
+        create_resource_config("pull-request", '"repository"'),
+        create_resource_config("team", '"team"'),
+        # Dynamic blueprints can't be prefetched
+        create_resource_config("user", ".blueprint"),
+    ]
+    searches: list[tuple[str, list[str]]] = []
+
+    async def search_blueprint_entities_in_pages(
+        blueprint: str,
+        user_agent_type: UserAgentType,
+        parameters_to_include: list[str],
+        page_size: int,
+    ) -> AsyncGenerator[list[Entity], None]:
+        searches.append((blueprint, parameters_to_include))
+        yield [Entity(identifier=f"{blueprint}-1", blueprint=blueprint)]
+        if blueprint == "team":
+            raise Exception("Failed to fetch the next page")
+
+    mock_ocean.port_client.search_blueprint_entities_in_pages = search_blueprint_entities_in_pages  # type: ignore
+
+    port_state_snapshot = await mock_sync_raw_mixin._prefetch_port_state(
+        resources, UserAgentType.exporter
+    )
+
+    assert sorted(searches) == [
+        ("repository", ["blueprint", "identifier", "relations.owner"]),
+        ("team", ["blueprint", "identifier"]),
+    ]
+    assert port_state_snapshot.is_complete(
+        [Entity(identifier="repository-2", blueprint="repository")]
+    )
+    # A blueprint that failed to be prefetched is compared by searching Port
+    assert not port_state_snapshot.is_complete(
+        [Entity(identifier="team-1", blueprint="team")]
+    )
+
+
+@pytest.mark.asyncio
+async def test_map_entities_compared_with_port_uses_port_state_snapshot(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_ocean: Ocean,
+    mock_resource_config: ResourceConfig,
+) -> None:
+    port_state_snapshot = PortStateSnapshot()
+    port_state_snapshot.add_many(
+        [
+            Entity(
+                identifier="entity_1",
+                blueprint="service",
+                title="Service",
+                properties={"url": "https://service", "language": "python"},
+            ),
+            Entity(
+                identifier="entity_2",
+                blueprint="service",
+                title="Service",
+                properties={"url": "https://old-service"},
+            ),
+        ]
+    )
+    port_state_snapshot.complete_blueprint("service")
+    entities = [
+        Entity(
+            identifier=identifier,
+            blueprint="service",
+            title="Service",
+            properties={"url": "https://service"},
+        )
+        for identifier in ["entity_1", "entity_2", "entity_3"]
+    ]
+
+    changed_entities = await mock_sync_raw_mixin._map_entities_compared_with_port(
+        entities, mock_resource_config, UserAgentType.exporter, port_state_snapshot
+    )
+
+    # Only the mapped properties are compared, and Port wasn't searched
+    assert [entity.identifier for entity in changed_entities] == [
+        "entity_2",
+        "entity_3",
+    ]
+    mock_ocean.port_client.search_entities.assert_not_called()  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_register_in_batches_skips_entities_unchanged_since_synced(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+    tmp_path: Path,
+) -> None:
+    mock_ocean.config.send_raw_data_examples = False
+    mock_ocean.port_client.search_entities.return_value = [  # type: ignore
+        Entity(identifier="service-1", blueprint="service")
+    ]
+    items = [{"id": "service-1", "name": "Service"}, {"id": "service-2"}]
+    mock_sync_raw_mixin_with_jq_processor._get_resource_raw_results = AsyncMock(  # type: ignore
+        return_value=(items, [])
+    )
+    mock_sync_raw_mixin_with_jq_processor._map_entities_compared_with_port = AsyncMock(  # type: ignore
+        side_effect=lambda entities, *_: entities
+    )
+    upserted_batches: list[list[str]] = []
+
+    async def upsert(
+        entities: list[Entity], user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        upserted_batches.append([entity.identifier for entity in entities])
+        return entities
+
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = upsert  # type: ignore
+    path = str(tmp_path / "synced-state.sqlite")
+
+    for _ in range(2):
+        async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+            event.synced_state = (
+                await mock_sync_raw_mixin_with_jq_processor._open_synced_state(
+                    path, UserAgentType.exporter
+                )
+            )
+            await mock_sync_raw_mixin_with_jq_processor._register_in_batches(
+                mock_resource_config, UserAgentType.exporter
+            )
+            assert event.synced_state is not None
+            await event.synced_state.close()
+        items[1]["name"] = "Changed service"
+
+    # The state was rebuilt from Port once, and only the changed entity was upserted again
+    mock_ocean.port_client.search_entities.assert_awaited_once()  # type: ignore
+    assert upserted_batches == [["service-1", "service-2"], ["service-2"]]
+
+
+@pytest.mark.asyncio
+async def test_sort_and_upsert_failed_entities_records_retried_entities(
+    mock_sync_raw_mixin: SyncRawMixin, tmp_path: Path
+) -> None:
+    entities = [
+        create_entity("entity_1", "service", {"service": "entity_2"}, False),
+        create_entity("entity_2", "service", {}, False),
+    ]
+    port_client = mock_sync_raw_mixin.entities_state_applier.context.port_client
+    port_client.upsert_entities = AsyncMock(  # type: ignore
+        side_effect=lambda entities, *args, **kwargs: [
+            False if entity.identifier == "entity_1" else entity for entity in entities
+        ]
+    )
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = (
+            await mock_sync_raw_mixin.port_app_config_handler.get_port_app_config()
+        )
+        event.port_app_config.create_missing_related_entities = False
+        event.synced_state = SyncedStateStore(str(tmp_path / "synced-state.sqlite"))
+        await event.synced_state.open()
+        event.synced_state.begin_resync()
+        for entity in entities:
+            event.entity_topological_sorter.register_entity(entity)
+
+        upserted_entities = await mock_sync_raw_mixin.sort_and_upsert_failed_entities(
+            UserAgentType.exporter
+        )
+        recorded_entities = [
+            entity.identifier
+            async for page in event.synced_state.iterate_entities(page_size=10)
+            for entity in page
+        ]
+        await event.synced_state.close()
+
+    # Only the entity upserted by the retry is registered and recorded, so the delete phase lists it
+    assert [entity.identifier for entity in upserted_entities] == ["entity_2"]
+    assert recorded_entities == ["entity_2"]
+
+
+@pytest.mark.asyncio
+async def test_realtime_changes_invalidate_synced_entities(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+    tmp_path: Path,
+) -> None:
+    mock_ocean.config.resync_synced_state_path = str(tmp_path / "synced-state.sqlite")
+    synced_entities = [
+        Entity(identifier="entity_1", blueprint="service"),
+        Entity(identifier="entity_2", blueprint="service"),
+        Entity(identifier="entity_3", blueprint="service"),
+    ]
+    synced_state = SyncedStateStore(mock_ocean.config.resync_synced_state_path)
+    await synced_state.open()
+    await synced_state.rebuild([])
+    synced_state.begin_resync()
+    await synced_state.record(synced_entities)
+    await synced_state.close()
+
+    applier = mock_sync_raw_mixin_with_jq_processor.entities_state_applier
+    applier.upsert = AsyncMock(side_effect=lambda entities, *_: entities)  # type: ignore
+    applier.delete = AsyncMock()  # type: ignore
+    async with event_context(EventType.HTTP_REQUEST, trigger_type="machine") as event:
+        event.port_app_config = PortAppConfig(
+            enable_merge_entity=True,
+            delete_dependent_entities=True,
+            create_missing_related_entities=False,
+            resources=[mock_resource_config],
+        )
+        with patch.object(
+            mock_sync_raw_mixin_with_jq_processor.port_app_config_handler,
+            "get_port_app_config",
+            return_value=event.port_app_config,
+        ):
+            await mock_sync_raw_mixin_with_jq_processor.register_raw(
+                "service", [{"id": "entity_1"}], UserAgentType.exporter
+            )
+            await mock_sync_raw_mixin_with_jq_processor.unregister_raw(
+                "service", [{"id": "entity_2"}], UserAgentType.exporter
+            )
+
+    await synced_state.open()
+    synced_state.begin_resync()
+    changed_entities = await synced_state.filter_changed(synced_entities)
+    await synced_state.close()
+
+    # The entities changed by realtime events are compared with Port by the next resync, instead of being skipped
+    assert [entity.identifier for entity in changed_entities] == [
+        "entity_1",
+        "entity_2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sync_raw_all_delta_resync_continues_from_committed_watermarks(
+    mock_sync_raw_mixin: SyncRawMixin, mock_ocean: Ocean, tmp_path: Path
+) -> None:
+    watermark_path = tmp_path / "watermarks.json"
+    mock_ocean.config.resync_watermark_path = str(watermark_path)
+    seen_watermarks: list[Any] = []
+    errors: list[Exception] = []
+
+    async def register_in_batches(
+        resource: ResourceConfig,
+        user_agent_type: UserAgentType,
+        registered_entities: EntityIdentityStore | None = None,
+    ) -> tuple[list[Entity], list[Exception]]:
+        seen_watermarks.append(mock_sync_raw_mixin.get_resync_watermark(resource.kind))
+        mock_sync_raw_mixin.set_resync_watermark(
+            resource.kind, f"watermark-{len(seen_watermarks)}"
+        )
+        return [], errors
+
+    mock_sync_raw_mixin._register_in_batches = register_in_batches  # type: ignore
+    delete_unregistered_entities = AsyncMock(return_value=[])
+    mock_sync_raw_mixin.entities_state_applier.delete_unregistered_entities = delete_unregistered_entities  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = (
+            await mock_sync_raw_mixin.port_app_config_handler.get_port_app_config()
+        )
+        with patch(
+            "port_ocean.core.integrations.mixins.sync_raw.event_context",
+            lambda *args, **kwargs: no_op_event_context(event),
+        ):
+            await mock_sync_raw_mixin.sync_raw_all(trigger_type="machine")
+            await mock_sync_raw_mixin.sync_raw_all(
+                trigger_type="machine", resync_type="delta"
+            )
+            errors.append(Exception("failed to fetch"))
+            await mock_sync_raw_mixin.sync_raw_all(
+                trigger_type="machine", resync_type="delta"
+            )
+
+    # A full resync fetches everything, and a failed delta resync doesn't advance the watermark of its kind
+    assert seen_watermarks == [None, "watermark-1", "watermark-2"]
+    assert delete_unregistered_entities.call_count == 1
+
+    persisted_watermarks = ResyncWatermarkStore(str(watermark_path))
+    persisted_watermarks.load()
+    assert persisted_watermarks.get("project") == "watermark-2"
+    assert persisted_watermarks.last_full_resync_at is not None
+
+
+@pytest.mark.asyncio
+async def test_get_scheduled_resync_type_interleaves_full_resyncs(
+    mock_sync_raw_mixin: SyncRawMixin, mock_ocean: Ocean
+) -> None:
+    assert mock_sync_raw_mixin.get_scheduled_resync_type() == "full"
+
+    mock_ocean.config.scheduled_delta_resync_interval = 5
+    mock_ocean.config.scheduled_resync_interval = 60 * 24
+    # No full resync completed yet
+    assert mock_sync_raw_mixin.get_scheduled_resync_type() == "full"
+
+    watermarks = mock_sync_raw_mixin._get_resync_watermarks()
+    watermarks.complete_full_resync()
+    assert mock_sync_raw_mixin.get_scheduled_resync_type() == "delta"
+
+    watermarks.complete_full_resync(time.time() - 60 * 60 * 25)
+    assert mock_sync_raw_mixin.get_scheduled_resync_type() == "full"
+
+
+def test_scheduled_delta_resync_interval_requires_full_resync_interval() -> None:
+    with pytest.raises(ValueError):
+        IntegrationConfiguration.validate_scheduled_delta_resync_interval(
+            {"scheduled_delta_resync_interval": 5, "scheduled_resync_interval": None}
+        )
+
+    values = {"scheduled_delta_resync_interval": 5, "scheduled_resync_interval": 60}
+    assert (
+        IntegrationConfiguration.validate_scheduled_delta_resync_interval(values)
+        == values
+    )
+
+
+def test_scheduled_resync_interval_is_the_shortest_one(mock_ocean: Ocean) -> None:
+    mock_ocean.config.scheduled_resync_interval = 60
+    assert mock_ocean._get_scheduled_resync_interval() == 60
+
+    mock_ocean.config.scheduled_delta_resync_interval = 5
+    assert mock_ocean._get_scheduled_resync_interval() == 5
+
+    # The interval reported to Port matches the one resyncs are scheduled by
+    mock_ocean.config.scheduled_delta_resync_interval = 120
+    assert mock_ocean._get_scheduled_resync_interval() == 60
+
+
+@pytest.mark.asyncio
+async def test_register_in_batches_resumes_from_checkpointed_page_token(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+    tmp_path: Path,
+) -> None:
+    mock_ocean.config.send_raw_data_examples = False
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    fail_on_page: int | None = 2
+
+    async def services(kind: str) -> AsyncGenerator[list[dict[str, Any]], None]:
+        page = mock_sync_raw_mixin_with_jq_processor.get_resync_page_token() or 0
+        while page < 4:
+            if page == fail_on_page:
+                raise RuntimeError("The upstream API is unavailable")
+            mock_sync_raw_mixin_with_jq_processor.set_resync_page_token(page + 1)
+            yield [{"id": f"service-{page}"}]
+            page += 1
+
+    upserted_identifiers: list[str] = []
+
+    async def upsert(
+        entities: list[Entity], user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        upserted_identifiers.extend(str(entity.identifier) for entity in entities)
+        return entities
+
+    mock_sync_raw_mixin_with_jq_processor._map_entities_compared_with_port = AsyncMock(  # type: ignore
+        side_effect=lambda entities, *_: entities
+    )
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = upsert  # type: ignore
+
+    async def register() -> tuple[list[Entity], list[Exception]]:
+        mock_sync_raw_mixin_with_jq_processor._get_resource_raw_results = AsyncMock(  # type: ignore
+            return_value=([resync_generator_wrapper(services, "service")], [])
+        )
+        async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+            event.resync_checkpoint = ResyncCheckpointStore(checkpoint_path)
+            event.resync_checkpoint.start("config-hash", "resync-id")
+            async with resource_context(mock_resource_config):
+                return await mock_sync_raw_mixin_with_jq_processor._register_in_batches(
+                    mock_resource_config, UserAgentType.exporter
+                )
+
+    _, errors = await register()
+    assert len(errors) == 1
+    assert upserted_identifiers == ["service-0", "service-1"]
+
+    fail_on_page = None
+    upserted_identifiers.clear()
+    entities, errors = await register()
+
+    assert upserted_identifiers == ["service-2", "service-3"]
+    assert errors == []
+    checkpoint = ResyncCheckpointStore(checkpoint_path)
+    assert checkpoint.start("config-hash", "another-resync-id")
+    assert checkpoint.resync_id == "resync-id"
+    assert checkpoint.page_tokens == {}
+    assert len(checkpoint.completed_resources) == 1
+
+    # A resumed resync skips the resources it already registered
+    upserted_identifiers.clear()
+    assert await register() == ([], [])
+    assert upserted_identifiers == []
+
+
+@pytest.mark.asyncio
+async def test_sync_raw_all_resumed_without_synced_state_skips_delete_phase(
+    mock_sync_raw_mixin: SyncRawMixin, mock_ocean: Ocean, tmp_path: Path
+) -> None:
+    checkpoint_path = tmp_path / "checkpoint.json"
+    mock_ocean.config.resync_checkpoint_path = str(checkpoint_path)
+    app_config = await mock_sync_raw_mixin.port_app_config_handler.get_port_app_config()
+    checkpoint = ResyncCheckpointStore(str(checkpoint_path))
+    checkpoint.start(
+        mock_sync_raw_mixin._get_resync_config_hash(app_config, "full"), "resync-id"
+    )
+    checkpoint.set_page_token("project:1", 3)
+
+    mock_sync_raw_mixin._register_in_batches = AsyncMock(return_value=([], []))  # type: ignore
+    delete_unregistered_entities = AsyncMock(return_value=[])
+    mock_sync_raw_mixin.entities_state_applier.delete_unregistered_entities = delete_unregistered_entities  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = app_config
+        with patch(
+            "port_ocean.core.integrations.mixins.sync_raw.event_context",
+            lambda *args, **kwargs: no_op_event_context(event),
+        ):
+            await mock_sync_raw_mixin.sync_raw_all(trigger_type="machine")
+            assert delete_unregistered_entities.call_count == 0
+            assert not checkpoint_path.exists()
+
+            await mock_sync_raw_mixin.sync_raw_all(trigger_type="machine")
+            assert delete_unregistered_entities.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_raw_all_paged_delete_phase_deletes_entities_of_dropped_kinds(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_ocean: Ocean,
+    mock_port_app_config: PortAppConfig,
+) -> None:
+    mock_ocean.config.resync_port_state_page_size = 100
+    entities_at_port = [
+        Entity(identifier="service-1", blueprint="service"),
+        Entity(identifier="team-1", blueprint="team"),
+    ]
+
+    async def search_entities_in_pages(
+        user_agent_type: UserAgentType,
+        page_size: int,
+        blueprints: list[str] | None = None,
+    ) -> AsyncIterator[list[Entity]]:
+        yield [
+            entity
+            for entity in entities_at_port
+            if blueprints is None or entity.blueprint in blueprints
+        ]
+
+    mock_ocean.port_client.search_entities_in_pages = search_entities_in_pages  # type: ignore
+    mock_sync_raw_mixin._register_in_batches = AsyncMock(return_value=([], []))  # type: ignore
+    searched_identifiers: list[list[str]] = []
+
+    async def delete_unregistered_entities(
+        entities: AsyncIterator[list[Entity]], *args: Any
+    ) -> list[Entity]:
+        searched_identifiers.append(
+            [entity.identifier async for page in entities for entity in page]
+        )
+        return []
+
+    mock_sync_raw_mixin.entities_state_applier.delete_unregistered_entities = delete_unregistered_entities  # type: ignore
+    mock_port_app_config.resources.append(create_resource_config("team", '"team"'))
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        with patch(
+            "port_ocean.core.integrations.mixins.sync_raw.event_context",
+            lambda *args, **kwargs: no_op_event_context(event),
+        ):
+            await mock_sync_raw_mixin.sync_raw_all(trigger_type="machine")
+            # The team kind is dropped from the config, its entities are still candidates for deletion
+            mock_port_app_config.resources.pop()
+            await mock_sync_raw_mixin.sync_raw_all(trigger_type="machine")
+
+    assert searched_identifiers == [["service-1", "team-1"], ["service-1", "team-1"]]
+
+
+@pytest.mark.asyncio
+async def test_register_raw_batches_realtime_changes(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.config.realtime_batch_window = 0.05
+    upserted_batches: list[tuple[list[str], str]] = []
+
+    async def upsert(
+        entities: list[Entity], user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        upserted_batches.append(
+            ([entity.identifier for entity in entities], current_event.id)
+        )
+        return entities
+
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = upsert  # type: ignore
+
+    async with event_context(EventType.HTTP_REQUEST, trigger_type="request") as event:
+        event.port_app_config = PortAppConfig(
+            enable_merge_entity=True,
+            delete_dependent_entities=True,
+            create_missing_related_entities=False,
+            resources=[mock_resource_config],
+        )
+        with patch.object(
+            mock_sync_raw_mixin_with_jq_processor.port_app_config_handler,
+            "get_port_app_config",
+            return_value=event.port_app_config,
+        ):
+            results = await asyncio.gather(
+                *(
+                    mock_sync_raw_mixin_with_jq_processor.register_raw(
+                        "service", [{"id": f"service-{index}"}], UserAgentType.exporter
+                    )
+                    for index in range(3)
+                )
+            )
+        event_id = event.id
+
+    # The changes are upserted together under an event of their own rather than the one of a caller, and every
+    # caller gets its own entities
+    assert [identifiers for identifiers, _ in upserted_batches] == [
+        ["service-0", "service-1", "service-2"]
+    ]
+    assert upserted_batches[0][1] != event_id
+    assert [[entity.identifier for entity in entities] for entities in results] == [
+        ["service-0"],
+        ["service-1"],
+        ["service-2"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_register_raw_batch_fails_only_the_failed_changes(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.config.realtime_batch_window = 0.05
+    upsert = AsyncMock(side_effect=lambda entities, *_: entities)
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = upsert  # type: ignore
+    entity_processor = mock_sync_raw_mixin_with_jq_processor.entity_processor
+    parse_items = entity_processor.parse_items
+
+    async def parse_items_or_fail(
+        mapping: ResourceConfig, results: list[dict[Any, Any]], *args: Any
+    ) -> Any:
+        if any(item.get("fail") for item in results):
+            raise ValueError("Failed to map the items")
+        return await parse_items(mapping, results, *args)
+
+    entity_processor.parse_items = parse_items_or_fail  # type: ignore
+
+    async with event_context(EventType.HTTP_REQUEST, trigger_type="request") as event:
+        event.port_app_config = PortAppConfig(
+            enable_merge_entity=True,
+            delete_dependent_entities=True,
+            create_missing_related_entities=False,
+            resources=[mock_resource_config],
+        )
+        with patch.object(
+            mock_sync_raw_mixin_with_jq_processor.port_app_config_handler,
+            "get_port_app_config",
+            return_value=event.port_app_config,
+        ):
+            results = await asyncio.gather(
+                *(
+                    mock_sync_raw_mixin_with_jq_processor.register_raw(
+                        "service", results, UserAgentType.exporter
+                    )
+                    for results in (
+                        [{"id": "service-0"}],
+                        [{"id": "service-1", "fail": True}],
+                        [{"id": "service-2"}],
+                    )
+                ),
+                return_exceptions=True,
+            )
+
+    assert isinstance(results[1], ExceptionGroup)
+    assert [
+        [entity.identifier for entity in entities]
+        for entities in (results[0], results[2])
+        if isinstance(entities, list)
+    ] == [["service-0"], ["service-2"]]
+    assert [entity.identifier for entity in upsert.call_args[0][0]] == [
+        "service-0",
+        "service-2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_register_resource_raw_changes_upserts_latest_version_of_entities(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+) -> None:
+    upsert = AsyncMock(side_effect=lambda entities, *_: entities)
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = upsert  # type: ignore
+
+    async with event_context(EventType.HTTP_REQUEST, trigger_type="request"):
+        changes_results = (
+            await mock_sync_raw_mixin_with_jq_processor._register_resource_raw_changes(
+                mock_resource_config,
+                [
+                    [
+                        {"id": "service-1", "name": "old"},
+                        {"id": "service-2", "name": "other"},
+                    ],
+                    [{"id": "service-1", "name": "new"}],
+                ],
+                [contextvars.copy_context(), contextvars.copy_context()],
+                UserAgentType.exporter,
+            )
+        )
+        # Without batching, the items are upserted as they were given
+        await mock_sync_raw_mixin_with_jq_processor._register_resource_raw(
+            mock_resource_config,
+            [{"id": "service-1", "name": "old"}, {"id": "service-1", "name": "new"}],
+            UserAgentType.exporter,
+            True,
+        )
+
+    batch_upserted_entities, upserted_entities = [
+        call[0][0] for call in upsert.call_args_list
+    ]
+    assert [
+        (entity.identifier, entity.title) for entity in batch_upserted_entities
+    ] == [
+        ("service-2", "other"),
+        ("service-1", "new"),
+    ]
+    assert [
+        [entity.identifier for entity in change_result.entity_selector_diff.passed]
+        for change_result in changes_results
+    ] == [["service-2", "service-1"], ["service-1"]]
+    assert [entity.title for entity in upserted_entities] == ["old", "new"]
+
+
+def test_get_resource_fetch_groups_groups_resources_of_distinct_blueprints(
+    mock_sync_raw_mixin: SyncRawMixin, mock_ocean: Ocean
+) -> None:
+    mock_ocean.config.resync_share_kind_fetches = True
+    resources = [
+        create_resource_config("project", '"service"'),
+        create_resource_config("issue", '"issue"'),
+        create_resource_config("project", '"repository"'),
+        create_resource_config("project", '"service"'),
+        create_resource_config("project", ".blueprint"),
+        create_resource_config("project", '"team"'),
+    ]
+    # Resync functions may read the selector, so resources with distinct selector queries don't share a fetch
+    resources[5].selector.query = ".archived == false"
+
+    with patch(
+        "port_ocean.core.integrations.mixins.sync_raw.event",
+        MagicMock(resync_checkpoint=None),
+    ):
+        assert mock_sync_raw_mixin._get_resource_fetch_groups(resources) == [
+            [0, 2],
+            [1],
+            [3],
+            [4],
+            [5],
+        ]
+
+
+@pytest.mark.asyncio
+async def test_register_resource_group_fetches_the_kind_once(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.config.send_raw_data_examples = False
+    fetched_pages: list[int] = []
+
+    async def projects(kind: str) -> AsyncGenerator[list[dict[str, Any]], None]:
+        for page in range(3):
+            fetched_pages.append(page)
+            yield [{"id": f"project-{page}"}]
+
+    mock_sync_raw_mixin_with_jq_processor.on_resync(projects, "project")
+    del mock_sync_raw_mixin_with_jq_processor._get_resource_raw_results
+    mock_sync_raw_mixin_with_jq_processor._map_entities_compared_with_port = AsyncMock(  # type: ignore
+        side_effect=lambda entities, *_: entities
+    )
+    upserted_entities: list[tuple[str, str]] = []
+
+    async def upsert(
+        entities: list[Entity], user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        upserted_entities.extend(
+            (str(entity.identifier), entity.blueprint) for entity in entities
+        )
+        return entities
+
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = upsert  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        results = await mock_sync_raw_mixin_with_jq_processor._register_resource_group(
+            [
+                create_resource_config("project", '"service"'),
+                create_resource_config("project", '"repository"'),
+            ],
+            UserAgentType.exporter,
+        )
+
+    assert fetched_pages == [0, 1, 2]
+    assert [len(entities) for entities, _ in results] == [3, 3]
+    assert sorted(upserted_entities) == sorted(
+        (f"project-{page}", blueprint)
+        for page in range(3)
+        for blueprint in ("service", "repository")
+    )
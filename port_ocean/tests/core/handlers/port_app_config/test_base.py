@@ -195,3 +195,61 @@ async def test_get_port_app_config_fetch_error(
     async with event_context(EventType.RESYNC, trigger_type="machine"):
         with pytest.raises(EmptyPortAppConfigError, match="Port app config is empty"):
             await port_app_config_handler.get_port_app_config()
+
+
+@pytest.mark.asyncio
+async def test_get_port_app_config_precompiles_new_config(
+    port_app_config_handler: MockPortAppConfig,
+    mock_context: PortOceanContext,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Arrange
+    port_app_config_handler.mock_get_port_app_config.return_value = {
+        "resources": [
+            {
+                "kind": "repository",
+                "selector": {"query": "true"},
+                "port": {
+                    "entity": {
+                        "mappings": {"identifier": ".name", "blueprint": '"service"'}
+                    }
+                },
+            }
+        ]
+    }
+    precompile = MagicMock()
+    monkeypatch.setattr(
+        mock_context.integration.entity_processor, "precompile", precompile
+    )
+
+    # Act
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        result = await port_app_config_handler.get_port_app_config()
+        await port_app_config_handler.get_port_app_config()
+        # A config fetched again is compiled only when it changed
+        await port_app_config_handler.get_port_app_config(use_cache=False)
+
+    # Assert
+    precompile.assert_called_once_with(result)
+
+
+@pytest.mark.asyncio
+async def test_get_port_app_config_precompile_failure_is_not_raised(
+    port_app_config_handler: MockPortAppConfig,
+    mock_context: PortOceanContext,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Arrange
+    port_app_config_handler.mock_get_port_app_config.return_value = {"resources": []}
+    monkeypatch.setattr(
+        mock_context.integration.entity_processor,
+        "precompile",
+        MagicMock(side_effect=ValueError("Failed to compile")),
+    )
+
+    # Act
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        result = await port_app_config_handler.get_port_app_config()
+
+    # Assert
+    assert result.resources == []
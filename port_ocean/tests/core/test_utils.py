@@ -2,9 +2,12 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from port_ocean.core.utils.utils import validate_integration_runtime
+from port_ocean.core.utils.utils import (
+    deduplicate_entities,
+    validate_integration_runtime,
+)
 from port_ocean.clients.port.client import PortClient
-from port_ocean.core.models import Runtime
+from port_ocean.core.models import Entity, Runtime
 from port_ocean.tests.helpers.port_client import get_port_client_for_integration
 from port_ocean.exceptions.core import IntegrationRuntimeException
 
@@ -71,3 +74,18 @@ class TestValidateIntegrationRuntime:
             requested_runtime.is_installation_type_compatible(installation_type)
             == expected
         )
+
+
+def test_deduplicate_entities_keeps_last_occurrence() -> None:
+    entities = [
+        Entity(identifier="a", blueprint="service", properties={"version": 1}),
+        Entity(identifier="b", blueprint="service"),
+        Entity(identifier="a", blueprint="service", properties={"version": 2}),
+        Entity(identifier="a", blueprint="repository"),
+    ]
+
+    assert deduplicate_entities(entities) == [
+        Entity(identifier="b", blueprint="service"),
+        Entity(identifier="a", blueprint="service", properties={"version": 2}),
+        Entity(identifier="a", blueprint="repository"),
+    ]
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from port_ocean.core.models import Entity
+from port_ocean.core.utils.entity_identity_store import EntityIdentityStore
+
+
+def test_entity_identity_store_membership() -> None:
+    store = EntityIdentityStore.from_entities(
+        [
+            Entity(identifier="service-a", blueprint="service"),
+            Entity(identifier="service-b", blueprint="service"),
+            Entity(identifier="team-a", blueprint="team"),
+        ]
+    )
+
+    assert len(store) == 3
+    assert Entity(identifier="service-a", blueprint="service") in store
+    assert Entity(identifier="team-a", blueprint="team") in store
+    assert Entity(identifier="service-a", blueprint="team") not in store
+    assert Entity(identifier="service-c", blueprint="service") not in store
+    assert Entity(identifier="user-a", blueprint="user") not in store
+
+    # Entities added after a lookup are searched as well
+    store.add(Entity(identifier="service-c", blueprint="service"))
+    assert Entity(identifier="service-c", blueprint="service") in store
+
+
+def test_entity_identity_store_relations() -> None:
+    store = EntityIdentityStore.from_entities(
+        [
+            Entity(
+                identifier="service-a",
+                blueprint="service",
+                relations={"owner": "team-a", "users": ["user-a", "user-b"]},
+            ),
+            Entity(
+                identifier="service-b", blueprint="service", relations={"owner": None}
+            ),
+            Entity(identifier="team-a", blueprint="team"),
+        ]
+    )
+    relations_targets = {("service", "owner"): "team", ("service", "users"): "user"}
+
+    assert store.get_related_blueprints() == ["service"]
+    assert store.is_related(
+        Entity(identifier="team-a", blueprint="team"), relations_targets
+    )
+    assert store.is_related(
+        Entity(identifier="user-b", blueprint="user"), relations_targets
+    )
+    assert not store.is_related(
+        Entity(identifier="team-b", blueprint="team"), relations_targets
+    )
+    # The identifier is related through a relation targeting another blueprint
+    assert not store.is_related(
+        Entity(identifier="team-a", blueprint="user"), relations_targets
+    )
+
+
+def test_entity_identity_store_spills_to_disk(tmp_path: Path) -> None:
+    store = EntityIdentityStore(spill_threshold=10, spill_directory=str(tmp_path))
+    store.add_many(
+        Entity(
+            identifier=f"service-{index}",
+            blueprint="service",
+            relations={"owner": f"team-{index % 7}"},
+        )
+        for index in range(100)
+    )
+
+    assert len(store) == 100
+    assert all(
+        Entity(identifier=f"service-{index}", blueprint="service") in store
+        for index in range(100)
+    )
+    assert Entity(identifier="service-100", blueprint="service") not in store
+    assert store.is_related(
+        Entity(identifier="team-6", blueprint="team"), {("service", "owner"): "team"}
+    )
+
+    store.close()
+    assert len(store) == 0
+    assert Entity(identifier="service-0", blueprint="service") not in store
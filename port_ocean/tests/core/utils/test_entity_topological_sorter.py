@@ -1,3 +1,7 @@
+from graphlib import CycleError
+
+import pytest
+
 from port_ocean.core.models import Entity
 from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
 from unittest.mock import MagicMock
@@ -97,3 +101,86 @@ def test_handle_failed_with_circular_dependencies() -> None:
             e.args[0]
             == "Cannot order entities due to cyclic dependencies. \nIf you do want to have cyclic dependencies, please make sure to set the keys 'createMissingRelatedEntities' and 'deleteDependentEntities' in the integration config in Port."
         )
+
+
+def test_get_entities_levels() -> None:
+    entity_a = create_entity("entity_a", "buleprint_a")  # No dependencies
+    entity_b = create_entity(
+        "entity_b", "buleprint_a", {"dep_name_1": "entity_a"}
+    )  # Depends on entity_a
+    entity_c = create_entity(
+        "entity_c", "buleprint_a", {"dep_name_1": "entity_a"}
+    )  # Depends on entity_a
+    entity_d = create_entity(
+        "entity_d", "buleprint_b", {"dep_name_2": "entity_b"}
+    )  # Depends on entity_b
+    entity_e = create_entity("entity_e", "buleprint_b")  # No dependencies
+
+    entity_topological_sort = EntityTopologicalSorter()
+    for entity in (entity_d, entity_c, entity_b, entity_a, entity_e):
+        entity_topological_sort.register_entity(entity)
+
+    levels = [
+        sorted(entity.identifier for entity in level)
+        for level in entity_topological_sort.get_entities_levels()
+    ]
+    assert levels == [
+        ["entity_a", "entity_e"],
+        ["entity_b", "entity_c"],
+        ["entity_d"],
+    ], f"Levels: {levels}"
+
+
+def test_get_entities_levels_with_circular_dependencies() -> None:
+    entity_a = create_entity("entity_a", "buleprint_a", {"dep_name_1": "entity_b"})
+    entity_b = create_entity("entity_b", "buleprint_a", {"dep_name_1": "entity_a"})
+
+    entity_topological_sort = EntityTopologicalSorter()
+    entity_topological_sort.register_entity(entity_a)
+    entity_topological_sort.register_entity(entity_b)
+
+    with pytest.raises(OceanAbortException) as exc_info:
+        entity_topological_sort.get_entities_levels()
+    assert isinstance(exc_info.value.__cause__, CycleError)
+
+
+def test_order_by_entities_dependencies_with_many_relations() -> None:
+    entity_a = create_entity("entity_a", "buleprint_a")
+    entity_a_other_blueprint = create_entity("entity_a", "buleprint_b")
+    entity_b = create_entity(
+        "entity_b",
+        "buleprint_a",
+        {"dep_name_1": None, "dep_name_2": "entity_a"},  # type: ignore
+    )  # Depends on both entity_a entities
+    entity_c = create_entity(
+        "entity_c",
+        "buleprint_b",
+        {"dep_name_1": ["entity_b", "missing"], "dep_name_2": {"combinator": "and"}},  # type: ignore
+    )  # Depends on entity_b, and on a missing entity and a search query which are ignored
+
+    levels = [
+        sorted(f"{entity.identifier}-{entity.blueprint}" for entity in level)
+        for level in EntityTopologicalSorter.group_by_entities_dependencies(
+            [entity_c, entity_b, entity_a_other_blueprint, entity_a]
+        )
+    ]
+    assert levels == [
+        ["entity_a-buleprint_a", "entity_a-buleprint_b"],
+        ["entity_b-buleprint_a"],
+        ["entity_c-buleprint_b"],
+    ], f"Levels: {levels}"
+
+
+def test_order_by_entities_dependencies_of_a_long_chain() -> None:
+    entities = [create_entity("entity_0", "buleprint_a")] + [
+        create_entity(f"entity_{i}", "buleprint_a", {"dep_name_1": f"entity_{i - 1}"})
+        for i in range(1, 5000)
+    ]
+
+    ordered = EntityTopologicalSorter.order_by_entities_dependencies(
+        list(reversed(entities))
+    )
+
+    assert [entity.identifier for entity in ordered] == [
+        entity.identifier for entity in entities
+    ]
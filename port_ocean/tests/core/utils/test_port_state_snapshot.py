@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from port_ocean.core.models import Entity
+from port_ocean.core.utils.port_state_snapshot import PortStateSnapshot
+
+
+@pytest.fixture(params=["memory", "database"])
+def snapshot(request: pytest.FixtureRequest, tmp_path: Path) -> PortStateSnapshot:
+    snapshot = PortStateSnapshot(str(tmp_path) if request.param == "database" else None)
+    snapshot.add_many(
+        [
+            Entity(
+                identifier="service-a",
+                blueprint="service",
+                title="Service A",
+                team=["team-a"],
+                properties={"language": "python", "url": "https://a"},
+                relations={"owner": "team-a"},
+            ),
+            Entity(identifier="service-b", blueprint="service", title="Service B"),
+            Entity(identifier="team-a", blueprint="team", title="Team A"),
+        ]
+    )
+    snapshot.complete_blueprint("service")
+    return snapshot
+
+
+def test_port_state_snapshot_projects_included_parameters(
+    snapshot: PortStateSnapshot,
+) -> None:
+    entities_at_port = snapshot.get_many(
+        [
+            Entity(identifier="service-a", blueprint="service"),
+            Entity(identifier="service-c", blueprint="service"),
+        ],
+        ["blueprint", "identifier", "title", "properties.language"],
+    )
+
+    assert entities_at_port == [
+        Entity(
+            identifier="service-a",
+            blueprint="service",
+            title="Service A",
+            properties={"language": "python"},
+        )
+    ]
+
+
+def test_port_state_snapshot_completeness_and_discard(
+    snapshot: PortStateSnapshot,
+) -> None:
+    assert len(snapshot) == 3
+    assert snapshot.is_complete([Entity(identifier="service-c", blueprint="service")])
+    # The entities of a blueprint that wasn't completely fetched may be missing
+    assert not snapshot.is_complete([Entity(identifier="team-a", blueprint="team")])
+
+    snapshot.discard_many([Entity(identifier="service-a", blueprint="service")])
+
+    assert len(snapshot) == 2
+    assert (
+        snapshot.get_many(
+            [Entity(identifier="service-a", blueprint="service")], ["identifier"]
+        )
+        == []
+    )
+
+
+def test_port_state_snapshot_close_removes_database(tmp_path: Path) -> None:
+    snapshot = PortStateSnapshot(str(tmp_path))
+    snapshot.add_many([Entity(identifier="service-a", blueprint="service")])
+    assert len(list(tmp_path.iterdir())) == 1
+
+    snapshot.close()
+
+    assert list(tmp_path.iterdir()) == []
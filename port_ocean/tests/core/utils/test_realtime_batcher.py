@@ -0,0 +1,168 @@
+import asyncio
+import contextvars
+from typing import Any
+
+import pytest
+
+from port_ocean.clients.port.types import UserAgentType
+from port_ocean.core.models import Entity
+from port_ocean.core.utils.realtime_batcher import (
+    RealtimeChangesBatcher,
+    RealtimeOperation,
+)
+
+
+caller_name: contextvars.ContextVar[str] = contextvars.ContextVar("caller_name")
+
+
+class RecordingProcessor:
+    def __init__(self, fail_on: RealtimeOperation | None = None):
+        self.batches: list[tuple[str, RealtimeOperation, list[Any]]] = []
+        self.callers: list[str | None] = []
+        self.changes_callers: list[list[str | None]] = []
+        self.fail_on = fail_on
+
+    async def __call__(
+        self,
+        kind: str,
+        operation: RealtimeOperation,
+        changes_results: list[list[Any]],
+        changes_contexts: list[contextvars.Context],
+        user_agent_type: UserAgentType,
+    ) -> list[list[Entity] | Exception]:
+        self.batches.append(
+            (kind, operation, [item for results in changes_results for item in results])
+        )
+        self.callers.append(caller_name.get(None))
+        self.changes_callers.append(
+            [context.get(caller_name, None) for context in changes_contexts]
+        )
+        if operation == self.fail_on:
+            raise ValueError("Failed to process the batch")
+        return [
+            (
+                ValueError("Failed to process the change")
+                if any(item.get("fail") for item in results)
+                else [
+                    Entity(identifier=str(item["id"]), blueprint=kind)
+                    for item in results
+                ]
+            )
+            for results in changes_results
+        ]
+
+
+@pytest.mark.asyncio
+async def test_submit_coalesces_changes_of_a_kind_within_the_window() -> None:
+    processor = RecordingProcessor()
+    batcher = RealtimeChangesBatcher(processor, window=0.05, max_items=100)
+
+    results = await asyncio.gather(
+        batcher.submit("service", "register", [{"id": 1}], UserAgentType.exporter),
+        batcher.submit("service", "register", [{"id": 2}], UserAgentType.exporter),
+        batcher.submit("repository", "register", [{"id": 3}], UserAgentType.exporter),
+    )
+
+    assert sorted(processor.batches) == [
+        ("repository", "register", [{"id": 3}]),
+        ("service", "register", [{"id": 1}, {"id": 2}]),
+    ]
+    # Every caller gets the entities of its own change
+    assert [[entity.identifier for entity in entities] for entities in results] == [
+        ["1"],
+        ["2"],
+        ["3"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_submit_processes_the_batch_once_max_items_piled_up() -> None:
+    processor = RecordingProcessor()
+    batcher = RealtimeChangesBatcher(processor, window=60, max_items=2)
+
+    await asyncio.wait_for(
+        asyncio.gather(
+            batcher.submit("service", "register", [{"id": 1}], UserAgentType.exporter),
+            batcher.submit("service", "register", [{"id": 2}], UserAgentType.exporter),
+        ),
+        timeout=1,
+    )
+
+    assert processor.batches == [("service", "register", [{"id": 1}, {"id": 2}])]
+
+
+@pytest.mark.asyncio
+async def test_submit_keeps_order_of_operations_and_propagates_errors() -> None:
+    processor = RecordingProcessor(fail_on="unregister")
+    batcher = RealtimeChangesBatcher(processor, window=0.05, max_items=100)
+
+    results = await asyncio.gather(
+        batcher.submit("service", "register", [{"id": 1}], UserAgentType.exporter),
+        batcher.submit("service", "unregister", [{"id": 1}], UserAgentType.exporter),
+        batcher.submit("service", "register", [{"id": 2}], UserAgentType.exporter),
+        return_exceptions=True,
+    )
+
+    assert processor.batches == [
+        ("service", "register", [{"id": 1}]),
+        ("service", "unregister", [{"id": 1}]),
+        ("service", "register", [{"id": 2}]),
+    ]
+    assert isinstance(results[1], ValueError)
+    assert not isinstance(results[2], BaseException)
+
+
+@pytest.mark.asyncio
+async def test_submit_passes_every_change_with_the_context_of_its_caller() -> None:
+    processor = RecordingProcessor()
+    batcher = RealtimeChangesBatcher(processor, window=0.05, max_items=100)
+
+    async def submit(name: str, item_id: int) -> list[Entity]:
+        caller_name.set(name)
+        return await batcher.submit(
+            "service", "register", [{"id": item_id}], UserAgentType.exporter
+        )
+
+    await asyncio.gather(submit("first", 1), submit("second", 2))
+
+    # The batch isn't processed in the context of any of its callers, and every change comes with its own
+    assert processor.callers == [None]
+    assert processor.changes_callers == [["first", "second"]]
+
+
+@pytest.mark.asyncio
+async def test_submit_fails_only_the_callers_of_failed_changes() -> None:
+    processor = RecordingProcessor()
+    batcher = RealtimeChangesBatcher(processor, window=0.05, max_items=100)
+
+    results = await asyncio.gather(
+        batcher.submit("service", "register", [{"id": 1}], UserAgentType.exporter),
+        batcher.submit(
+            "service", "register", [{"id": 2, "fail": True}], UserAgentType.exporter
+        ),
+        batcher.submit("service", "register", [{"id": 3}], UserAgentType.exporter),
+        return_exceptions=True,
+    )
+
+    assert len(processor.batches) == 1
+    assert isinstance(results[1], ValueError)
+    assert [
+        [entity.identifier for entity in entities]
+        for entities in (results[0], results[2])
+        if isinstance(entities, list)
+    ] == [["1"], ["3"]]
+
+
+@pytest.mark.asyncio
+async def test_flush_all_processes_pending_changes_without_waiting() -> None:
+    processor = RecordingProcessor()
+    batcher = RealtimeChangesBatcher(processor, window=60, max_items=100)
+
+    submission = asyncio.create_task(
+        batcher.submit("service", "register", [{"id": 1}], UserAgentType.exporter)
+    )
+    await asyncio.sleep(0)
+    await asyncio.wait_for(batcher.flush_all(), timeout=1)
+
+    assert processor.batches == [("service", "register", [{"id": 1}])]
+    assert [entity.identifier for entity in await submission] == ["1"]
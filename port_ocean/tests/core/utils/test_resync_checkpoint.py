@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from port_ocean.core.utils.resync_checkpoint import (
+    PageTokenTracker,
+    ResyncCheckpointStore,
+)
+
+
+def test_start_resumes_checkpoint_of_same_config(tmp_path: Path) -> None:
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = ResyncCheckpointStore(path)
+    assert not checkpoint.start("config-hash", "resync-1")
+    checkpoint.complete_resource("project:1")
+    checkpoint.set_page_token("issue:1", {"cursor": "abc"})
+
+    resumed_checkpoint = ResyncCheckpointStore(path)
+    assert resumed_checkpoint.start("config-hash", "resync-2")
+    assert resumed_checkpoint.resync_id == "resync-1"
+    assert resumed_checkpoint.completed_resources == {"project:1"}
+    assert resumed_checkpoint.get_resumed_page_token("issue:1") == {"cursor": "abc"}
+
+    other_config_checkpoint = ResyncCheckpointStore(path)
+    assert not other_config_checkpoint.start("other-config-hash", "resync-3")
+    assert other_config_checkpoint.resync_id == "resync-3"
+    assert other_config_checkpoint.completed_resources == set()
+
+
+def test_clear_removes_checkpoint(tmp_path: Path) -> None:
+    path = tmp_path / "checkpoint.json"
+    checkpoint = ResyncCheckpointStore(str(path))
+    checkpoint.start("config-hash", "resync-1")
+    checkpoint.complete_resource("project:1")
+    assert path.exists()
+
+    checkpoint.clear()
+
+    assert not path.exists()
+    assert not ResyncCheckpointStore(str(path)).start("config-hash", "resync-2")
+
+
+def test_corrupted_checkpoint_is_not_resumed(tmp_path: Path) -> None:
+    path = tmp_path / "checkpoint.json"
+    path.write_text("not json")
+
+    assert not ResyncCheckpointStore(str(path)).start("config-hash", "resync-1")
+
+
+def test_page_token_tracker_returns_tokens_of_upserted_items() -> None:
+    tracker = PageTokenTracker()
+    tracker.fetched(2, "page-2")
+    tracker.fetched(2, "page-3")
+    tracker.fetched(2, None)
+    tracker.fetched(2, "page-5")
+    # The fetched batches are coalesced and split on their way to be upserted
+    tracker.pipelined(3)
+    tracker.pipelined(3)
+    tracker.pipelined(2)
+
+    assert tracker.upserted() == "page-2"
+    assert tracker.upserted() == "page-3"
+    assert tracker.upserted() == "page-5"
@@ -0,0 +1,51 @@
+import time
+from pathlib import Path
+
+from port_ocean.core.utils.resync_watermarks import ResyncWatermarkStore
+
+
+def test_commit_only_commits_watermarks_of_given_kinds() -> None:
+    store = ResyncWatermarkStore()
+
+    store.commit({"issue": "2024-01-01", "project": "2024-01-02"}, ["issue"])
+
+    assert store.get("issue") == "2024-01-01"
+    assert store.get("project") is None
+
+
+def test_is_full_resync_due() -> None:
+    store = ResyncWatermarkStore()
+    assert store.is_full_resync_due(60)
+    assert store.is_full_resync_due(None)
+
+    store.complete_full_resync()
+    assert not store.is_full_resync_due(60)
+    assert not store.is_full_resync_due(None)
+
+    store.complete_full_resync(time.time() - 61 * 60)
+    assert store.is_full_resync_due(60)
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    path = str(tmp_path / "watermarks.json")
+    store = ResyncWatermarkStore(path)
+    store.commit({"issue": {"updated_at": "2024-01-01", "page": 3}}, ["issue"])
+    store.complete_full_resync(1234.0)
+    store.save()
+
+    loaded_store = ResyncWatermarkStore(path)
+    loaded_store.load()
+
+    assert loaded_store.get("issue") == {"updated_at": "2024-01-01", "page": 3}
+    assert loaded_store.last_full_resync_at == 1234.0
+
+
+def test_load_corrupted_file_starts_with_full_resync(tmp_path: Path) -> None:
+    path = tmp_path / "watermarks.json"
+    path.write_text("not json")
+    store = ResyncWatermarkStore(str(path))
+
+    store.load()
+
+    assert store.get("issue") is None
+    assert store.is_full_resync_due(None)
@@ -0,0 +1,94 @@
+import sqlite3
+from pathlib import Path
+
+from port_ocean.core.models import Entity
+from port_ocean.core.utils.synced_state_store import SyncedStateStore
+
+
+def create_entity(identifier: str, language: str = "python") -> Entity:
+    return Entity(
+        identifier=identifier, blueprint="service", properties={"language": language}
+    )
+
+
+async def test_synced_state_store_skips_unchanged_entities(tmp_path: Path) -> None:
+    path = str(tmp_path / "state" / "synced-state.sqlite")
+    synced_state = SyncedStateStore(path)
+    await synced_state.open()
+    assert synced_state.needs_rebuild
+    await synced_state.rebuild([create_entity("service-a"), create_entity("service-b")])
+    synced_state.begin_resync()
+
+    # Entities rebuilt from Port have no known content, so they are all compared with Port
+    assert await synced_state.filter_changed([create_entity("service-a")]) == [
+        create_entity("service-a")
+    ]
+    await synced_state.record([create_entity("service-a"), create_entity("service-c")])
+    await synced_state.close()
+
+    await synced_state.open()
+    assert not synced_state.needs_rebuild
+    synced_state.begin_resync()
+    changed_entities = await synced_state.filter_changed(
+        [
+            create_entity("service-a"),
+            create_entity("service-c", language="go"),
+            create_entity("service-d"),
+        ]
+    )
+
+    assert changed_entities == [
+        create_entity("service-c", language="go"),
+        create_entity("service-d"),
+    ]
+    # Only service-a was seen, as the changed entities are seen once they are recorded
+    assert await synced_state.count_unseen() == 2
+    assert [
+        sorted(entity.identifier for entity in entities)
+        async for entities in synced_state.iterate_entities(page_size=10)
+    ] == [["service-a", "service-b", "service-c"]]
+
+    await synced_state.discard_many([create_entity("service-b")])
+    assert [len(page) async for page in synced_state.iterate_entities(page_size=1)] == [
+        1,
+        1,
+    ]
+    await synced_state.close()
+
+
+async def test_synced_state_store_recovers_from_corruption(tmp_path: Path) -> None:
+    path = tmp_path / "synced-state.sqlite"
+    path.write_bytes(b"not a database")
+
+    synced_state = SyncedStateStore(str(path))
+    await synced_state.open()
+
+    assert synced_state.needs_rebuild
+    assert (tmp_path / "synced-state.sqlite.corrupted").exists()
+    await synced_state.close()
+
+
+async def test_synced_state_store_degrades_when_locked(tmp_path: Path) -> None:
+    path = str(tmp_path / "synced-state.sqlite")
+    synced_state = SyncedStateStore(path, timeout=0.1)
+    await synced_state.open()
+    await synced_state.rebuild([])
+    await synced_state.record([create_entity("service-a")])
+    synced_state.begin_resync()
+
+    # Another job holds the lock on the shared volume
+    other_job = sqlite3.connect(path)
+    other_job.execute("BEGIN EXCLUSIVE")
+    entities = [create_entity("service-a")]
+    assert await synced_state.filter_changed(entities) == entities
+    assert synced_state.degraded
+    await synced_state.record([create_entity("service-b")])
+    other_job.rollback()
+    other_job.close()
+    await synced_state.close()
+
+    # The state missed changes, so it is rebuilt by the next resync
+    await synced_state.open()
+    assert synced_state.needs_rebuild
+    assert not synced_state.degraded
+    await synced_state.close()
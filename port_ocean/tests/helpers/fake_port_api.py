@@ -1,9 +1,10 @@
 import uvicorn
 import os
 from typing import Dict, Any
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 
 SMOKE_TEST_SUFFIX = os.environ.get("SMOKE_TEST_SUFFIX", "smoke")
+FAKE_INVALID_ENTITY_PREFIX = "invalid-"
 
 app = FastAPI()
 
@@ -60,6 +61,16 @@ async def search_entities() -> Dict[str, Any]:
     return {"ok": True, "entities": []}
 
 
+@app.router.get("/v1/blueprints")
+async def get_blueprints() -> Dict[str, Any]:
+    return {"blueprints": [FAKE_DEPARTMENT_BLUEPRINT, FAKE_PERSON_BLUEPRINT]}
+
+
+@app.router.post("/v1/blueprints/{blueprint_id}/entities/search")
+async def search_blueprint_entities(blueprint_id: str) -> Dict[str, Any]:
+    return {"ok": True, "entities": [], "next": None}
+
+
 @app.router.get("/v1/integration/{integration_id}")
 @app.router.patch("/v1/integration/{integration_id}")
 @app.router.patch("/v1/integration/{integration_id}/resync-state")
@@ -145,6 +156,35 @@ async def upsert_entities(blueprint_id: str, request: Request) -> Dict[str, Any]
     }
 
 
+@app.router.post("/v1/blueprints/{blueprint_id}/entities/bulk")
+async def bulk_upsert_entities(
+    blueprint_id: str, request: Request, response: Response
+) -> Dict[str, Any]:
+    json = await request.json()
+    entities = []
+    errors = []
+    for index, entity in enumerate(json["entities"]):
+        # Entities whose identifier starts with FAKE_INVALID_ENTITY_PREFIX fail, to fake a partial failure
+        if str(entity["identifier"]).startswith(FAKE_INVALID_ENTITY_PREFIX):
+            errors.append(
+                {
+                    "identifier": entity["identifier"],
+                    "index": index,
+                    "statusCode": 422,
+                    "error": "invalid_request",
+                    "message": f"Entity {entity['identifier']} is invalid",
+                }
+            )
+        else:
+            entities.append(
+                {"identifier": entity["identifier"], "index": index, "created": True}
+            )
+
+    if errors:
+        response.status_code = 207 if entities else 422
+    return {"ok": not errors, "entities": entities, "errors": errors}
+
+
 @app.router.post("/v1/auth/access_token")
 async def auth_token() -> Dict[str, Any]:
     return {
@@ -1,6 +1,10 @@
 from typing import Any, AsyncGenerator
 import asyncio
-from port_ocean.utils.async_iterators import semaphore_async_iterator
+from port_ocean.utils.async_iterators import (
+    rebatch_async_iterator,
+    semaphore_async_iterator,
+    tee_async_iterator,
+)
 import pytest
 
 
@@ -43,3 +47,110 @@ async def test_semaphore_async_iterator() -> None:
         max_concurrent_tasks <= max_concurrency
     ), f"Max concurrent tasks {max_concurrent_tasks} exceeded semaphore limit {max_concurrency}"
     assert concurrent_tasks == 0, "Not all tasks have completed"
+
+
+async def _batches(
+    *batches: list[Any], delay: float = 0
+) -> AsyncGenerator[list[Any], None]:
+    for batch in batches:
+        await asyncio.sleep(delay)
+        yield batch
+
+
+@pytest.mark.asyncio
+async def test_rebatch_async_iterator_coalesces_and_splits_batches() -> None:
+    batches = [
+        batch
+        async for batch in rebatch_async_iterator(
+            _batches([1], [2, 3], [], list(range(4, 12)), [12]), batch_size=4
+        )
+    ]
+
+    assert batches == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12]]
+
+
+@pytest.mark.asyncio
+async def test_rebatch_async_iterator_limits_batch_bytes() -> None:
+    items = [{"id": index, "data": "x" * 40} for index in range(5)]
+    large_item = {"id": "large", "data": "x" * 500}
+
+    batches = [
+        batch
+        async for batch in rebatch_async_iterator(
+            _batches(items, [large_item], items[:1]), max_batch_bytes=150
+        )
+    ]
+
+    # Every item is about 60 bytes, and an item larger than the limit is yielded on its own
+    assert batches == [items[:2], items[2:4], items[4:], [large_item], items[:1]]
+
+
+@pytest.mark.asyncio
+async def test_rebatch_async_iterator_flushes_partial_batch_on_timeout() -> None:
+    yielded_at: list[tuple[list[int], float]] = []
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async for batch in rebatch_async_iterator(
+        _batches([1], [2], [3], delay=0.2), batch_size=10, flush_timeout=0.05
+    ):
+        yielded_at.append((batch, loop.time() - start))
+
+    # The pending read survives the flush, so no item is lost while waiting
+    assert [batch for batch, _ in yielded_at] == [[1], [2], [3]]
+    assert yielded_at[0][1] < 0.4
+
+
+async def collect(iterator: Any) -> list[Any]:
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+async def test_tee_async_iterator_consumes_source_once() -> None:
+    consumed_pages: list[int] = []
+
+    async def pages() -> AsyncGenerator[list[int], None]:
+        for page in range(5):
+            consumed_pages.append(page)
+            yield [page]
+
+    first, second = tee_async_iterator(pages(), 2)
+    first_items, second_items = await asyncio.gather(collect(first), collect(second))
+
+    assert first_items == second_items == [[page] for page in range(5)]
+    assert consumed_pages == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_tee_async_iterator_raises_source_error_in_every_iterator() -> None:
+    async def pages() -> AsyncGenerator[list[int], None]:
+        yield [0]
+        raise ValueError("Failed to fetch page")
+
+    results = await asyncio.gather(
+        *(collect(iterator) for iterator in tee_async_iterator(pages(), 2)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_tee_async_iterator_continues_after_an_iterator_is_closed() -> None:
+    async def pages() -> AsyncGenerator[list[int], None]:
+        for page in range(5):
+            yield [page]
+
+    first, second = tee_async_iterator(pages(), 2)
+
+    async def take_one() -> Any:
+        item = await anext(first)
+        await first.aclose()  # type: ignore[attr-defined]
+        return item
+
+    first_item, second_items = await asyncio.wait_for(
+        asyncio.gather(take_one(), collect(second)), timeout=1
+    )
+
+    assert first_item == [0]
+    assert second_items == [[page] for page in range(5)]
@@ -0,0 +1,104 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+
+from port_ocean.utils.queue_utils import process_in_pipeline
+
+
+async def numbers(count: int, log: list[str]) -> AsyncGenerator[int, None]:
+    for number in range(count):
+        log.append(f"fetch {number}")
+        await asyncio.sleep(0.01)
+        yield number
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("queue_size", [0, 1, 3])
+async def test_process_in_pipeline_keeps_order(queue_size: int) -> None:
+    log: list[str] = []
+
+    async def double(number: int) -> int:
+        await asyncio.sleep(0.01)
+        return number * 2
+
+    async def stringify(number: int) -> str:
+        return str(number)
+
+    results = [
+        result
+        async for result in process_in_pipeline(
+            numbers(5, log), [double, stringify], queue_size
+        )
+    ]
+
+    assert results == ["0", "2", "4", "6", "8"]
+
+
+@pytest.mark.asyncio
+async def test_process_in_pipeline_overlaps_stages() -> None:
+    log: list[str] = []
+
+    async def upload(number: int) -> int:
+        log.append(f"upload start {number}")
+        await asyncio.sleep(0.05)
+        log.append(f"upload end {number}")
+        return number
+
+    async for _ in process_in_pipeline(numbers(3, log), [upload], 1):
+        pass
+
+    # The next item is fetched while the previous one is uploaded
+    assert log.index("fetch 1") < log.index("upload end 0")
+
+
+@pytest.mark.asyncio
+async def test_process_in_pipeline_without_queue_is_sequential() -> None:
+    log: list[str] = []
+
+    async def upload(number: int) -> int:
+        log.append(f"upload {number}")
+        return number
+
+    async for _ in process_in_pipeline(numbers(2, log), [upload], 0):
+        pass
+
+    assert log == ["fetch 0", "upload 0", "fetch 1", "upload 1"]
+
+
+@pytest.mark.asyncio
+async def test_process_in_pipeline_bounds_prefetch() -> None:
+    log: list[str] = []
+    release = asyncio.Event()
+
+    async def upload(number: int) -> int:
+        await release.wait()
+        return number
+
+    pipeline = process_in_pipeline(numbers(10, log), [upload], 1)
+    next_result = asyncio.ensure_future(pipeline.__anext__())
+    await asyncio.sleep(0.2)
+
+    # One item is uploaded, one waits in the queue and one waits to be put in the queue
+    assert log == ["fetch 0", "fetch 1", "fetch 2"]
+    release.set()
+    assert await next_result == 0
+    await pipeline.aclose()  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_process_in_pipeline_raises_stage_errors() -> None:
+    log: list[str] = []
+
+    async def fail_on_two(number: int) -> int:
+        if number == 2:
+            raise ValueError("Failed to process")
+        return number
+
+    results = []
+    with pytest.raises(ValueError, match="Failed to process"):
+        async for result in process_in_pipeline(numbers(10, log), [fail_on_two], 2):
+            results.append(result)
+
+    assert results == [0, 1]
+    assert len(log) < 10
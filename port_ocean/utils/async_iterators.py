@@ -1,3 +1,7 @@
+import asyncio
+import json
+import sys
+import time
 import typing
 
 import aiostream
@@ -107,3 +111,167 @@ async def semaphore_async_iterator(
     async with semaphore:
         async for result in function():
             yield result
+
+
+def _item_size(item: typing.Any) -> int:
+    try:
+        return len(json.dumps(item, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(item)
+
+
+async def rebatch_async_iterator(
+    iterator: typing.AsyncIterable[list[typing.Any]],
+    batch_size: int | None = None,
+    max_batch_bytes: int | None = None,
+    flush_timeout: float | None = None,
+) -> typing.AsyncIterator[list[typing.Any]]:
+    """
+    This function takes an async iterator of batches and yields batches of a steadier size, by coalescing small
+    batches together and splitting large ones.
+    A batch is yielded once it holds `batch_size` items, or once adding the next item would grow its approximate
+    JSON size over `max_batch_bytes`. When `flush_timeout` is set, a partial batch is yielded after waiting that many
+    seconds for more items, so a slow iterator won't hold back the items it already produced.
+
+    Usage:
+    ```python
+    async def async_iterator():
+        for page in range(10):
+            yield [page] * random.randint(1, 200)
+
+    async def main():
+        async for batch in rebatch_async_iterator(async_iterator(), batch_size=100, flush_timeout=5):
+            print(len(batch))
+    ```
+
+    :param iterator: An async iterator of batches
+    :param batch_size: The maximum number of items of a batch
+    :param max_batch_bytes: The maximum approximate size of a batch in bytes, a single larger item is yielded on its own
+    :param flush_timeout: The number of seconds to wait for more items before yielding a partial batch
+    :return: A stream of batches
+    """
+    batch: list[typing.Any] = []
+    batch_bytes = 0
+    batch_started_at = 0.0
+    source = aiter(iterator)
+    next_batch_task: asyncio.Task[list[typing.Any]] | None = None
+
+    try:
+        while True:
+            if next_batch_task is None:
+                next_batch_task = asyncio.ensure_future(anext(source))
+
+            timeout = None
+            if batch and flush_timeout is not None:
+                timeout = max(0.0, batch_started_at + flush_timeout - time.monotonic())
+            # The pending read is kept across flushes, as cancelling it would close the iterator
+            done, _ = await asyncio.wait({next_batch_task}, timeout=timeout)
+            if not done:
+                yield batch
+                batch, batch_bytes = [], 0
+                continue
+
+            try:
+                items = next_batch_task.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                next_batch_task = None
+
+            for item in items:
+                item_bytes = _item_size(item) if max_batch_bytes else 0
+                if (
+                    batch
+                    and max_batch_bytes
+                    and batch_bytes + item_bytes > max_batch_bytes
+                ):
+                    yield batch
+                    batch, batch_bytes = [], 0
+                if not batch:
+                    batch_started_at = time.monotonic()
+                batch.append(item)
+                batch_bytes += item_bytes
+                if batch_size and len(batch) >= batch_size:
+                    yield batch
+                    batch, batch_bytes = [], 0
+    finally:
+        if next_batch_task is not None:
+            next_batch_task.cancel()
+
+    if batch:
+        yield batch
+
+
+_TEE_END = object()
+
+
+def tee_async_iterator(
+    iterator: typing.AsyncIterable[typing.Any],
+    count: int,
+    queue_size: int = 1,
+) -> list[typing.AsyncIterator[typing.Any]]:
+    """
+    This function splits an async iterator into `count` async iterators yielding the same items, while the source
+    iterator is consumed only once.
+    The source is consumed by a task started once the first of the iterators is read, which hands every item to a
+    queue per iterator holding at most `queue_size` items. The iterators must therefore be consumed concurrently, as
+    the slowest of them bounds how far the others can run ahead. An error of the source is raised by every iterator,
+    and an iterator that is closed early stops receiving items.
+
+    Usage:
+    ```python
+    async def fetch_pages():
+        for page in range(10):
+            yield await fetch_page(page)
+
+    async def main():
+        services, repositories = tee_async_iterator(fetch_pages(), 2)
+        await asyncio.gather(upload_services(services), upload_repositories(repositories))
+    ```
+
+    :param iterator: The async iterator to split
+    :param count: The number of iterators to split it into
+    :param queue_size: The number of items an iterator can fall behind the fastest one
+    :return: The iterators yielding the items of the source
+    """
+    queues: list[asyncio.Queue[tuple[typing.Any, Exception | None]]] = [
+        asyncio.Queue(maxsize=queue_size) for _ in range(count)
+    ]
+    open_indexes = set(range(count))
+    producer: asyncio.Task[None] | None = None
+
+    async def produce() -> None:
+        try:
+            async for item in iterator:
+                for index in sorted(open_indexes):
+                    await queues[index].put((item, None))
+                if not open_indexes:
+                    return
+        except Exception as error:
+            for index in sorted(open_indexes):
+                await queues[index].put((_TEE_END, error))
+            return
+        for index in sorted(open_indexes):
+            await queues[index].put((_TEE_END, None))
+
+    async def consume(index: int) -> typing.AsyncIterator[typing.Any]:
+        nonlocal producer
+        if producer is None:
+            producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item, error = await queues[index].get()
+                if item is _TEE_END:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            open_indexes.discard(index)
+            # Emptying the queue releases the producer in case it waits to hand this iterator an item
+            while not queues[index].empty():
+                queues[index].get_nowait()
+            if not open_indexes and not producer.done():
+                producer.cancel()
+
+    return [consume(index) for index in range(count)]
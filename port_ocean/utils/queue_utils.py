@@ -1,6 +1,15 @@
 import asyncio
 from asyncio import Queue, Task
-from typing import Any, TypeVar, Callable, Coroutine
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    TypeVar,
+    Callable,
+    Coroutine,
+    Sequence,
+)
 
 from loguru import logger
 
@@ -86,3 +95,100 @@ async def process_in_queue(
         raise ExceptionGroup("Error processing tasks", errors)
 
     return processing_results
+
+
+class _PipelineEnd:
+    """Marks the end of the items flowing through a pipeline stage"""
+
+
+_PIPELINE_END = _PipelineEnd()
+
+
+async def process_in_pipeline(
+    source: AsyncIterable[Any],
+    stages: Sequence[Callable[[Any], Awaitable[Any]]],
+    queue_size: int,
+) -> AsyncIterator[Any]:
+    """
+    This function passes every item of an async iterable through a sequence of async stages, running every stage
+    concurrently with the others, so while a stage works on an item the previous stages already work on the next ones.
+    Each stage is connected to the next by a queue holding at most `queue_size` items, which bounds how far
+    a stage can run ahead of the stages after it. Items keep their order, and when a stage fails the whole pipeline
+    is stopped and the error is raised. A `queue_size` of 0 processes the items one after the other.
+
+    Usage:
+    ```python
+    async def fetch_pages():
+        for page in range(10):
+            yield await fetch_page(page)
+
+    async def main():
+        async for result in process_in_pipeline(fetch_pages(), [parse_page, upload_page], queue_size=2):
+            print(result)
+    ```
+
+    :param source: The async iterable producing the items to process
+    :param stages: The async functions applied to every item, in order, each receiving the result of the previous one
+    :param queue_size: The number of items each stage can run ahead of the next one
+    :return: The results of the last stage
+    """
+    if queue_size == 0:
+        async for item in source:
+            for stage in stages:
+                item = await stage(item)
+            yield item
+        return
+
+    queues: list[Queue[Any]] = [
+        Queue(maxsize=queue_size) for _ in range(len(stages) + 1)
+    ]
+
+    async def feed() -> None:
+        async for item in source:
+            await queues[0].put(item)
+        await queues[0].put(_PIPELINE_END)
+
+    async def run_stage(
+        stage: Callable[[Any], Awaitable[Any]],
+        input_queue: Queue[Any],
+        output_queue: Queue[Any],
+    ) -> None:
+        while (item := await input_queue.get()) is not _PIPELINE_END:
+            await output_queue.put(await stage(item))
+        await output_queue.put(_PIPELINE_END)
+
+    tasks = [
+        asyncio.create_task(feed()),
+        *(
+            asyncio.create_task(run_stage(stage, queues[index], queues[index + 1]))
+            for index, stage in enumerate(stages)
+        ),
+    ]
+    results_task: Task[Any] | None = None
+    try:
+        while True:
+            if results_task is None:
+                results_task = asyncio.create_task(queues[-1].get())
+            # Waiting on the stages as well, so a failing stage won't leave the pipeline waiting for results forever
+            await asyncio.wait(
+                [results_task, *(task for task in tasks if not task.done())],
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    if (error := task.exception()) is not None:
+                        raise error
+            if not results_task.done():
+                continue
+
+            result = results_task.result()
+            results_task = None
+            if result is _PIPELINE_END:
+                break
+            yield result
+    finally:
+        if results_task is not None:
+            results_task.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)